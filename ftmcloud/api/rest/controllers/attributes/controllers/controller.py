@@ -1,12 +1,16 @@
 from fastapi import Body, APIRouter
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.core.exception.exception import default_exception_list
 from ftmcloud.domains.attributes.services.attribute_services import AttributesService
 
+from ftmcloud.cross_cutting.models.bulk import BulkOperation, BulkOperationResult
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
 from ftmcloud.domains.attributes.models.models import Attribute
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 router = APIRouter()
@@ -14,49 +18,56 @@ router = APIRouter()
 
 @controller(router)
 class AttributesController:
+    attributes_service: AttributesService = Provide(AttributesService)
 
     @router.post("/", response_model=Attribute, response_description="Successfully registered attribute.",
                  responses=default_exception_list)
     async def add_attribute(self, new_attribute: Attribute = Body(...)):
         """Registers a new attribute within the space.
         """
-        attribute_service = AttributesService()
-        new_attribute = await attribute_service.add_document(new_attribute)
+        new_attribute = await self.attributes_service.add_document(new_attribute)
         return new_attribute
 
+    @router.post("/bulk", response_model=Response[BulkOperationResult],
+                 response_description="Bulk operations processed.", responses=default_exception_list)
+    async def bulk_attributes(self, operations: List[BulkOperation] = Body(...)):
+        """Creates, patches and deletes many attributes at once, reporting the status of each operation.
+        """
+        results = await self.attributes_service.bulk_write(operations=operations)
+        return ResponseWithHttpInfo(data=results,
+                                    model=BulkOperationResult,
+                                    description="Bulk operations processed.")
+
     @router.get("/", response_description="Attributes retrieved", response_model=Response[Attribute],
                 responses=default_exception_list)
     async def get_attributes(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                             sort: str | None = None, includeTotals: bool | None = None):
+                             sort: str | None = None, includeTotals: bool | None = None,
+                             estimateTotals: bool | None = None, cursor: str | None = None,
+                             fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all attributes using the user defined parameters.
         """
-        attributes_service = AttributesService()
-        industries = await attributes_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await attributes_service.total(q))}
-        return ResponseWithHttpInfo(data=industries,
-                                    model=Attribute,
-                                    description="Attributes retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.attributes_service, Attribute, "Attributes retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @router.get("/{pid}", response_description="Attribute data retrieved", response_model=Response[Attribute],
                 responses=default_exception_list)
-    async def get_attribute(self, pid: str):
+    async def get_attribute(self, pid: str, fields: str | None = None):
         """Retrieves a attribute by ID.
         """
-        attribute_service = AttributesService()
-        attribute_exists = await attribute_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='Attribute retrieved.',
-                        data=[attribute_exists])
+        projection_model = self.attributes_service.get_projection_model_from_fields(fields)
+        attribute_exists = await self.attributes_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[attribute_exists],
+                                    model=projection_model or Attribute,
+                                    description='Attribute retrieved.')
 
     @router.patch("/{pid}", response_model=Response, response_description="Successfully patched attribute.",
                   responses=default_exception_list)
     async def patch_attribute(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches a attribute within the space.
         """
-        attributes_service = AttributesService()
-        await attributes_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.attributes_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="Attribute patched successfully.")
 
     @router.delete("/{pid}", response_description="Attribute successfully deleted.", response_model=Response,
@@ -64,6 +75,5 @@ class AttributesController:
     async def delete_attribute(self, pid: str):
         """Deletes a attribute.
         """
-        attributes_service = AttributesService()
-        await attributes_service.delete_document(pid=pid)
+        await self.attributes_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="Attribute deleted.")
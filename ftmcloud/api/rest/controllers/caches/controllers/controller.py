@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+
+from ftmcloud.core.exception.exception import default_exception_list
+from ftmcloud.cross_cutting.cache.reference import ReferenceCacheStats, reference_cache_stats
+from ftmcloud.cross_cutting.models.response import Response
+from ftmcloud.cross_cutting.views.views import controller
+
+router = APIRouter()
+
+
+@controller(router)
+class CachesController:
+
+    @router.get("/reference", response_description="Reference cache metrics retrieved",
+                response_model=Response[ReferenceCacheStats], responses=default_exception_list)
+    async def get_reference_caches(self):
+        """Describes the reference caches of this worker: their size, hits, misses and invalidations.
+        """
+        return Response(status_code=200, response_type='success', description='Reference cache metrics retrieved.',
+                        data=reference_cache_stats())
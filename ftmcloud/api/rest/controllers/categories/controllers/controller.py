@@ -1,4 +1,5 @@
 from fastapi import Body, APIRouter
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.core.exception.exception import default_exception_list, FtmException
@@ -8,6 +9,8 @@ from ftmcloud.domains.product_types.services.product_type_service import Product
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
 from ftmcloud.domains.categories.models.models import Category
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 categories_router = APIRouter()
@@ -15,49 +18,47 @@ categories_router = APIRouter()
 
 @controller(categories_router)
 class CategoriesController:
+    categories_service: CategoriesService = Provide(CategoriesService)
+    product_types_service: ProductTypesService = Provide(ProductTypesService)
 
     @categories_router.post("/", response_model=Category, response_description="Successfully registered category.",
                             responses=default_exception_list)
     async def add_category(self, new_category: Category = Body(...)):
         """Registers a new category within the space.
         """
-        categories_service = CategoriesService()
-        new_category = await categories_service.add_document(new_category)
+        new_category = await self.categories_service.add_document(new_category)
         return new_category
 
     @categories_router.get("/", response_description="Categories retrieved", response_model=Response[Category],
                            responses=default_exception_list)
     async def get_categories(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                             sort: str | None = None, includeTotals: bool | None = None):
+                             sort: str | None = None, includeTotals: bool | None = None,
+                             estimateTotals: bool | None = None, cursor: str | None = None,
+                             fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all categories using the user defined parameters.
         """
-        categories_service = CategoriesService()
-        industries = await categories_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await categories_service.total(q))}
-        return ResponseWithHttpInfo(data=industries,
-                                    model=Category,
-                                    description="Categories retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.categories_service, Category, "Categories retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @categories_router.get("/{pid}", response_description="Category data retrieved", response_model=Response[Category],
                            responses=default_exception_list)
-    async def get_category(self, pid: str):
+    async def get_category(self, pid: str, fields: str | None = None):
         """Retrieves a category by ID.
         """
-        categories_service = CategoriesService()
-        category_exists = await categories_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='Category retrieved.',
-                        data=[category_exists])
+        projection_model = self.categories_service.get_projection_model_from_fields(fields)
+        category_exists = await self.categories_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[category_exists],
+                                    model=projection_model or Category,
+                                    description='Category retrieved.')
 
     @categories_router.patch("/{pid}", response_model=Response, response_description="Successfully patched category.",
                              responses=default_exception_list)
     async def patch_category(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches a category within the space.
         """
-        categories_service = CategoriesService()
-        await categories_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.categories_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="Category patched successfully.")
 
     @categories_router.delete("/{pid}", response_description="Category successfully deleted.", response_model=Response,
@@ -65,10 +66,8 @@ class CategoriesController:
     async def delete_category(self, pid: str):
         """Deletes a category.
         """
-        categories_service = CategoriesService()
-        product_types_service = ProductTypesService()
-        child_categories = await categories_service.get_all(additional_filters={"parentCategoryPid": pid})
-        product_types = await product_types_service.get_all(additional_filters={"categoryPid": pid})
+        child_categories = await self.categories_service.get_all(additional_filters={"parentCategoryPid": pid})
+        product_types = await self.product_types_service.get_all(additional_filters={"categoryPid": pid})
         if len(child_categories) > 0:
             message = "Please remove or de-associate the following child categories before deletion: "
             for i in range(0, len(child_categories)):
@@ -79,5 +78,5 @@ class CategoriesController:
             for product_type in product_types:
                 message += product_type.name + ' '
             raise FtmException('error.category.NotEmpty', developer_message=message, user_message=message)
-        await categories_service.delete_document(pid=pid)
+        await self.categories_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="Category deleted.")
@@ -1,4 +1,5 @@
 from fastapi import Body, APIRouter
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.core.exception.exception import default_exception_list, FtmException
@@ -7,6 +8,8 @@ from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
 from ftmcloud.domains.data_sources.models.models import DataSource
 from ftmcloud.domains.data_sources.services.data_source_services import DataSourcesService
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 router = APIRouter()
@@ -14,52 +17,49 @@ router = APIRouter()
 
 @controller(router)
 class DataSourcesController:
+    data_sources_service: DataSourcesService = Provide(DataSourcesService)
 
     @router.post("/", response_model=DataSource, response_description="Successfully registered data_source.",
                  responses=default_exception_list)
     async def add_data_source(self, new_data_source: DataSource = Body(...)):
         """Registers a new data_source within the space.
         """
-        data_source_service = DataSourcesService()
-        data_source_exists = await data_source_service.find_one({"name": new_data_source.name})
+        data_source_exists = await self.data_sources_service.find_one({"name": new_data_source.name})
         if data_source_exists:
             raise FtmException('error.data_source.InvalidName')
-        await data_source_service.add_document(new_data_source)
+        await self.data_sources_service.add_document(new_data_source)
         return new_data_source
 
     @router.get("/", response_description="DataSources retrieved", response_model=Response[DataSource],
                 responses=default_exception_list)
     async def get_data_sources(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                             sort: str | None = None, includeTotals: bool | None = None):
+                               sort: str | None = None, includeTotals: bool | None = None,
+                               estimateTotals: bool | None = None, cursor: str | None = None,
+                               fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all data_sources using the user defined parameters.
         """
-        data_source_service = DataSourcesService()
-        data_sources = await data_source_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await data_source_service.total(q))}
-        return ResponseWithHttpInfo(data=data_sources,
-                                    model=DataSource,
-                                    description="DataSources retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.data_sources_service, DataSource, "DataSources retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @router.get("/{pid}", response_description="DataSource data retrieved", response_model=Response[DataSource],
                 responses=default_exception_list)
-    async def get_data_source(self, pid: str):
+    async def get_data_source(self, pid: str, fields: str | None = None):
         """Retrieves an data_source by ID.
         """
-        data_source_service = DataSourcesService()
-        data_source = await data_source_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='DataSource retrieved.',
-                        data=[data_source])
+        projection_model = self.data_sources_service.get_projection_model_from_fields(fields)
+        data_source = await self.data_sources_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[data_source],
+                                    model=projection_model or DataSource,
+                                    description='DataSource retrieved.')
 
     @router.patch("/{pid}", response_model=Response, response_description="Successfully patched data_source.",
                   responses=default_exception_list)
     async def patch_data_source(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches an data_source within the space.
         """
-        industy_service = DataSourcesService()
-        await industy_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.data_sources_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="DataSource patched successfully.")
 
     @router.delete("/{pid}", response_description="DataSource successfully deleted.", response_model=Response,
@@ -67,6 +67,5 @@ class DataSourcesController:
     async def delete_data_source(self, pid: str):
         """Deletes a user.
         """
-        data_source_service = DataSourcesService()
-        await data_source_service.delete_document(pid=pid)
+        await self.data_sources_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="DataSource deleted.")
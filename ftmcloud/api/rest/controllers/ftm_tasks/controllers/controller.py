@@ -1,5 +1,3 @@
-import json
-
 from fastapi import Body, APIRouter, Depends
 from pydantic.schema import Literal
 from pydantic.validators import List
@@ -8,9 +6,12 @@ from ftmcloud.core.exception.exception import default_exception_list
 from ftmcloud.cross_cutting.auth.jwt_bearer import get_current_user
 from ftmcloud.domains.ftm_tasks.services.ftm_task_services import FtmTasksService
 
+from ftmcloud.cross_cutting.models.bulk import BulkOperation, BulkOperationResult
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
 from ftmcloud.domains.ftm_tasks.models.models import FtmTask
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 from ftmcloud.domains.users.models.models import User
 
@@ -19,31 +20,39 @@ ftm_tasks_router = APIRouter()
 
 @controller(ftm_tasks_router)
 class FtmTasksController:
+    ftm_tasks_service: FtmTasksService = Provide(FtmTasksService)
 
     @ftm_tasks_router.post("/", response_model=FtmTask, response_description="Successfully registered ftm_task.",
                            responses=default_exception_list)
     async def add_ftm_task(self, new_ftm_task: FtmTask = Body(...)):
         """Registers a new ftm_task within the space.
         """
-        ftm_tasks_service = FtmTasksService()
-        new_ftm_task = await ftm_tasks_service.add_document(new_ftm_task)
+        new_ftm_task = await self.ftm_tasks_service.add_document(new_ftm_task)
         return new_ftm_task
 
+    @ftm_tasks_router.post("/bulk", response_model=Response[BulkOperationResult],
+                           response_description="Bulk operations processed.", responses=default_exception_list)
+    async def bulk_ftm_tasks(self, operations: List[BulkOperation] = Body(...),
+                             current_user: User = Depends(get_current_user)):
+        """Creates, patches and deletes many ftm_tasks at once, reporting the status of each operation.
+        """
+        results = await self.ftm_tasks_service.bulk_write(operations=operations, current_user=current_user)
+        return ResponseWithHttpInfo(data=results,
+                                    model=BulkOperationResult,
+                                    description="Bulk operations processed.")
+
     @ftm_tasks_router.get("/", response_description="FtmTasks retrieved", response_model=Response[FtmTask],
                           responses=default_exception_list)
     async def get_ftm_tasks(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                            sort: str | None = None, includeTotals: bool | None = None):
+                            sort: str | None = None, includeTotals: bool | None = None,
+                            estimateTotals: bool | None = None, cursor: str | None = None,
+                            fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all ftm_tasks using the user defined parameters.
         """
-        ftm_tasks_service = FtmTasksService()
-        ftm_tasks = await ftm_tasks_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await ftm_tasks_service.total(q))}
-        return ResponseWithHttpInfo(data=ftm_tasks,
-                                    model=FtmTask,
-                                    description="FtmTasks retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.ftm_tasks_service, FtmTask, "FtmTasks retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @ftm_tasks_router.patch(
         "/{pid}",
@@ -51,16 +60,15 @@ class FtmTasksController:
         response_description="Successfully patched FtmTask.",
         responses=default_exception_list)
     async def patch_ftm_task(self, pid: str, patch_list: List[PatchDocument] = Body(...),
-                            current_user: User = Depends(get_current_user)):
+                             current_user: User = Depends(get_current_user)):
         """
         Patches a product within the space.
         """
-        ftm_tasks_service = FtmTasksService()
-        await ftm_tasks_service.validate_exists(
+        await self.ftm_tasks_service.validate_exists(
             pid=pid,
             additional_filters={}
         )
-        await ftm_tasks_service.patch(pid=pid, patch_document_list=patch_list, current_user=current_user)
+        await self.ftm_tasks_service.patch(pid=pid, patch_document_list=patch_list, current_user=current_user)
         return Response(status_code=204, response_type='success', description="FtmTask patched successfully.")
 
     @ftm_tasks_router.get(
@@ -94,16 +102,15 @@ class FtmTasksController:
         :return: assigned_task: FtmTask
             the assigned task
         """
-        ftm_tasks_service = FtmTasksService()
 
-        q = ftm_tasks_service.get_task_assignment_query(
+        q = self.ftm_tasks_service.get_task_assignment_query(
             taskType=taskType,
             taskStatus=taskStatus,
             targetApplication=targetApplication,
             showCompleted=showCompleted,
         )
 
-        assigned_task = await ftm_tasks_service.get_task_assignment(
+        assigned_task = await self.ftm_tasks_service.get_task_assignment(
             user_pid=current_user.pid,
             offset=offset,
             query=q
@@ -114,7 +121,7 @@ class FtmTasksController:
         else:
             data = [assigned_task]
 
-        headers = {"X-Total-Count": str(await ftm_tasks_service.total(json.dumps(q)))}
+        headers = {"X-Total-Count": str(await self.ftm_tasks_service.count_task_assignments(q))}
 
         return ResponseWithHttpInfo(
             data=data,
@@ -125,21 +132,21 @@ class FtmTasksController:
 
     @ftm_tasks_router.get("/{pid}", response_description="FtmTask data retrieved", response_model=Response[FtmTask],
                           responses=default_exception_list)
-    async def get_ftm_task(self, pid: str):
+    async def get_ftm_task(self, pid: str, fields: str | None = None):
         """Retrieves a ftm_task by ID.
         """
-        ftm_tasks_service = FtmTasksService()
-        ftm_task_exists = await ftm_tasks_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='FtmTask retrieved.',
-                        data=[ftm_task_exists])
+        projection_model = self.ftm_tasks_service.get_projection_model_from_fields(fields)
+        ftm_task_exists = await self.ftm_tasks_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[ftm_task_exists],
+                                    model=projection_model or FtmTask,
+                                    description='FtmTask retrieved.')
 
     @ftm_tasks_router.patch("/{pid}", response_model=Response, response_description="Successfully patched ftm_task.",
                             responses=default_exception_list)
     async def patch_ftm_task(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches a ftm_task within the space.
         """
-        ftm_tasks_service = FtmTasksService()
-        await ftm_tasks_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.ftm_tasks_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="FtmTask patched successfully.")
 
 
@@ -1,4 +1,5 @@
 from fastapi import Body, APIRouter
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.core.exception.exception import default_exception_list, FtmException
@@ -8,6 +9,8 @@ from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
 from ftmcloud.domains.industries.models.models import Industry
 from ftmcloud.domains.industries.services.industry_services import IndustriesService
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 router = APIRouter()
@@ -15,52 +18,50 @@ router = APIRouter()
 
 @controller(router)
 class IndustriesController:
+    industries_service: IndustriesService = Provide(IndustriesService)
+    organizations_service: OrganizationsService = Provide(OrganizationsService)
 
     @router.post("/", response_model=Industry, response_description="Successfully registered industry.",
                  responses=default_exception_list)
     async def add_industry(self, new_industry: Industry = Body(...)):
         """Registers a new industry within the space.
         """
-        industry_service = IndustriesService()
-        industry_exists = await industry_service.find_one({"name": new_industry.name})
+        industry_exists = await self.industries_service.find_one({"name": new_industry.name})
         if industry_exists:
             raise FtmException('error.industry.InvalidName')
-        await industry_service.add_document(new_industry)
+        await self.industries_service.add_document(new_industry)
         return new_industry
 
     @router.get("/", response_description="Industries retrieved", response_model=Response[Industry],
                 responses=default_exception_list)
     async def get_industries(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                             sort: str | None = None, includeTotals: bool | None = None):
+                             sort: str | None = None, includeTotals: bool | None = None,
+                             estimateTotals: bool | None = None, cursor: str | None = None,
+                             fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all industries using the user defined parameters.
         """
-        industry_service = IndustriesService()
-        industries = await industry_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await industry_service.total(q))}
-        return ResponseWithHttpInfo(data=industries,
-                                    model=Industry,
-                                    description="Industries retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.industries_service, Industry, "Industries retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @router.get("/{pid}", response_description="Industry data retrieved", response_model=Response[Industry],
                 responses=default_exception_list)
-    async def get_industry(self, pid: str):
+    async def get_industry(self, pid: str, fields: str | None = None):
         """Retrieves an industry by ID.
         """
-        industry_service = IndustriesService()
-        industry = await industry_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='Industry retrieved.',
-                        data=[industry])
+        projection_model = self.industries_service.get_projection_model_from_fields(fields)
+        industry = await self.industries_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[industry],
+                                    model=projection_model or Industry,
+                                    description='Industry retrieved.')
 
     @router.patch("/{pid}", response_model=Response, response_description="Successfully patched industry.",
                   responses=default_exception_list)
     async def patch_industry(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches an industry within the space.
         """
-        industy_service = IndustriesService()
-        await industy_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.industries_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="Industry patched successfully.")
 
     @router.delete("/{pid}", response_description="Industry successfully deleted.", response_model=Response,
@@ -68,13 +69,11 @@ class IndustriesController:
     async def delete_industry(self, pid: str):
         """Deletes a user.
         """
-        industry_service = IndustriesService()
-        organization_service = OrganizationsService()
-        organizations = await organization_service.get_all(additional_filters={"industryPids": pid})
+        organizations = await self.organizations_service.get_all(additional_filters={"industryPids": pid})
         if len(organizations) > 0:
             message = "Please remove or de-associate the following organizations before deletion: "
             for i in range(0, len(organizations)):
                 message += organizations[i].name
             raise FtmException('error.industry.NotEmpty', developer_message=message, user_message=message)
-        await industry_service.delete_document(pid=pid)
+        await self.industries_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="Industry deleted.")
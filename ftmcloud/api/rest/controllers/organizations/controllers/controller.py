@@ -1,4 +1,5 @@
 from fastapi import Body, APIRouter, Depends
+from pydantic.schema import Literal
 from pydantic.validators import List
 from ftmcloud.cross_cutting.auth.jwt_bearer import get_current_user
 from ftmcloud.core.exception.exception import default_exception_list, FtmException
@@ -9,6 +10,8 @@ from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInf
 from ftmcloud.domains.organizations.models.models import Organization
 from ftmcloud.domains.users.models.models import User
 from ftmcloud.domains.organizations.services.organization_services import OrganizationsService
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 router = APIRouter()
@@ -16,6 +19,8 @@ router = APIRouter()
 
 @controller(router)
 class OrganizationsController:
+    organizations_service: OrganizationsService = Provide(OrganizationsService)
+    user_service: UserService = Provide(UserService)
     current_user: User = Depends(get_current_user)
 
     @router.post(
@@ -27,11 +32,10 @@ class OrganizationsController:
     async def add_organization(self, new_organization: Organization = Body(...)):
         """Registers a new organization within the space.
         """
-        organization_services = OrganizationsService()
-        organization_exists = await organization_services.find_one({"name": new_organization.name})
+        organization_exists = await self.organizations_service.find_one({"name": new_organization.name})
         if organization_exists:
             raise FtmException('error.organization.InvalidName')
-        await organization_services.add_document(new_organization)
+        await self.organizations_service.add_document(new_organization)
         return new_organization
 
     @router.get(
@@ -41,18 +45,15 @@ class OrganizationsController:
         responses=default_exception_list
     )
     async def get_organizations(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                                sort: str | None = None, includeTotals: bool | None = None):
+                                sort: str | None = None, includeTotals: bool | None = None,
+                                estimateTotals: bool | None = None, cursor: str | None = None,
+                                fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all organizations using the user defined parameters.
         """
-        organization_service = OrganizationsService()
-        organizations = await organization_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await organization_service.total(q))}
-        return ResponseWithHttpInfo(data=organizations,
-                                    model=Organization,
-                                    description="Organizations retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.organizations_service, Organization, "Organizations retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @router.get(
         "/{pid}",
@@ -60,13 +61,14 @@ class OrganizationsController:
         response_model=Response[Organization],
         responses=default_exception_list
     )
-    async def get_organization(self, pid: str):
+    async def get_organization(self, pid: str, fields: str | None = None):
         """Retrieves an organization by ID.
         """
-        organization_service = OrganizationsService()
-        organization = await organization_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='Organization retrieved.',
-                        data=[organization])
+        projection_model = self.organizations_service.get_projection_model_from_fields(fields)
+        organization = await self.organizations_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[organization],
+                                    model=projection_model or Organization,
+                                    description='Organization retrieved.')
 
     @router.patch(
         "/{pid}",
@@ -77,8 +79,7 @@ class OrganizationsController:
     async def patch_organization(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches an organization within the space.
         """
-        organization_service = OrganizationsService()
-        await organization_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.organizations_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="Organization patched successfully.")
 
     @router.patch(
@@ -91,8 +92,8 @@ class OrganizationsController:
                                        patch_document_list: List[PatchDocument] = Body(...)):
         """Patches the user's own organization, if their privileges suffice.
         """
-        organization_service = OrganizationsService()
-        await organization_service.patch(pid=self.current_user.organizationPid, patch_document_list=patch_document_list)
+        await self.organizations_service.patch(pid=self.current_user.organizationPid,
+                                               patch_document_list=patch_document_list)
         return Response(status_code=204, response_type='success', description="Organization patched successfully.")
 
     @router.delete(
@@ -104,10 +105,8 @@ class OrganizationsController:
     async def delete_organization(self, pid: str):
         """Deletes a user.
         """
-        organization_service = OrganizationsService()
-        user_service = UserService()
-        users = await user_service.get_all(additional_filters={"organizationPid": pid})
+        users = await self.user_service.get_all(additional_filters={"organizationPid": pid})
         if len(users) > 0:
             raise FtmException('error.organization.NotEmpty')
-        await organization_service.delete_document(pid=pid)
+        await self.organizations_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="Organization deleted.")
@@ -1,8 +1,13 @@
 from fastapi import APIRouter
+from pydantic.schema import Literal
 
 from ftmcloud.domains.privileges.models.models import Privilege
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
+from ftmcloud.cross_cutting.session.session import SessionSnapshotInfo, get_session_snapshot
+from ftmcloud.cross_cutting.session.watcher import session_snapshot_watcher
 from ftmcloud.domains.privileges.services.privilege_services import PrivilegesService
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 router = APIRouter()
@@ -10,29 +15,42 @@ router = APIRouter()
 
 @controller(router)
 class PrivilegesController:
+    privileges_service: PrivilegesService = Provide(PrivilegesService)
+
+    @router.get("/snapshot", response_description="Session snapshot retrieved",
+                response_model=Response[SessionSnapshotInfo])
+    async def get_privileges_snapshot(self):
+        """Describes the privilege and organization snapshot served by this worker.
+        """
+        snapshot = get_session_snapshot()
+        info = SessionSnapshotInfo(version=snapshot.version,
+                                   generation=snapshot.generation,
+                                   loadedAt=snapshot.loaded_at,
+                                   privileges=len(snapshot.privileges_by_pid),
+                                   organizations=len(snapshot.organization_pids),
+                                   refreshMode=session_snapshot_watcher.mode)
+        return Response(status_code=200, response_type='success', description='Session snapshot retrieved.',
+                        data=[info])
 
     @router.get("/{pid}", response_description="Privilege data retrieved", response_model=Response[Privilege])
-    async def get_privilege(self, pid: str):
+    async def get_privilege(self, pid: str, fields: str | None = None):
         """Retrieves a privilege by ID.
         """
-        privilege_service = PrivilegesService()
-        privilege = await privilege_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='User retrieved.', data=[privilege])
+        projection_model = self.privileges_service.get_projection_model_from_fields(fields)
+        privilege = await self.privileges_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[privilege],
+                                    model=projection_model or Privilege,
+                                    description='User retrieved.')
 
     @router.get("/", response_description="Privileges retrieved", response_model=Response[Privilege])
     async def get_privileges(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
                              sort: str | None = None,
-                             includeTotals: bool | None = None):
+                             includeTotals: bool | None = None,
+                             estimateTotals: bool | None = None, cursor: str | None = None,
+                             fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all privileges using the user defined parameters.
         """
-        privilege_service = PrivilegesService()
-        privileges = await privilege_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await privilege_service.total(q=q))}
-        return ResponseWithHttpInfo(status_code=200,
-                                    response_type='success',
-                                    model=Privilege,
-                                    description="Privileges retrieved successfully.",
-                                    data=privileges,
-                                    headers=headers)
+        return await list_response(self.privileges_service, Privilege, "Privileges retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
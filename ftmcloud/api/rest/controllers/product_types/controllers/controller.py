@@ -1,4 +1,5 @@
 from fastapi import Body, APIRouter
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.core.exception.exception import default_exception_list
@@ -7,6 +8,8 @@ from ftmcloud.domains.product_types.services.product_type_service import Product
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
 from ftmcloud.domains.product_types.models.models import ProductType
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 product_type_router = APIRouter()
@@ -14,6 +17,7 @@ product_type_router = APIRouter()
 
 @controller(product_type_router)
 class ProductTypesController:
+    product_types_service: ProductTypesService = Provide(ProductTypesService)
 
     @product_type_router.post("/", response_model=ProductType,
                               response_description="Successfully registered product type.",
@@ -21,36 +25,34 @@ class ProductTypesController:
     async def add_product_type(self, new_product_type: ProductType = Body(...)):
         """Registers a new product type within the space.
         """
-        product_types_service = ProductTypesService()
-        new_product_type = await product_types_service.add_document(new_product_type)
+        new_product_type = await self.product_types_service.add_document(new_product_type)
         return new_product_type
 
     @product_type_router.get("/", response_description="Product types retrieved", response_model=Response[ProductType],
                              responses=default_exception_list)
     async def get_product_types(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                                sort: str | None = None, includeTotals: bool | None = None):
+                                sort: str | None = None, includeTotals: bool | None = None,
+                                estimateTotals: bool | None = None, cursor: str | None = None,
+                                fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all product types using the user defined parameters.
         """
-        product_types_service = ProductTypesService()
-        product_types = await product_types_service.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await product_types_service.total(q))}
-        return ResponseWithHttpInfo(data=product_types,
-                                    model=ProductType,
-                                    description="Product types retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.product_types_service, ProductType, "Product types retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @product_type_router.get("/{pid}", response_description="Product type data retrieved",
                              response_model=Response[ProductType],
                              responses=default_exception_list)
-    async def get_product_type(self, pid: str):
+    async def get_product_type(self, pid: str, fields: str | None = None):
         """Retrieves a product type by ID.
         """
-        product_types_service = ProductTypesService()
-        product_type_exists = await product_types_service.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='Product type retrieved.',
-                        data=[product_type_exists])
+        projection_model = self.product_types_service.get_projection_model_from_fields(fields)
+        product_type_exists = await self.product_types_service.validate_exists(pid=pid,
+                                                                               projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[product_type_exists],
+                                    model=projection_model or ProductType,
+                                    description='Product type retrieved.')
 
     @product_type_router.patch("/{pid}", response_model=Response,
                                response_description="Successfully patched product type.",
@@ -58,8 +60,7 @@ class ProductTypesController:
     async def patch_product_type(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches a product type within the space.
         """
-        product_types_service = ProductTypesService()
-        await product_types_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.product_types_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="Product type patched successfully.")
 
     @product_type_router.delete("/{pid}", response_description="Product type successfully deleted.",
@@ -68,6 +69,5 @@ class ProductTypesController:
     async def delete_product_type(self, pid: str):
         """Deletes a product type.
         """
-        product_types_service = ProductTypesService()
-        await product_types_service.delete_document(pid=pid)
+        await self.product_types_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="Product type deleted.")
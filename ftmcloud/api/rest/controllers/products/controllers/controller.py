@@ -1,15 +1,21 @@
-from fastapi import Body, APIRouter, Depends
+from fastapi import Body, APIRouter, Depends, Request
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.cross_cutting.auth.jwt_bearer import get_current_user
 from ftmcloud.core.exception.exception import default_exception_list, FtmException
 from ftmcloud.domains.products.services.product_service import ProductService
 
+from ftmcloud.cross_cutting.models.bulk import BulkOperation, BulkOperationResult
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
+from ftmcloud.domains.products.models.facets import ProductFacetQuery, ProductFacets
+from ftmcloud.domains.products.models.imports import ProductImportResult
 from ftmcloud.domains.products.models.models import Product
 from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
 from ftmcloud.domains.users.models.models import User
 from ftmcloud.cross_cutting.session.session import has_elevated_privileges
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 
 product_router = APIRouter()
@@ -17,6 +23,7 @@ product_router = APIRouter()
 
 @controller(product_router)
 class ProductsController:
+    product_service: ProductService = Provide(ProductService)
 
     @product_router.post(
         "/",
@@ -28,13 +35,80 @@ class ProductsController:
         """
         Registers a new product within the space.
         """
-        products_service = ProductService()
         if not has_elevated_privileges(user=current_user) and new_product.organizationPid != \
                 current_user.organizationPid:
             raise FtmException("error.organization.NotFound")
-        new_product = await products_service.add_document(new_product)
+        new_product = await self.product_service.add_document(new_product)
         return new_product
 
+    @product_router.post(
+        "/bulk",
+        response_model=Response[BulkOperationResult],
+        response_description="Bulk operations processed.",
+        responses=default_exception_list
+    )
+    async def bulk_products(self, operations: List[BulkOperation] = Body(...),
+                            current_user: User = Depends(get_current_user)):
+        """
+        Creates, patches and deletes many products at once, reporting the status of each operation.
+        """
+        scope_filter = None if has_elevated_privileges(current_user) else \
+            {"organizationPid": current_user.organizationPid}
+        results = await self.product_service.bulk_write(operations=operations, additional_filters=scope_filter,
+                                                        current_user=current_user)
+        return ResponseWithHttpInfo(data=results,
+                                    model=BulkOperationResult,
+                                    description="Bulk operations processed.")
+
+    @product_router.post(
+        "/facets",
+        response_model=Response[ProductFacets],
+        response_description="Product facets retrieved.",
+        responses=default_exception_list
+    )
+    async def get_product_facets(self, query: ProductFacetQuery = Body(...),
+                                 current_user: User = Depends(get_current_user)):
+        """
+        Filters the products of a product type by attribute predicates and counts the values of its attributes
+        among the products matched.
+        """
+        scope_filter = None if has_elevated_privileges(current_user) else \
+            {"organizationPid": current_user.organizationPid}
+        facets = await self.product_service.facets(query, additional_filters=scope_filter)
+        return ResponseWithHttpInfo(data=[facets],
+                                    model=ProductFacets,
+                                    description="Product facets retrieved.")
+
+    @product_router.post(
+        "/import",
+        response_model=Response[ProductImportResult],
+        response_description="Import processed.",
+        responses=default_exception_list,
+        openapi_extra={"requestBody": {"required": True, "content": {
+            "text/csv": {"schema": {"type": "string"}},
+            "application/x-ndjson": {"schema": {"type": "string"}}
+        }}}
+    )
+    async def import_products(self, request: Request, format: Literal["csv", "ndjson"] = "csv",
+                              productTypePid: str | None = None, organizationPid: str | None = None,
+                              current_user: User = Depends(get_current_user)):
+        """
+        Creates or updates the products of a CSV or NDJSON file sent as the request body, matching existing
+        products of the organization by name. Columns other than the fields of a product name attributes of its
+        product type, which defaults to productTypePid. The body is read as it arrives, and the failed rows are
+        reported without preventing the others from being written.
+        """
+        if organizationPid is None:
+            organizationPid = current_user.organizationPid
+        elif not has_elevated_privileges(current_user) and organizationPid != current_user.organizationPid:
+            raise FtmException("error.organization.NotFound")
+        result = await self.product_service.import_file(request.stream(), format=format,
+                                                        organization_pid=organizationPid,
+                                                        product_type_pid=productTypePid)
+        return ResponseWithHttpInfo(data=[result],
+                                    model=ProductImportResult,
+                                    description="Import processed.")
+
     @product_router.get(
         "/",
         response_description="Products retrieved",
@@ -43,22 +117,18 @@ class ProductsController:
     )
     async def get_products(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
                            sort: str | None = None, includeTotals: bool | None = None,
+                           estimateTotals: bool | None = None, cursor: str | None = None,
+                           fields: str | None = None, format: Literal["json", "ndjson"] = "json",
                            current_user: User = Depends(get_current_user)):
         """
         Gets all products using the user defined parameters.
         """
-        products_service = ProductService()
         scope_filter = None if has_elevated_privileges(current_user) else \
             {"organizationPid": current_user.organizationPid}
-        products = await products_service.get_all(q=q, limit=limit, offset=offset, sort=sort,
-                                                  additional_filters=scope_filter)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await products_service.total(q, scope_filter))}
-        return ResponseWithHttpInfo(data=products,
-                                    model=Product,
-                                    description="Products retrieved successfully.",
-                                    headers=headers)
+        return await list_response(self.product_service, Product, "Products retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format, additional_filters=scope_filter)
 
     @product_router.get(
         "/{pid}",
@@ -66,18 +136,20 @@ class ProductsController:
         response_model=Response[Product],
         responses=default_exception_list
     )
-    async def get_product(self, pid: str, current_user: User = Depends(get_current_user)):
+    async def get_product(self, pid: str, fields: str | None = None, current_user: User = Depends(get_current_user)):
         """
         Retrieves a product by ID.
         """
-        products_service = ProductService()
         scope_filter = None if has_elevated_privileges(current_user) else \
             {"organizationPid": current_user.organizationPid}
-        product_exists = await products_service.validate_exists(pid=pid, additional_filters=scope_filter)
+        projection_model = self.product_service.get_projection_model_from_fields(fields)
+        product_exists = await self.product_service.validate_exists(pid=pid, additional_filters=scope_filter,
+                                                                    projection_model=projection_model)
         if product_exists is None:
             raise FtmException("error.product.NotFound")
-        return Response(status_code=200, response_type='success', description='Product retrieved.',
-                        data=[product_exists])
+        return ResponseWithHttpInfo(data=[product_exists],
+                                    model=projection_model or Product,
+                                    description='Product retrieved.')
 
     @product_router.patch("/{pid}", response_model=Response, response_description="Successfully patched product.",
                           responses=default_exception_list)
@@ -86,10 +158,10 @@ class ProductsController:
         """
         Patches a product within the space.
         """
-        products_service = ProductService()
         if not has_elevated_privileges(current_user):
-            await products_service.validate_exists(additional_filters={"organizationPid": current_user.organizationPid})
-        await products_service.patch(pid=pid, patch_document_list=patch_list)
+            await self.product_service.validate_exists(
+                additional_filters={"organizationPid": current_user.organizationPid})
+        await self.product_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="Product patched successfully.")
 
     @product_router.delete(
@@ -102,8 +174,8 @@ class ProductsController:
         """
         Deletes a product.
         """
-        products_service = ProductService()
         if not has_elevated_privileges(current_user):
-            await products_service.validate_exists(additional_filters={"organizationPid": current_user.organizationPid})
-        await products_service.delete_document(pid=pid)
+            await self.product_service.validate_exists(
+                additional_filters={"organizationPid": current_user.organizationPid})
+        await self.product_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="Product deleted.")
@@ -8,6 +8,7 @@ from ftmcloud.domains.products.models.models import Product
 from ftmcloud.domains.reports.models.models import HitList, ProductSearchQuery
 
 from ftmcloud.cross_cutting.models.response import Response
+from ftmcloud.cross_cutting.container.container import Provide
 from ftmcloud.cross_cutting.views.views import controller
 
 router = APIRouter()
@@ -15,6 +16,7 @@ router = APIRouter()
 
 @controller(router)
 class ReportsController:
+    report_service: ReportService = Provide(ReportService)
 
     @router.post('/products', response_description="Successfully retrieved hits.",
                  response_model=Response[HitList[Product]],
@@ -24,8 +26,8 @@ class ReportsController:
         """
         Retrieves products that accurately fit a user-specified requirement.
         """
-        reports_service = ReportService()
-        hit_list = await reports_service.search_products(searchText=query.searchText,
-                                                         productTypePid=query.productTypePid,
-                                                         limit=query.limit, requirements=query.requirements)
+        hit_list = await self.report_service.search_products(searchText=query.searchText,
+                                                             productTypePid=query.productTypePid,
+                                                             limit=query.limit, offset=query.offset,
+                                                             requirements=query.requirements)
         return Response(status_code=200, description="Success", response_type="success", data=[hit_list])
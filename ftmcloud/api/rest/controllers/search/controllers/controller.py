@@ -7,6 +7,7 @@ from ftmcloud.core.exception.exception import default_exception_list
 from ftmcloud.cross_cutting.models.response import ResponseWithHttpInfo, Response
 from ftmcloud.domains.search.models.models import SearchHit
 from ftmcloud.domains.users.models.models import User
+from ftmcloud.cross_cutting.container.container import Provide
 from ftmcloud.cross_cutting.views.views import controller
 
 router = APIRouter()
@@ -14,6 +15,7 @@ router = APIRouter()
 
 @controller(router)
 class SearchController:
+    search_service: SearchService = Provide(SearchService)
 
     @router.get(
         "/",
@@ -24,7 +26,7 @@ class SearchController:
     async def search(
             self,
             q: str,
-            fields: list[dict]=None,
+            fields: str | None = None,
             limit: int=10,
             offset: int=0,
             includeTotals: bool=False,
@@ -33,8 +35,7 @@ class SearchController:
         """
         Retrieves a task from the task queue by ID.
         """
-        search_service = SearchService()
-        results, total = await search_service.search(
+        results, total = await self.search_service.search(
             q=q,
             fields=fields,
             limit=limit,
@@ -1,12 +1,15 @@
 from fastapi import Body, APIRouter
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.cross_cutting.auth.jwt_bearer import get_user_token, get_current_user, token_listener
 from ftmcloud.core.exception.exception import default_exception_list
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
-from ftmcloud.cross_cutting.models.response import Response, ResponseWithHttpInfo
+from ftmcloud.cross_cutting.models.response import Response
 from ftmcloud.domains.users.models.models import UserResponse, UserContact
 from ftmcloud.domains.users.services.user_services import UserContactService
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 from ftmcloud.core.config.config import Settings
 
@@ -15,7 +18,8 @@ router = APIRouter()
 
 @controller(router)
 class UserContactsController:
-    settings = Settings()
+    settings: Settings = Provide(Settings)
+    user_contact_service: UserContactService = Provide(UserContactService)
 
     @router.patch("/{pid}", response_model=Response, response_description="Successfully patched UserContact.",
                   responses=default_exception_list)
@@ -26,14 +30,15 @@ class UserContactsController:
         :param patch_list:
         :return:
         """
-        user_contact_service = UserContactService()
-        await user_contact_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.user_contact_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="UserContact patched successfully.")
 
     @router.get("/", response_description="UserContacts retrieved", response_model=Response[UserContact],
                 responses=default_exception_list)
     async def get_user_contacts(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                                sort: str | None = None, includeTotals: bool | None = None):
+                                sort: str | None = None, includeTotals: bool | None = None,
+                                estimateTotals: bool | None = None, cursor: str | None = None,
+                                fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """ Retrieves all user contacts.
 
         :param q:
@@ -43,17 +48,10 @@ class UserContactsController:
         :param includeTotals:
         :return:
         """
-        user_contact_services = UserContactService()
-        users = await user_contact_services.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await user_contact_services.total(q=q))}
-        return ResponseWithHttpInfo(status_code=200,
-                                    response_type='success',
-                                    model=UserContact,
-                                    description="UserContacts retrieved successfully.",
-                                    data=users,
-                                    headers=headers)
+        return await list_response(self.user_contact_service, UserContact, "UserContacts retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @router.delete("/{pid}", response_description="UserContact successfully deleted.", response_model=Response,
                    responses=default_exception_list)
@@ -63,6 +61,5 @@ class UserContactsController:
         :param pid:
         :return:
         """
-        user_contact_services = UserContactService()
-        await user_contact_services.delete_document(pid=pid)
+        await self.user_contact_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="UserContact deleted.")
@@ -1,4 +1,5 @@
 from fastapi import Body, APIRouter, Depends, BackgroundTasks
+from pydantic.schema import Literal
 from pydantic.validators import List
 
 from ftmcloud.cross_cutting.auth.jwt_bearer import get_user_token, get_current_user, token_listener
@@ -9,6 +10,8 @@ from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.cross_cutting.models.response import Response, LoginResponse, ResponseWithHttpInfo
 from ftmcloud.domains.users.models.models import User, UserSignIn, UserResponse, UserProfile, UserContact
 from ftmcloud.domains.users.services.user_services import UserService, UserContactService
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.views.lists import list_response
 from ftmcloud.cross_cutting.views.views import controller
 from ftmcloud.core.config.config import Settings
 
@@ -17,7 +20,11 @@ router = APIRouter()
 
 @controller(router)
 class UsersController:
-    settings = Settings()
+    settings: Settings = Provide(Settings)
+    organizations_service: OrganizationsService = Provide(OrganizationsService)
+    privileges_service: PrivilegesService = Provide(PrivilegesService)
+    user_contact_service: UserContactService = Provide(UserContactService)
+    user_service: UserService = Provide(UserService)
 
     @router.post("/login", response_model=LoginResponse, responses=default_exception_list)
     async def login_user(self, credentials: UserSignIn = Body(...)):
@@ -25,8 +32,7 @@ class UsersController:
         """
         if self.settings.AUTH_METHOD != "mongo":
             raise FtmException("error.user.AuthenticationMethodDisabled")
-        user_service = UserService()
-        return await user_service.login_user(credentials=credentials)
+        return await self.user_service.login_user(credentials=credentials)
 
     @router.post("/login/sso", response_model=LoginResponse, responses=default_exception_list)
     async def login_user_sso(self, token: str):
@@ -34,8 +40,7 @@ class UsersController:
         """
         if self.settings.AUTH_METHOD != "azure":
             raise FtmException("error.user.AuthenticationMethodDisabled")
-        user_service = UserService()
-        user_token = await user_service.login_user_azure_ad(token=token)
+        user_token = await self.user_service.login_user_azure_ad(token=token)
         return user_token
 
     @router.post("/", response_model=UserResponse, response_description="Successfully registered user.",
@@ -45,13 +50,10 @@ class UsersController:
         """
         if self.settings.AUTH_METHOD != "mongo":
             raise FtmException("error.user.AuthorizationMethodDisabled")
-        user_services = UserService()
-        user = await user_services.validate_new_user(user=new_user)
-        privilege_service = PrivilegesService()
-        organization_service = OrganizationsService()
-        await privilege_service.validate_exists(pid=user.privilegePid)
-        await organization_service.validate_exists(pid=user.organizationPid)
-        await user_services.add_document(user)
+        user = await self.user_service.validate_new_user(user=new_user)
+        await self.privileges_service.validate_exists(pid=user.privilegePid)
+        await self.organizations_service.validate_exists(pid=user.organizationPid)
+        await self.user_service.add_document(user)
         return new_user
 
     @router.patch("/{pid}", response_model=Response, response_description="Successfully patched user.",
@@ -59,44 +61,39 @@ class UsersController:
     async def patch_user(self, pid: str, patch_list: List[PatchDocument] = Body(...)):
         """Patches a user within the space.
         """
-        user_service = UserService()
-        await user_service.patch(pid=pid, patch_document_list=patch_list)
+        await self.user_service.patch(pid=pid, patch_document_list=patch_list)
         return Response(status_code=204, response_type='success', description="User patched successfully.")
 
     @router.get("/", response_description="Users retrieved", response_model=Response[UserResponse],
                 responses=default_exception_list)
     async def get_users(self, q: str | None = None, limit: int | None = None, offset: int | None = None,
-                        sort: str | None = None, includeTotals: bool | None = None):
+                        sort: str | None = None, includeTotals: bool | None = None,
+                        estimateTotals: bool | None = None, cursor: str | None = None,
+                        fields: str | None = None, format: Literal["json", "ndjson"] = "json"):
         """Gets all users using the user defined parameters.
         """
-        user_services = UserService()
-        users = await user_services.get_all(q=q, limit=limit, offset=offset, sort=sort)
-        headers = {}
-        if includeTotals is not None:
-            headers = {"X-Total-Count": str(await user_services.total(q=q))}
-        return ResponseWithHttpInfo(status_code=200,
-                                    response_type='success',
-                                    model=UserResponse,
-                                    description="Users retrieved successfully.",
-                                    data=users,
-                                    headers=headers)
+        return await list_response(self.user_service, UserResponse, "Users retrieved successfully.",
+                                   q=q, limit=limit, offset=offset, sort=sort, cursor=cursor,
+                                   include_totals=includeTotals, estimate_totals=estimateTotals,
+                                   fields=fields, format=format)
 
     @router.get("/{pid}", response_description="User data retrieved", response_model=Response[UserResponse],
                 responses=default_exception_list)
-    async def get_user(self, pid: str):
+    async def get_user(self, pid: str, fields: str | None = None):
         """Retrieves a user by ID.
         """
-        user_services = UserService()
-        user = await user_services.validate_exists(pid=pid)
-        return Response(status_code=200, response_type='success', description='User retrieved.', data=[user])
+        projection_model = self.user_service.get_projection_model_from_fields(fields)
+        user = await self.user_service.validate_exists(pid=pid, projection_model=projection_model)
+        return ResponseWithHttpInfo(data=[user],
+                                    model=projection_model or UserResponse,
+                                    description='User retrieved.')
 
     @router.delete("/{pid}", response_description="User successfully deleted.", response_model=Response,
                    responses=default_exception_list)
     async def delete_user(self, pid: str):
         """Deletes a user.
         """
-        user_services = UserService()
-        await user_services.delete_document(pid=pid)
+        await self.user_service.delete_document(pid=pid)
         return Response(status_code=200, response_type="success", description="User deleted.")
 
     @router.post('/profile', response_description="User profile successfully retrieved.",
@@ -104,16 +101,14 @@ class UsersController:
     async def users_profile(self, token: dict = Depends(get_user_token)):
         """Retrieves the current user's profile given their access token.
         """
-        user_service = UserService()
-        user_profile = await user_service.users_profile(token=token)
+        user_profile = await self.user_service.users_profile(token=token)
         return Response(status_code=200, response_type="success", description="User profile retrieved.",
                         data=[user_profile])
 
     @router.patch('/profile/modify', response_description="User profile successfully modified.",
                   response_model=Response, responses=default_exception_list)
     async def patch_users_profile(self, patch_list: List[PatchDocument], token: dict = Depends(get_user_token)):
-        user_service = UserService()
-        await user_service.patch_users_profile(pid=token['sub'], patch_document_list=patch_list)
+        await self.user_service.patch_users_profile(pid=token['sub'], patch_document_list=patch_list)
         return Response(status_code=204, response_type="success", description="User profile modified.")
 
     @router.post(
@@ -127,10 +122,8 @@ class UsersController:
                                   user_contact: UserContact = Body(...),
                                   sender: User = Depends(get_current_user)
                                   ):
-        user_service = UserService()
-        user_contact_service = UserContactService()
         user_contact.senderPid = sender.pid
         user_contact.status = 'Pending'
-        await user_contact_service.add_document(user_contact)
-        background_tasks.add_task(user_service.process_user_contact, user_contact, sender)
+        await self.user_contact_service.add_document(user_contact)
+        background_tasks.add_task(self.user_service.process_user_contact, user_contact, sender)
         return Response(status_code=201, response_type="success", description="User contact received.")
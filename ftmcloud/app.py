@@ -1,6 +1,7 @@
 from fastapi import Depends
 
 from ftmcloud.cross_cutting.auth.jwt_bearer import token_listener
+from ftmcloud.cross_cutting.auth.permissions import permission_registry
 from ftmcloud.cross_cutting.db.db import initiate_database
 from ftmcloud.core.app.app import FTMApi
 from ftmcloud.api.rest.controllers.users.controllers.controller import router as user_router
@@ -17,16 +18,24 @@ from ftmcloud.api.rest.controllers.products.controllers.controller import produc
 from ftmcloud.api.rest.controllers.reports.controllers.controller import router as reports_router
 from ftmcloud.api.rest.controllers.search.controllers.controller import router as search_router
 from ftmcloud.api.rest.controllers.data_sources.controllers.controller import router as data_sources_router
-from ftmcloud.cross_cutting.session.session import init_privilege_name_to_pid, init_default_organization
+from ftmcloud.api.rest.controllers.caches.controllers.controller import router as caches_router
+from ftmcloud.cross_cutting.session.session import refresh_session_snapshot
+from ftmcloud.cross_cutting.session.watcher import session_snapshot_watcher
 
 app = FTMApi()
 
 
 @app.on_event("startup")
 async def start_database():
+    permission_registry.compile(app.routes)
     await initiate_database()
-    await init_privilege_name_to_pid()
-    await init_default_organization()
+    await refresh_session_snapshot()
+    session_snapshot_watcher.start()
+
+
+@app.on_event("shutdown")
+async def stop_session_watcher():
+    await session_snapshot_watcher.stop()
 
 
 app.include_router(organization_router, tags=['Organizations'], prefix='/api/v0/organizations',
@@ -56,3 +65,5 @@ app.include_router(search_router, tags=['Search'], prefix='/api/v0/search',
                    dependencies=[Depends(token_listener)])
 app.include_router(data_sources_router, tags=['DataSources'], prefix='/api/v0/data_sources',
                    dependencies=[Depends(token_listener)])
+app.include_router(caches_router, tags=['Caches'], prefix='/api/v0/caches',
+                   dependencies=[Depends(token_listener)])
@@ -3,7 +3,7 @@ from fastapi.routing import APIRoute
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from starlette.middleware.cors import CORSMiddleware
-from ftmcloud.core.config.config import Settings
+from ftmcloud.core.config.config import get_settings
 
 from ftmcloud.core.config.config import limiter
 from ftmcloud.core.exception.exception import handle_default_exceptions, configure_logging, FtmException
@@ -29,7 +29,7 @@ class FTMApi(FastAPI):
         if routers is None:
             routers = []
 
-        self.configuration = Settings()
+        self.configuration = get_settings()
 
         def custom_generate_unique_id(route: APIRoute):
             return f"{route.name}"
@@ -69,4 +69,4 @@ class FTMApi(FastAPI):
                             allow_credentials=True,
                             allow_methods=["*"],
                             allow_headers=["*"],
-                            expose_headers=['X-Total-Count'])
+                            expose_headers=['X-Total-Count', 'X-Next-Cursor'])
@@ -1,4 +1,5 @@
 import base64
+import functools
 import os
 from typing import Optional
 
@@ -16,6 +17,30 @@ class BaseConfig(BaseSettings):
     MAX_QUERY_LIMIT: int = 100
     DEFAULT_QUERY_LIMIT: int = 10
     algorithm: str = "HS256"
+    TOKEN_CACHE_SIZE: int = 2048
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL: int = 30
+    PASSWORD_HASH_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 16
+    SESSION_SNAPSHOT_MISS_REFRESH_INTERVAL: int = 5
+    SESSION_SNAPSHOT_POLL_INTERVAL: int = 10
+    SESSION_SNAPSHOT_CHANGE_STREAMS: bool = True
+    COUNT_CACHE_SIZE: int = 512
+    COUNT_CACHE_TTL: int = 30
+    PROJECTION_MODEL_CACHE_SIZE: int = 256
+    MAX_BULK_OPERATIONS: int = 1000
+    BULK_VALIDATION_BATCH_SIZE: int = 100
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_REPORTED_ERRORS: int = 1000
+    FACET_VALUE_LIMIT: int = 50
+    EXPORT_BATCH_SIZE: int = 1000
+    QUERY_CACHE_SIZE: int = 512
+    QUERY_REJECT_UNINDEXED: bool = False
+    UNINDEXED_QUERY_LIMIT: int = 20
+    REFERENCE_CACHE_SIZE: int = 1024
+    REFERENCE_CACHE_TTL: int = 60
+    PRODUCT_VALIDATOR_CACHE_SIZE: int = 256
 
     class Config:
         env_file = ".env.dev"
@@ -59,5 +84,15 @@ class Settings(BaseConfig):
     secret_key: str = JWT_SECRET
 
 
+@functools.lru_cache(maxsize=None)
+def get_settings() -> Settings:
+    """ The settings of the process. Reading them parses the environment and the env file, so
+    they are read once and shared.
+
+    :return: Settings
+    """
+    return Settings()
+
+
 # Rate Limiting
 limiter = Limiter(key_func=get_remote_address)
@@ -3,8 +3,12 @@ import os
 import sys
 import traceback
 import uuid
+from types import MappingProxyType
 
 from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, StrictBool, conint
+from pydantic.error_wrappers import ValidationError
+from pydantic.schema import Literal
 
 from ftmcloud.cross_cutting.models.httperror import HttpError
 import yaml
@@ -16,6 +20,94 @@ def configure_logging():
     logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 
 
+_log_level_names = {
+    "CRITICAL": logging.CRITICAL,
+    "ERROR": logging.ERROR,
+    "WARNING": logging.WARNING,
+    "INFO": logging.INFO
+}
+
+
+class ErrorDefinition(BaseModel):
+    """
+    A single validated entry of the error catalog.
+    """
+    statusCode: conint(ge=400, le=599)
+    developerMessage: str
+    userMessage: str
+    uuid: StrictBool
+    logLevel: Literal["CRITICAL", "ERROR", "WARNING", "INFO"]
+    traceback: StrictBool
+    info: str
+
+    class Config:
+        allow_mutation = False
+        extra = "forbid"
+
+    @property
+    def log_level(self) -> int:
+        return _log_level_names[self.logLevel]
+
+
+class ErrorRegistry:
+    """
+    An immutable, pre-validated lookup of error codes to their definitions. The
+    catalog is parsed once so raising an FtmException is a dictionary lookup rather
+    than a YAML parse.
+    """
+
+    def __init__(self, errors: dict):
+        """
+        Validates every catalog entry up front.
+
+        :param errors: mapping of error code to the raw error definition
+        :raises ValueError: if any definition is malformed
+        """
+        definitions = {}
+        for error_code, raw in errors.items():
+            try:
+                definitions[error_code] = ErrorDefinition.parse_obj(raw)
+            except ValidationError as E:
+                raise ValueError(f"Invalid definition for error '{error_code}': {E}") from E
+        self._definitions = MappingProxyType(definitions)
+
+    @classmethod
+    def from_yaml(cls, path: str):
+        """
+        Loads and compiles the registry from the errors YAML.
+
+        :param path: path of the YAML catalog
+        :return: ErrorRegistry
+        """
+        with open(path, "r") as stream:
+            catalog = yaml.safe_load(stream=stream)
+        return cls(errors=catalog['errors'])
+
+    def __contains__(self, error_code: str):
+        return error_code in self._definitions
+
+    def __len__(self):
+        return len(self._definitions)
+
+    def get(self, error_code: str) -> ErrorDefinition:
+        """
+        Retrieves the definition for the specified error code.
+
+        :param error_code: the application-specific error code
+        :return: ErrorDefinition
+        :raises ValueError: if the error code does not exist
+        """
+        try:
+            return self._definitions[error_code]
+        except KeyError:
+            raise ValueError('The exception class provided does not exist.')
+
+
+error_registry = ErrorRegistry.from_yaml(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'errors.yaml')
+)
+
+
 class FtmException(Exception):
     """
     An exception class which codifies and streamlines exception handling so that
@@ -25,9 +117,9 @@ class FtmException(Exception):
     def __init__(self, error_code: str, developer_message=None, user_message=None, exception=None,
                  language_code: str = "en"):
         """
-        Initialize the exception with the specified exception code. Load the errors
-        YAML and attempt to parse the exception. The details of the exception are
-        listed within the YML file.
+        Initialize the exception with the specified exception code. The details of the
+        exception are looked up in the compiled error registry, which is loaded from
+        the errors YAML once at import.
 
         :param error_code: represents the application-specific code of the exception
         :param developer_message the developer message override
@@ -39,41 +131,15 @@ class FtmException(Exception):
         if exception:
             self.with_traceback(exception.__traceback__)
 
-        root_dir = os.path.dirname(os.path.abspath(__file__))
-
-        with open(os.path.join(root_dir, 'errors.yaml'), "r") as stream:
-            try:
-                error_messages = yaml.safe_load(stream=stream)
-                if error_code not in error_messages['errors']:
-                    raise ValueError('The exception class provided does not exist.')
-                error = error_messages['errors'][error_code]
-                self.error_code = error_code
-                self.developer_message = developer_message if developer_message else error['developerMessage']
-                self.user_message = user_message if user_message else error['userMessage']
-                self.status_code = error['statusCode']
-                self.info = error['info']
-
-                if error['uuid']:
-                    self.error_id = uuid.uuid4()
-                else:
-                    self.error_id = None
-
-                self.traceback = error['traceback']
-
-                match error['logLevel']:
-                    case "CRITICAL":
-                        self.log_level = logging.CRITICAL
-                    case "ERROR":
-                        self.log_level = logging.ERROR
-                    case "WARNING":
-                        self.log_level = logging.WARNING
-                    case "INFO":
-                        self.log_level = logging.INFO
-                    case _:
-                        raise ValueError('The logging level provided is invalid.')
-
-            except yaml.YAMLError as exc:
-                print(exc)
+        error = error_registry.get(error_code)
+        self.error_code = error_code
+        self.developer_message = developer_message if developer_message else error.developerMessage
+        self.user_message = user_message if user_message else error.userMessage
+        self.status_code = error.statusCode
+        self.info = error.info
+        self.error_id = uuid.uuid4() if error.uuid else None
+        self.traceback = error.traceback
+        self.log_level = error.log_level
 
     def __json__(self):
         """
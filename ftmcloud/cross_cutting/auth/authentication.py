@@ -1,18 +1,17 @@
 from fastapi import Depends
 from fastapi.security import HTTPBasicCredentials, HTTPBasic
-from passlib.context import CryptContext
 
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.auth.password_hasher import password_hasher
 from ftmcloud.domains.users.services.user_services import user_collection
 
 security = HTTPBasic()
-hash_helper = CryptContext(schemes=["bcrypt"])
 
 
 async def validate_login(credentials: HTTPBasicCredentials = Depends(security)):
-    admin = user_collection.find_one({"email": credentials.username})
+    admin = await user_collection.find_one({"email": credentials.username})
     if admin:
-        password = hash_helper.verify(credentials.password, admin['password'])
+        password = await password_hasher.verify(credentials.password, admin.password)
         if not password:
             raise FtmException('error.user.InvalidCredentials')
         return True
@@ -3,7 +3,10 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jwt.exceptions import InvalidTokenError
 
 from ftmcloud.core.exception.exception import FtmException
-from .jwt_handler import decode_jwt
+from .jwt_handler import decode_verified_jwt
+from .permissions import permission_registry, permission_for_path
+from ..models.document import live
+from ..session.session import current_user_cache
 from ...domains.users.models.models import User
 
 
@@ -23,31 +26,36 @@ def _validate_user_in_payload(payload):
 
 def _validate_permissions_in_payload(payload):
     """
-    Validates the permissions in the payload.
+    Validates the permissions in the payload, either as a versioned permission set or,
+    for tokens issued before permission sets, as a list of permission keys.
     """
+    if 'permissionSet' in payload:
+        return isinstance(payload['permissionSet'], str)
     return 'permissions' in payload and isinstance(payload['permissions'], list)
 
 
-def verify_jwt(jwtoken: str) -> bool:
+def _verified_claims(jwtoken: str):
     """
-    Ensure the user's access token is valid and fields have not
-    been modified.
+    Decodes the user's access token and ensures the fields have not been
+    modified. Returns the claims if the token is valid, otherwise None.
     """
-    is_token_valid: bool = True
-
     try:
-        payload = decode_jwt(jwtoken)
+        payload = decode_verified_jwt(jwtoken)
     except InvalidTokenError:
         raise FtmException('error.user.InvalidToken')
 
-    if payload:
-        user_valid = _validate_user_in_payload(payload)
-        org_valid = _validate_org_in_payload(payload)
-        permissions_valid = _validate_permissions_in_payload(payload)
-        is_token_valid = user_valid and org_valid and permissions_valid
-    else:
-        is_token_valid = False
-    return is_token_valid
+    if payload and _validate_user_in_payload(payload) and _validate_org_in_payload(payload) \
+            and _validate_permissions_in_payload(payload):
+        return payload
+    return None
+
+
+def verify_jwt(jwtoken: str) -> bool:
+    """
+    Ensure the user's access token is valid and fields have not
+    been modified.
+    """
+    return _verified_claims(jwtoken) is not None
 
 
 class JWTBearer(HTTPBearer):
@@ -57,16 +65,19 @@ class JWTBearer(HTTPBearer):
 
     async def __call__(self, request: Request):
         credentials: HTTPAuthorizationCredentials = await super(JWTBearer, self).__call__(request)
-        print("Credentials :", credentials)
         if credentials:
             if not credentials.scheme == "Bearer":
                 raise FtmException('error.user.InvalidToken',
                                    developer_message="Bad authentication method. Must be of type 'Bearer'!")
 
-            if not verify_jwt(credentials.credentials):
+            token_claims = _verified_claims(credentials.credentials)
+            if token_claims is None:
                 raise FtmException('error.user.InvalidToken', developer_message="Access token integrity is invalid!")
 
-            await init_controller(credentials.credentials, request)
+            # Downstream dependencies read the verified claims from the request rather than
+            # decoding the token again.
+            request.state.token_claims = token_claims
+            await init_controller(token_claims, request)
 
             return credentials.credentials
         else:
@@ -76,40 +87,54 @@ class JWTBearer(HTTPBearer):
 token_listener = JWTBearer()
 
 
-async def get_user_token(token: str = Depends(token_listener)):
-    """Decodes and retrieves the user's access control token. If the permissions field
-    is specified, validates that the permission exists in the user's decoded ACL.
+async def get_user_token(request: Request, token: str = Depends(token_listener)):
+    """Retrieves the user's decoded access control token. The claims are verified
+    once per request by the JWTBearer and shared through the request state.
     """
-    user = decode_jwt(token)
-    return user
+    token_claims = getattr(request.state, 'token_claims', None)
+    if token_claims is None:
+        token_claims = decode_verified_jwt(token)
+    return token_claims
 
 
 async def get_current_user(token_claims: dict = Depends(get_user_token)):
     """
-    Retrieves the current user using the bearer access token claim.
+    Retrieves the current user using the bearer access token claim. Users are served
+    from the per-process current-user cache when present.
 
-    :param token_claims: the encoded token
+    :param token_claims: the decoded token claims
     :return: the user, if they exist, otherwise an FtmException will be thrown
     """
     if 'sub' not in token_claims:
         raise FtmException('error.general.BadTokenIntegrity')
-    user = await User.find_one({"pid": token_claims["sub"], "isDeleted": {"$ne": True}})
+    user = current_user_cache.get(token_claims["sub"])
     if user is None:
-        raise FtmException("error.user.InvalidUser")
-    return user
+        user = await User.find_one(live({"pid": token_claims["sub"]}))
+        if user is None:
+            raise FtmException("error.user.InvalidUser")
+        current_user_cache.set(user.pid, user)
+    # Hand out a copy so a request cannot mutate the cached instance.
+    return user.copy()
 
 
-async def init_controller(token: str, request: Request):
-    """Initializes the controller by first decoding the user's access token,
-    then parsing out their access control and verifying whether they have
-    permission to perform the operation given their role.
+async def init_controller(token_claims, request: Request):
+    """Initializes the controller by parsing out the user's access control from
+    their verified token claims and verifying whether they have permission to
+    perform the operation given their role.
 
-    :param token: represents the token
+    :param token_claims: represents the verified token claims
     :param request: represents the request
     :return: None
     """
-    user = decode_jwt(token)
-    acl_list = user['permissions']
-    route_path = request.method + ':' + str(request.url).replace(f'{str(request.base_url)}api/v0/', '').split('/')[0]
-    if route_path not in acl_list:
+    if 'permissionSet' in token_claims:
+        permission_mask = permission_registry.decode(token_claims['permissionSet'])
+        if permission_mask is None:
+            raise FtmException('error.user.InvalidToken',
+                               developer_message="Access token permissions are outdated. Please re-authenticate.")
+        permission_bit = permission_registry.permission_bit(request.method, request.scope.get('endpoint'),
+                                                            request.scope['path'])
+        is_permitted = permission_bit is not None and (permission_mask >> permission_bit) & 1
+    else:
+        is_permitted = permission_for_path(request.method, request.scope['path']) in token_claims['permissions']
+    if not is_permitted:
         raise FtmException('error.user.InsufficientPrivileges')
@@ -1,18 +1,24 @@
+import hashlib
 import time
+from types import MappingProxyType
 
 import jwt
 
-from ftmcloud.cross_cutting.session.session import privilege_name_to_pid, privilege_pid_to_name, \
-    get_default_organization_pid
-from ftmcloud.domains.organizations.services.organization_services import OrganizationsService
+from ftmcloud.cross_cutting.session.session import get_session_snapshot, get_privilege, organization_exists
 
-from ftmcloud.core.config.config import Settings
-from ftmcloud.domains.privileges.services.privilege_services import PrivilegesService
+from ftmcloud.core.config.config import Settings, get_settings
+from ftmcloud.cross_cutting.auth.permissions import permission_registry
+from ftmcloud.cross_cutting.cache.cache import LRUCache
 from ftmcloud.core.exception.exception import FtmException
 from ftmcloud.cross_cutting.models.response import LoginResponse
 from ftmcloud.domains.users.models.models import User
 
-secret_key = Settings().secret_key
+_settings = get_settings()
+secret_key = _settings.secret_key
+
+# Claims of recently verified access tokens keyed by the token digest. Entries expire
+# with the token itself so a cached token is never honoured past its 'exp'.
+verified_token_cache = LRUCache(max_size=_settings.TOKEN_CACHE_SIZE)
 
 
 async def sign_jwt(user: User) -> LoginResponse:
@@ -23,18 +29,24 @@ async def sign_jwt(user: User) -> LoginResponse:
     :return:
     """
     now = int(time.time())
-    role = await PrivilegesService().validate_exists(pid=user.privilegePid)
-    await OrganizationsService().validate_exists(pid=user.organizationPid)
+    role = await get_privilege(user.privilegePid)
+    if role is None:
+        raise FtmException('error.privilege.NotFound')
+    if not await organization_exists(user.organizationPid):
+        raise FtmException('error.organization.NotFound')
 
     payload = {
         'iss': 'com.analytics-software.api',
         'sub': user.pid,
         'exp': now + 7200,
         'iat': now,
-        'permissions': role.permissions,
         'privilegeName': role.name,
         'orgPid': user.organizationPid
     }
+    if permission_registry.compiled:
+        payload['permissionSet'] = permission_registry.encode(role.permissions)
+    else:
+        payload['permissions'] = role.permissions
 
     signed_jwt = jwt.encode(payload, secret_key, algorithm="HS256")
 
@@ -46,6 +58,25 @@ def decode_jwt(token: str, alg="HS256", options=None) -> dict:
     return decoded_token if decoded_token['exp'] >= time.time() else {}
 
 
+def decode_verified_jwt(token: str) -> MappingProxyType | dict:
+    """Decodes an access token signed by this service, skipping signature verification
+    for tokens verified recently by this process. Returned claims are read-only.
+
+    :param token: str
+        the encoded access token
+    :return: the decoded claims, or an empty dict if the token has expired
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = verified_token_cache.get(digest)
+    if claims is None:
+        decoded_token = decode_jwt(token)
+        if not decoded_token:
+            return decoded_token
+        claims = MappingProxyType(decoded_token)
+        verified_token_cache.set(digest, claims, expires_at=claims['exp'])
+    return claims
+
+
 def construct_user_from_aad_token(token: str, settings: Settings) -> User:
     decode_token = decode_jwt(token=token, alg="RS256", options={"verify_signature": False})
     if (
@@ -54,6 +85,7 @@ def construct_user_from_aad_token(token: str, settings: Settings) -> User:
     ):
         first_name = decode_token["given_name"]
         last_name = decode_token["family_name"]
+        privilege_name_to_pid = get_session_snapshot().privilege_name_to_pid
         privilege_pid = privilege_name_to_pid[settings.DEFAULT_PRIVILEGE_NAME]
         if "roles" in decode_token:
             for _role in decode_token['roles']:
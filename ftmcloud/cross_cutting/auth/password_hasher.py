@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from passlib.context import CryptContext
+
+from ftmcloud.core.config.config import get_settings
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords with bcrypt on a bounded thread pool so a login does not
+    block the event loop. bcrypt releases the GIL while hashing, so the pool runs hashes in
+    parallel with the loop.
+    """
+
+    def __init__(self, rounds: int, max_workers: int, max_concurrency: int):
+        """
+        Initializes the hasher with a single shared CryptContext.
+
+        :param rounds: int
+            bcrypt cost factor. Hashes made with any other cost are rehashed on login.
+        :param max_workers: int
+            number of threads running bcrypt
+        :param max_concurrency: int
+            maximum number of hash operations admitted at once; further callers wait
+        """
+        self._context = CryptContext(
+            schemes=["bcrypt"],
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._max_concurrency = max_concurrency
+        self._semaphore = None
+
+    async def _run(self, fn, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, partial(fn, *args))
+
+    async def hash(self, password: str) -> str:
+        """ Hashes the password.
+
+        :param password: str
+            the plaintext password
+        :return: the bcrypt hash
+        """
+        return await self._run(self._context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        """ Verifies the password against the hash.
+
+        :param password: str
+            the plaintext password
+        :param hashed: str
+            the stored hash
+        :return: whether the password matches
+        """
+        valid, _ = await self.verify_and_update(password, hashed)
+        return valid
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        """ Verifies the password and, if the stored hash was made with outdated cost
+        parameters, produces a replacement hash.
+
+        :param password: str
+            the plaintext password
+        :param hashed: str
+            the stored hash
+        :return: whether the password matches and the new hash to store, if any
+        """
+        try:
+            return await self._run(self._context.verify_and_update, password, hashed)
+        except (ValueError, TypeError):
+            # Not a recognised hash, e.g. accounts provisioned through SSO without a password.
+            return False, None
+
+
+_settings = get_settings()
+password_hasher = PasswordHasher(
+    rounds=_settings.PASSWORD_HASH_ROUNDS,
+    max_workers=_settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=_settings.PASSWORD_HASH_MAX_CONCURRENCY
+)
@@ -0,0 +1,108 @@
+import hashlib
+
+from fastapi.routing import APIRoute
+
+API_PREFIX = "/api/v0/"
+
+
+def permission_for_path(method: str, path: str) -> str | None:
+    """ Builds the ACL key of a request, of the form 'METHOD:resource', where the resource
+    is the first path segment after the API prefix. This is the format seeded onto
+    privileges by scripts/seed_roles.py.
+
+    :param method: str
+        the HTTP method
+    :param path: str
+        the route path or request path
+    :return: the permission key, or None if the path is outside of the API
+    """
+    if not path.startswith(API_PREFIX):
+        return None
+    return f"{method}:{path[len(API_PREFIX):].split('/', 1)[0]}"
+
+
+class PermissionRegistry:
+    """
+    A mapping of every permission exposed by the application's routes to a bit position,
+    compiled once from the routes at startup. Access tokens carry the caller's permissions
+    as a bitset over these positions, tagged with the registry version that produced it.
+    """
+
+    def __init__(self):
+        self.version = None
+        self._permission_bits = {}
+        self._endpoint_bits = {}
+
+    @property
+    def compiled(self):
+        return self.version is not None
+
+    def compile(self, routes):
+        """ Compiles the registry from the application routes. The bit order is the sorted
+        permission keys, so every worker serving the same routes agrees on the encoding.
+
+        :param routes: the application routes
+        :return: None
+        """
+        route_permissions = []
+        for route in routes:
+            if not isinstance(route, APIRoute):
+                continue
+            for method in route.methods:
+                permission = permission_for_path(method, route.path)
+                if permission is not None:
+                    route_permissions.append((method, route.endpoint, permission))
+        permissions = sorted({permission for _, _, permission in route_permissions})
+        self._permission_bits = {permission: bit for bit, permission in enumerate(permissions)}
+        self._endpoint_bits = {
+            (method, endpoint): self._permission_bits[permission] for method, endpoint, permission in route_permissions
+        }
+        self.version = hashlib.sha1("\n".join(permissions).encode()).hexdigest()[:8]
+
+    def encode(self, permissions: list[str]) -> str:
+        """ Encodes a privilege's permissions as a versioned bitset. Permissions that no
+        route exposes grant nothing and are dropped.
+
+        :param permissions: list[str]
+            the permission keys of the privilege
+        :return: str of the form '<version>:<hex bitset>'
+        """
+        mask = 0
+        for permission in permissions:
+            bit = self._permission_bits.get(permission)
+            if bit is not None:
+                mask |= 1 << bit
+        return f"{self.version}:{mask:x}"
+
+    def decode(self, permission_set: str) -> int | None:
+        """ Decodes a versioned bitset issued by this registry.
+
+        :param permission_set: str
+            the encoded permission set from the token
+        :return: the bitset, or None if it was issued for a different set of routes
+        """
+        version, _, mask = permission_set.partition(":")
+        if version != self.version or not mask:
+            return None
+        try:
+            return int(mask, 16)
+        except ValueError:
+            return None
+
+    def permission_bit(self, method: str, endpoint, path: str) -> int | None:
+        """ Resolves the bit guarding the matched route.
+
+        :param method: str
+            the HTTP method of the request
+        :param endpoint: the matched endpoint callable
+        :param path: str
+            the request path, used if the endpoint is not registered
+        :return: the bit position, or None if no route grants it
+        """
+        bit = self._endpoint_bits.get((method, endpoint))
+        if bit is None:
+            bit = self._permission_bits.get(permission_for_path(method, path))
+        return bit
+
+
+permission_registry = PermissionRegistry()
@@ -0,0 +1,104 @@
+import time
+from collections import OrderedDict
+
+_missing = object()
+
+
+class LRUCache:
+    """
+    A bounded, least-recently-used in-process cache. Entries may carry an expiry, after
+    which they are treated as missing and evicted on access.
+    """
+
+    def __init__(self, max_size: int, ttl: float | None = None, clock=time.time):
+        """
+        Initializes a new cache.
+
+        :param max_size: int
+            maximum number of entries held before the least recently used is evicted
+        :param ttl: float | None
+            default time to live of an entry in seconds, or None to never expire
+        :param clock: callable
+            returns the current time in seconds since the epoch
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, default=_missing, count=False) is not _missing
+
+    def get(self, key, default=None, count: bool = True):
+        """ Retrieves the value for the key if present and not expired.
+
+        :param key: the cache key
+        :param default: value returned on a miss
+        :param count: bool
+            whether the lookup is recorded in the hit/miss counters
+        :return: the cached value or the default
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > self._clock():
+                self._entries.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return value
+            del self._entries[key]
+        if count:
+            self.misses += 1
+        return default
+
+    def set(self, key, value, ttl: float | None = None, expires_at: float | None = None):
+        """ Stores the value under the key, evicting the least recently used entry
+        if the cache is full.
+
+        :param key: the cache key
+        :param value: the value to store
+        :param ttl: float | None
+            time to live in seconds, overriding the cache default
+        :param expires_at: float | None
+            absolute expiry in seconds since the epoch, overriding any ttl
+        :return: None
+        """
+        if self.max_size <= 0:
+            return
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = self._clock() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """ Removes the key from the cache.
+
+        :param key: the cache key
+        :param default: value returned if the key is absent
+        :return: the removed value or the default
+        """
+        entry = self._entries.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        """ Summarizes the cache for diagnostics.
+
+        :return: dict of size, capacity, hits and misses
+        """
+        return {
+            "size": len(self._entries),
+            "maxSize": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -0,0 +1,189 @@
+from pydantic import BaseModel
+
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.cross_cutting.cache.cache import LRUCache
+from ftmcloud.cross_cutting.models.document import live
+
+_settings = get_settings()
+
+_missing = object()
+
+
+class ReferenceCache:
+    """
+    A read-through cache of the live documents of a reference model, looked up by pid or by
+    name. Writes through the services and repositories of this process invalidate it; the
+    TTL bounds how long another worker may serve a document after it was modified elsewhere.
+    Cached documents are shared between requests and must not be modified.
+    """
+
+    def __init__(self, model, max_size: int, ttl: float | None = None):
+        """
+        :param model: the document class cached
+        :param max_size: int
+            maximum number of documents held per lookup
+        :param ttl: float | None
+            time to live of a document in seconds
+        """
+        self.model = model
+        self._by_pid = LRUCache(max_size=max_size, ttl=ttl)
+        self._by_name = LRUCache(max_size=max_size, ttl=ttl)
+        self.invalidations = 0
+        # Incremented by every invalidation, so that a lookup racing a write does not cache
+        # the document it read before the write.
+        self._generation = 0
+        self._listeners = []
+
+    def _store(self, document, generation: int):
+        if generation != self._generation:
+            return
+        self._by_pid.set(document.pid, document)
+        name = getattr(document, "name", None)
+        if name is not None:
+            self._by_name.set(name, document)
+
+    async def get(self, pid: str):
+        """ Looks up a live document by pid.
+
+        :param pid: str
+            pid of the document
+        :return: the document, or None if it does not exist
+        """
+        return (await self.get_many([pid]))[pid]
+
+    async def get_many(self, pids: list[str]) -> dict:
+        """ Looks up live documents by pid, querying those not cached with a single $in. Pids
+        that do not exist are not cached, so a document created by another worker is found at once.
+
+        :param pids: list[str]
+            pids of the documents
+        :return: the documents by pid, None for those that do not exist
+        """
+        found = {}
+        misses = []
+        for pid in dict.fromkeys(pids):
+            document = self._by_pid.get(pid, default=_missing)
+            if document is _missing:
+                misses.append(pid)
+            else:
+                found[pid] = document
+        if misses:
+            generation = self._generation
+            for document in await self.model.find(live({"pid": {"$in": misses}})).to_list():
+                self._store(document, generation)
+                found[document.pid] = document
+        return {_pid: found.get(_pid) for _pid in pids}
+
+    async def get_by_name(self, name: str):
+        """ Looks up a live document by name.
+
+        :param name: str
+            name of the document
+        :return: the document, or None if it does not exist
+        """
+        document = self._by_name.get(name, default=_missing)
+        if document is not _missing:
+            return document
+        generation = self._generation
+        document = await self.model.find_one(live({"name": name}))
+        if document is not None:
+            self._store(document, generation)
+        return document
+
+    def invalidate(self, pid: str | None = None):
+        """ Forgets a modified document, or every document if the pid is not known. Names are
+        always forgotten, as the document may have been renamed.
+
+        :param pid: str | None
+            pid of the modified document
+        :return: None
+        """
+        self._generation += 1
+        self.invalidations += 1
+        if pid is None:
+            self._by_pid.clear()
+        else:
+            self._by_pid.pop(pid)
+        self._by_name.clear()
+        for listener in self._listeners:
+            listener(pid)
+
+    def subscribe(self, listener):
+        """ Registers a callable invoked with the pid, or None, of every invalidation, for the
+        caches of values derived from the documents.
+
+        :param listener: callable taking the pid of the modified document, or None
+        :return: None
+        """
+        self._listeners.append(listener)
+
+    def stats(self) -> dict:
+        """ Summarizes the cache for diagnostics.
+
+        :return: dict of the model, size, capacity, hits, misses and invalidations
+        """
+        by_pid, by_name = self._by_pid.stats(), self._by_name.stats()
+        return {
+            "model": self.model.__name__,
+            "size": by_pid["size"],
+            "maxSize": by_pid["maxSize"],
+            "hits": by_pid["hits"] + by_name["hits"],
+            "misses": by_pid["misses"] + by_name["misses"],
+            "invalidations": self.invalidations
+        }
+
+
+class ReferenceCacheStats(BaseModel):
+    """Describes the reference cache of a model in the worker serving the request.
+    """
+    model: str
+    size: int
+    maxSize: int
+    hits: int
+    misses: int
+    invalidations: int
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "model": "Attribute",
+                "size": 212,
+                "maxSize": 1024,
+                "hits": 18342,
+                "misses": 431,
+                "invalidations": 12
+            }
+        }
+
+
+# Reference caches of the declared models, keyed by document class.
+_reference_caches: dict[type, ReferenceCache] = {}
+
+
+def reference_model(model):
+    """ Class decorator declaring a document model as a reference collection: small, rarely
+    modified and read on most requests. Its documents are cached by pid and by name.
+
+    :param model: the document class
+    :return: the document class
+    """
+    _reference_caches[model] = ReferenceCache(model, max_size=_settings.REFERENCE_CACHE_SIZE,
+                                              ttl=_settings.REFERENCE_CACHE_TTL)
+    return model
+
+
+def get_reference_cache(model) -> ReferenceCache | None:
+    """ The cache of a reference model.
+
+    :param model: the document class
+    :return: the cache, or None if the model is not a reference model
+    """
+    return _reference_caches.get(model)
+
+
+def reference_cache_stats() -> list[ReferenceCacheStats]:
+    """ Summarizes the cache of every reference model.
+
+    :return: list[ReferenceCacheStats]
+    """
+    return [ReferenceCacheStats(**_cache.stats()) for _cache in _reference_caches.values()]
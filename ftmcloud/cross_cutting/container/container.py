@@ -0,0 +1,90 @@
+import threading
+
+from ftmcloud.core.config.config import Settings, get_settings
+
+_missing = object()
+
+
+class Container:
+    """
+    A process-wide registry of singletons. A provider is built lazily the first time it is
+    resolved, then shared by every request of the process, so it must not hold request state.
+    """
+
+    def __init__(self):
+        self._factories: dict = {}
+        self._instances: dict = {}
+        # Reentrant, as a factory may resolve the providers it depends on.
+        self._lock = threading.RLock()
+
+    def register(self, key, factory=None):
+        """ Registers how a provider is built, replacing any instance already built.
+
+        :param key: the type, or any hashable, the provider is resolved by
+        :param factory: callable building the instance, the key itself if None
+        :return: None
+        """
+        with self._lock:
+            self._factories[key] = factory if factory is not None else key
+            self._instances.pop(key, None)
+
+    def resolve(self, key):
+        """ Returns the instance of a provider, building it on first use. Types that were not
+        registered are built by calling them without arguments.
+
+        :param key: the type, or any hashable, the provider is resolved by
+        :return: the instance
+        """
+        instance = self._instances.get(key, _missing)
+        if instance is _missing:
+            with self._lock:
+                instance = self._instances.get(key, _missing)
+                if instance is _missing:
+                    instance = self._factories.get(key, key)()
+                    self._instances[key] = instance
+        return instance
+
+    def override(self, key, instance):
+        """ Replaces the instance of a provider, for instance with a stub in tests.
+
+        :param key: the type, or any hashable, the provider is resolved by
+        :param instance: the instance to provide
+        :return: None
+        """
+        with self._lock:
+            self._instances[key] = instance
+
+    def reset(self):
+        """ Forgets every instance built, so that they are built again on next use.
+
+        :return: None
+        """
+        with self._lock:
+            self._instances.clear()
+
+
+container = Container()
+container.register(Settings, get_settings)
+
+
+class Provide:
+    """
+    Declares a class attribute resolved from the container on access. The controller
+    decorator leaves these attributes out of the dependencies FastAPI resolves per request.
+
+        class ProductsController:
+            products_service: ProductService = Provide(ProductService)
+    """
+
+    def __init__(self, key):
+        """
+        :param key: the type, or any hashable, the provider is resolved by
+        """
+        self.key = key
+
+    def __get__(self, instance, owner):
+        # Accessed on the class, for instance while the controller is inspected, the
+        # declaration is returned so that nothing is built before it is used.
+        if instance is None:
+            return self
+        return container.resolve(self.key)
@@ -1,9 +1,9 @@
+import datetime
 import logging
 
 import pymongo.errors
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import TEXT
 
 from ftmcloud.domains.data_sources.models.models import DataSource
 from ftmcloud.domains.ftm_tasks.models.models import FtmTask
@@ -11,7 +11,10 @@ from ftmcloud.domains.organizations.services.organization_services import Organi
 from ftmcloud.domains.privileges.services.privilege_services import PrivilegesService
 from ftmcloud.domains.users.services.user_services import UserService
 from ftmcloud.cross_cutting.session.session import PasswordGenerator
-from ftmcloud.core.config.config import Settings
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.cross_cutting.models.document import live
+from ftmcloud.cross_cutting.db.migrations import ensure_deleted_flag
+from ftmcloud.cross_cutting.db.indexes import QueryShape, check_query_coverage, collection_name, reconcile_indexes
 from ftmcloud.domains.attributes.models.models import Attribute
 from ftmcloud.domains.categories.models.models import Category
 from ftmcloud.domains.industries.models.models import Industry
@@ -24,36 +27,36 @@ from ftmcloud.domains.users.models.models import User, UserContact
 
 logger = logging.getLogger(__name__)
 
-async def _build_indexes(motor_client: AsyncIOMotorClient):
-    """ Initializes any indexes which are required to exist on application
-    startup.
 
-    :return:
-    """
-    logger.debug("Checking indexes...")
-    indexes = [
-        {
-            "name": "user_contacts_search_index",
-            "index": [("message", TEXT), ("subject", TEXT)],
-            "table": "user_contacts"
-        }
-    ]
+DOCUMENT_MODELS = [User, Privilege, Organization, Invitation, Industry, Category, Product, ProductType, Attribute,
+                   FtmTask, UserContact, DataSource]
 
-    for _index in indexes:
-        logger.debug(f"Checking {_index['name']}")
-        try:
-            await motor_client['analytix'][_index['table']].create_index(
-                _index['index'],
-                name=_index["name"]
-            )
-            logger.info(f"Missing index {_index['name']} created on {_index['table']}.")
-        except Exception as e:
-            logger.error(
-                f"""
-                Index {_index['name']} already exists or an error occurred. {str(e)}
-                """
-            )
-    logger.debug("Index initialization complete.")
+# Representative filters of the queries the services run, checked with explain against the
+# declared indexes.
+QUERY_SHAPES = [
+    *[QueryShape(_model, live({"pid": "pid"}), description=f"{collection_name(_model)} by pid")
+      for _model in DOCUMENT_MODELS],
+    QueryShape(Product, live({"organizationPid": "pid"}), description="products of an organization"),
+    QueryShape(Product, live({"name": {"$regex": "^name", "$options": "i"}, "productTypePid": "pid",
+                              "attributeValues.attributePid": {"$in": ["pid"]}}), description="report search"),
+    QueryShape(Product, live({"attributeValues.attributePid": "pid"}), description="products using an attribute"),
+    QueryShape(Product, live({"productTypePid": "pid", "attributeValues": {"$elemMatch": {
+        "attributePid": "pid", "value.value": {"$in": ["value"]}}}}), description="product facets by value"),
+    QueryShape(Product, live({"productTypePid": "pid", "attributeValues": {"$elemMatch": {
+        "attributePid": "pid", "value.numValue": {"$gte": 0, "$lte": 10}}}}), description="product facets by number"),
+    QueryShape(Product, live({"productTypePid": "pid", "attributeValues": {"$elemMatch": {
+        "attributePid": "pid", "value.minValue": {"$lte": 10}, "value.maxValue": {"$gte": 0}}}}),
+               description="product facets by range"),
+    QueryShape(ProductType, live({"attributeValues.attributePid": "pid"}),
+               description="product types using an attribute"),
+    QueryShape(ProductType, live({"categoryPid": "pid"}), description="product types of a category"),
+    QueryShape(User, live({"email": "email"}), description="user by email"),
+    QueryShape(Invitation, live({"organizationPid": "pid", "createdAt": {"$gte": datetime.datetime(2023, 1, 1)}}),
+               sort=[("createdAt", -1)], description="recent invitations of an organization"),
+    QueryShape(FtmTask, live({"completedDatetime": None, "lockDatetime": None}), sort=[("createdAt", -1)],
+               description="task assignment"),
+    QueryShape(FtmTask, {"assigneeUserPid": "pid"}, description="tasks assigned to a user"),
+]
 
 
 async def check_init_database(motor_client: AsyncIOMotorClient):
@@ -148,13 +151,18 @@ async def initiate_database(initial=False):
 
     :return:
     """
-    client = AsyncIOMotorClient(Settings().DATABASE_URL)
-    await init_beanie(database=client.analytix,
-                      document_models=[User, Privilege, Organization, Invitation, Industry, Category, Product,
-                                       ProductType, Attribute, FtmTask, UserContact, DataSource])
+    client = AsyncIOMotorClient(get_settings().DATABASE_URL)
+    # Creates the missing indexes. Changed indexes keep serving queries under their previous
+    # definition until rebuilt with scripts.reconcile_indexes.
+    await reconcile_indexes(client.analytix, DOCUMENT_MODELS)
+    # Beanie only creates the indexes of Indexed fields, as it does not read managed_indexes, and
+    # drops none.
+    await init_beanie(database=client.analytix, document_models=DOCUMENT_MODELS, allow_index_dropping=False)
+    # Before anything reads through the live filter, which only matches boolean flags.
+    await ensure_deleted_flag(client.analytix, DOCUMENT_MODELS)
     if initial:
         logger.info("Verifying db integrity...")
         await check_init_database(motor_client=client)
-        await _build_indexes(motor_client=client)
+        await check_query_coverage(client.analytix, QUERY_SHAPES)
         client.close()
         logger.info("Database integrity verified.")
@@ -0,0 +1,233 @@
+import json
+import logging
+
+import pymongo.errors
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import IndexModel
+
+logger = logging.getLogger(__name__)
+
+# Index options that change what an index holds or enforces. Two indexes with the same keys
+# and these options are interchangeable.
+_COMPARED_OPTIONS = ("unique", "sparse", "partialFilterExpression", "expireAfterSeconds", "weights")
+
+CREATE = "create"
+REBUILD = "rebuild"
+EXTRA = "extra"
+
+
+def collection_name(model) -> str:
+    """ The name of the collection of a document model, as Beanie resolves it.
+
+    :param model: the document class
+    :return: str
+    """
+    return getattr(getattr(model, "Settings", None), "name", None) or model.__name__
+
+
+def declared_indexes(model) -> list[IndexModel]:
+    """ The indexes declared on a document model, through Indexed field types and its
+    Settings.managed_indexes. Beanie does not read managed_indexes, so these indexes are only
+    created, and rebuilt, by reconcile_indexes.
+
+    :param model: the document class
+    :return: list[IndexModel]
+    """
+    indexes = [
+        IndexModel([(field.alias, field.outer_type_._indexed[0])], **field.outer_type_._indexed[1])
+        for field in model.__fields__.values() if getattr(field.outer_type_, "_indexed", None)
+    ]
+    for index in getattr(getattr(model, "Settings", None), "managed_indexes", None) or []:
+        if isinstance(index, IndexModel):
+            indexes.append(index)
+        elif isinstance(index, str):
+            indexes.append(IndexModel([(index, 1)]))
+        else:
+            indexes.append(IndexModel(index))
+    return indexes
+
+
+def _spec(index: dict) -> tuple:
+    """ Normalizes an index, declared or read from index_information, to its keys and the
+    options that matter. Text indexes are stored as _fts/_ftsx with weights per field.
+    """
+    keys = list(index["key"].items()) if isinstance(index["key"], dict) else list(index["key"])
+    options = {_option: index[_option] for _option in _COMPARED_OPTIONS if _option in index}
+    text_fields = [_field for _field, _direction in keys if _direction == "text" and _field != "_fts"]
+    if text_fields:
+        keys = [_key for _key in keys if _key[1] != "text"] + [("_fts", "text"), ("_ftsx", 1)]
+        options["weights"] = {**{_field: 1 for _field in text_fields}, **options.get("weights", {})}
+    if options.get("sparse") is False:
+        del options["sparse"]
+    if options.get("unique") is False:
+        del options["unique"]
+    return tuple(keys), json.dumps(options, sort_keys=True, default=str)
+
+
+class IndexChange:
+    """
+    A difference between the indexes declared on a model and those of its collection.
+    """
+
+    def __init__(self, collection: str, name: str, action: str, declared: IndexModel | None = None,
+                 existing: dict | None = None, replaces: str | None = None):
+        """
+        :param collection: str
+            the collection
+        :param name: str
+            the name of the index
+        :param action: str
+            create a missing index, rebuild one whose keys or options changed, or report an
+            extra index that is not declared
+        :param declared: IndexModel | None
+            the declared index
+        :param existing: dict | None
+            the index in the collection
+        :param replaces: str | None
+            the name of the existing index dropped by a rebuild
+        """
+        self.collection = collection
+        self.name = name
+        self.action = action
+        self.declared = declared
+        self.existing = existing
+        self.replaces = replaces
+        self.error: str | None = None
+
+    def __str__(self):
+        symbol = {CREATE: "+", REBUILD: "~", EXTRA: "-"}[self.action]
+        spec = self.declared.document if self.declared is not None else self.existing
+        line = f"{symbol} {self.collection}.{self.name} {json.dumps(spec, default=str)}"
+        if self.replaces is not None:
+            line += f" (replaces {self.replaces})"
+        return line
+
+
+async def diff_indexes(database: AsyncIOMotorDatabase, models: list) -> list[IndexChange]:
+    """ Compares the declared indexes of the models with those of their collections.
+
+    :param database: AsyncIOMotorDatabase
+    :param models: the document classes
+    :return: the changes reconciling the collections with the declarations
+    """
+    changes = []
+    for model in models:
+        name = collection_name(model)
+        existing = await database[name].index_information()
+        existing.pop("_id_", None)
+        existing_by_spec = {_spec(_index): _name for _name, _index in existing.items()}
+        matched = set()
+        for index in declared_indexes(model):
+            document = index.document
+            index_name = document["name"]
+            spec = _spec(document)
+            if index_name in existing and _spec(existing[index_name]) == spec:
+                matched.add(index_name)
+            elif index_name in existing:
+                matched.add(index_name)
+                changes.append(IndexChange(name, index_name, REBUILD, declared=index, existing=existing[index_name],
+                                           replaces=index_name))
+            elif spec in existing_by_spec:
+                # The same index exists under another name, which Mongo will not create twice.
+                matched.add(existing_by_spec[spec])
+                changes.append(IndexChange(name, index_name, REBUILD, declared=index,
+                                           existing=existing[existing_by_spec[spec]],
+                                           replaces=existing_by_spec[spec]))
+            else:
+                changes.append(IndexChange(name, index_name, CREATE, declared=index))
+        for index_name in existing.keys() - matched:
+            changes.append(IndexChange(name, index_name, EXTRA, existing=existing[index_name]))
+    return changes
+
+
+async def reconcile_indexes(database: AsyncIOMotorDatabase, models: list, dry_run: bool = False,
+                            rebuild: bool = False, drop_extra: bool = False) -> list[IndexChange]:
+    """ Creates the declared indexes missing from the collections of the models. Running it
+    again once reconciled changes nothing. Rebuilding a changed index and dropping an index
+    that is not declared interrupt the queries it serves, so both must be asked for.
+
+    :param database: AsyncIOMotorDatabase
+    :param models: the document classes
+    :param dry_run: bool
+        only report the changes
+    :param rebuild: bool
+        drop and recreate the indexes whose keys or options changed
+    :param drop_extra: bool
+        drop the indexes that are not declared
+    :return: the changes, each carrying an error if it failed
+    """
+    changes = await diff_indexes(database, models)
+    for change in changes:
+        if dry_run:
+            logger.info(f"Index change (dry run): {change}")
+            continue
+        collection = database[change.collection]
+        try:
+            if change.action == CREATE:
+                await collection.create_indexes([change.declared])
+            elif change.action == REBUILD and rebuild:
+                await collection.drop_index(change.replaces)
+                await collection.create_indexes([change.declared])
+            elif change.action == EXTRA and drop_extra:
+                await collection.drop_index(change.name)
+            else:
+                flag = "--rebuild" if change.action == REBUILD else "--drop-extra"
+                logger.warning(f"Index change not applied: {change}. "
+                               f"Apply it with python -m scripts.reconcile_indexes {flag}.")
+                continue
+            logger.info(f"Index change applied: {change}")
+        except pymongo.errors.PyMongoError as e:
+            change.error = str(e)
+            logger.error(f"Index change failed: {change}. {e}")
+    return changes
+
+
+class QueryShape:
+    """
+    A query the application runs, checked against the indexes with explain.
+    """
+
+    def __init__(self, model, query: dict, sort: list | None = None, description: str = ""):
+        """
+        :param model: the document class queried
+        :param query: dict
+            a representative filter, including the live document predicate
+        :param sort: list | None
+            the sort criteria
+        :param description: str
+            where the application runs the query
+        """
+        self.model = model
+        self.query = query
+        self.sort = sort
+        self.description = description
+
+
+def _stages(plan: dict):
+    yield plan.get("stage")
+    for key in ("inputStage", "queryPlan"):
+        if isinstance(plan.get(key), dict):
+            yield from _stages(plan[key])
+    for child in plan.get("inputStages", []):
+        yield from _stages(child)
+
+
+async def check_query_coverage(database: AsyncIOMotorDatabase, shapes: list[QueryShape]) -> list[tuple]:
+    """ Explains the query shapes and reports those whose winning plan scans the collection.
+
+    :param database: AsyncIOMotorDatabase
+    :param shapes: list[QueryShape]
+    :return: the shapes paired with whether an index serves them and the stages of the plan
+    """
+    results = []
+    for shape in shapes:
+        cursor = database[collection_name(shape.model)].find(shape.query)
+        if shape.sort:
+            cursor = cursor.sort(shape.sort)
+        explanation = await cursor.explain()
+        stages = [_stage for _stage in _stages(explanation["queryPlanner"]["winningPlan"]) if _stage]
+        covered = "COLLSCAN" not in stages
+        if not covered:
+            logger.warning(f"Query on {collection_name(shape.model)} scans the collection: {shape.description}")
+        results.append((shape, covered, stages))
+    return results
@@ -0,0 +1,63 @@
+import datetime
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ftmcloud.cross_cutting.db.indexes import collection_name
+
+logger = logging.getLogger(__name__)
+
+# Values soft deletes stored before isDeleted was a boolean.
+_LEGACY_DELETED = ["true", "True", "1", 1]
+# Records the migrations completed on the database, by name.
+MIGRATIONS_COLLECTION = "migrations"
+DELETED_FLAG_MIGRATION = "normalize_deleted_flag"
+
+
+async def normalize_deleted_flag(database: AsyncIOMotorDatabase, models: list,
+                                 dry_run: bool = False) -> dict[str, tuple[int, int]]:
+    """ Stores isDeleted as a boolean on every document of the models. Documents soft deleted
+    with a string flag become True, and documents without a boolean flag, which were never
+    deleted, become False. Running it again once normalized changes nothing.
+
+    :param database: AsyncIOMotorDatabase
+    :param models: the document classes
+    :param dry_run: bool
+        only count the documents to normalize
+    :return: the number of documents flagged deleted and live, per collection
+    """
+    deleted_filter = {"isDeleted": {"$in": _LEGACY_DELETED}}
+    live_filter = {"isDeleted": {"$not": {"$type": "bool"}}}
+    counts = {}
+    for model in models:
+        name = collection_name(model)
+        collection = database[name]
+        if dry_run:
+            deleted = await collection.count_documents(deleted_filter)
+            # Legacy deleted documents would also match the live filter until normalized.
+            live = await collection.count_documents(live_filter) - deleted
+        else:
+            deleted = (await collection.update_many(deleted_filter, {"$set": {"isDeleted": True}})).modified_count
+            live = (await collection.update_many(live_filter, {"$set": {"isDeleted": False}})).modified_count
+        if deleted or live:
+            logger.info(f"Normalized isDeleted on {name}{' (dry run)' if dry_run else ''}: "
+                        f"{deleted} deleted, {live} live.")
+        counts[name] = (deleted, live)
+    if not dry_run:
+        await database[MIGRATIONS_COLLECTION].update_one(
+            {"_id": DELETED_FLAG_MIGRATION}, {"$set": {"completedAt": datetime.datetime.now()}}, upsert=True)
+    return counts
+
+
+async def ensure_deleted_flag(database: AsyncIOMotorDatabase, models: list):
+    """ Normalizes isDeleted unless it has been recorded as done. Reads go through the live
+    filter, which only matches a boolean flag, so this must complete before any is served.
+
+    :param database: AsyncIOMotorDatabase
+    :param models: the document classes
+    :return:
+    """
+    if await database[MIGRATIONS_COLLECTION].find_one({"_id": DELETED_FLAG_MIGRATION}) is not None:
+        return
+    logger.info("Normalizing isDeleted before serving...")
+    await normalize_deleted_flag(database, models)
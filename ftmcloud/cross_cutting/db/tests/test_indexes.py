@@ -0,0 +1,26 @@
+import unittest
+
+from ftmcloud.cross_cutting.db.db import DOCUMENT_MODELS
+from ftmcloud.cross_cutting.db.indexes import declared_indexes
+from ftmcloud.cross_cutting.query.query import declared_index_fields
+from ftmcloud.domains.privileges.models.models import Privilege
+from ftmcloud.domains.products.models.models import Product
+
+
+class TestDeclaredIndexes(unittest.TestCase):
+
+    def test_beanie_creates_no_managed_index(self):
+        # init_beanie creates Settings.indexes, which would fail the startup on an index whose
+        # options changed under the same name before reconcile_indexes rebuilt it.
+        for model in DOCUMENT_MODELS:
+            self.assertIsNone(getattr(model.Settings, "indexes", None), model.__name__)
+            self.assertTrue(model.Settings.managed_indexes, model.__name__)
+
+    def test_reads_managed_indexes(self):
+        self.assertEqual(["pid_1", "name_1"], [_index.document["name"] for _index in declared_indexes(Privilege)])
+        self.assertIn("pid_1", [_index.document["name"] for _index in declared_indexes(Product)])
+        self.assertEqual(frozenset({"_id", "pid", "name"}), declared_index_fields(Privilege))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import elasticsearch.exceptions
 from elasticsearch import Elasticsearch
 
-from ftmcloud.core.config.config import Settings
+from ftmcloud.core.config.config import get_settings
 from ftmcloud.core.exception.exception import FtmException
 from ftmcloud.cross_cutting.query.query import validate_is_json
 
@@ -12,7 +12,7 @@ class ElasticSearchIndexConnector:
         """
         Creates a new ElasticSearchConnectionManager.
         """
-        self.config = Settings()
+        self.config = get_settings()
         self.index_name = index_name
         self.client = Elasticsearch(
             hosts=[self.config.ELASTICSEARCH_URI],
@@ -37,6 +37,8 @@ class ElasticSearchIndexConnector:
             include_totals=None,
             additional_filters=None,
             fields=None,
+            source_includes=None,
+            source_excludes=None,
     ):
         try:
             total_results = None
@@ -52,7 +54,9 @@ class ElasticSearchIndexConnector:
                 filter_path=filter_path,
                 size=limit,
                 from_=offset,
-                fields=fields
+                fields=fields,
+                source_includes=source_includes,
+                source_excludes=source_excludes
             )
 
             if documents is not None:
@@ -0,0 +1,106 @@
+import asyncio
+from contextvars import ContextVar
+
+from ftmcloud.cross_cutting.cache.reference import get_reference_cache
+from ftmcloud.cross_cutting.models.document import live
+
+
+class DocumentLoader:
+    """
+    A request-scoped loader of documents by pid. Every lookup issued for a model within the
+    same event loop tick is coalesced into a single $in query, and results, including misses,
+    are memoized for the rest of the request.
+    """
+
+    def __init__(self):
+        self._futures: dict[tuple, asyncio.Future] = {}
+        self._batches: dict[type, dict[str, asyncio.Future]] = {}
+
+    def load(self, model, pid: str) -> asyncio.Future:
+        """ Loads the live document of the model with the specified pid.
+
+        :param model: the document class to load from
+        :param pid: str
+            pid of the document
+        :return: an awaitable resolving to the document, or None if it does not exist
+        """
+        key = (model, pid)
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            batch = self._batches.get(model)
+            if batch is None:
+                batch = self._batches[model] = {}
+                loop.call_soon(self._dispatch, model)
+            batch[pid] = future
+        return future
+
+    async def load_many(self, model, pids: list[str]) -> list:
+        """ Loads the live documents of the model with the specified pids in one query.
+
+        :param model: the document class to load from
+        :param pids: list[str]
+            pids of the documents
+        :return: the documents in the order of the pids, None for those that do not exist
+        """
+        return list(await asyncio.gather(*(self.load(model, _pid) for _pid in pids)))
+
+    def clear(self, model, pid: str):
+        """ Forgets the memoized document, for instance after it was modified.
+
+        :param model: the document class
+        :param pid: str
+            pid of the document
+        :return: None
+        """
+        future = self._futures.get((model, pid))
+        if future is not None and future.done():
+            del self._futures[(model, pid)]
+
+    def _dispatch(self, model):
+        batch = self._batches.pop(model)
+        asyncio.get_running_loop().create_task(self._fetch(model, batch))
+
+    async def _fetch(self, model, batch: dict[str, asyncio.Future]):
+        cache = get_reference_cache(model)
+        try:
+            if cache is not None:
+                by_pid = await cache.get_many(list(batch))
+            else:
+                documents = await model.find(live({"pid": {"$in": list(batch)}})).to_list()
+                by_pid = {_document.pid: _document for _document in documents}
+        except Exception as E:
+            for pid, future in batch.items():
+                # A failed lookup is not memoized so that it may be retried.
+                self._futures.pop((model, pid), None)
+                if not future.done():
+                    future.set_exception(E)
+            return
+        for pid, future in batch.items():
+            if not future.done():
+                future.set_result(by_pid.get(pid))
+
+
+_request_loader: ContextVar[DocumentLoader | None] = ContextVar("request_loader", default=None)
+
+
+async def bind_request_loader() -> DocumentLoader:
+    """ Dependency binding a new DocumentLoader to the current request.
+
+    :return: the loader of the request
+    """
+    loader = DocumentLoader()
+    _request_loader.set(loader)
+    return loader
+
+
+def get_loader() -> DocumentLoader:
+    """ Returns the loader of the current request. Outside of a request, a new loader is
+    returned so that lookups are still batched but nothing is memoized across calls.
+
+    :return: the loader
+    """
+    loader = _request_loader.get()
+    return loader if loader is not None else DocumentLoader()
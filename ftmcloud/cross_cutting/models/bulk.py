@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+from pydantic.schema import Literal, Optional, List
+
+from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
+
+
+class BulkOperation(BaseModel):
+    """A single operation within a bulk request. A create carries the document to register,
+    a patch the pid and its JSON-Patch documents, and a delete only the pid.
+
+    """
+    op: Literal["create", "patch", "delete"]
+    pid: Optional[str]
+    document: Optional[dict]
+    patch: Optional[List[PatchDocument]]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "op": "patch",
+                "pid": "2022eb7c-7abd-4d25-9e4e-d67820b9a5bd",
+                "patch": [{"op": "replace", "path": "/name", "value": "New name value"}]
+            }
+        }
+
+
+class BulkOperationResult(BaseModel):
+    """The outcome of a single operation within a bulk request, reported at the index of the
+    operation in the request.
+
+    """
+    index: int
+    op: str
+    pid: Optional[str]
+    statusCode: int
+    errorCode: Optional[str]
+    developerMessage: Optional[str]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "index": 0,
+                "op": "create",
+                "pid": "2022eb7c-7abd-4d25-9e4e-d67820b9a5bd",
+                "statusCode": 201,
+                "errorCode": None,
+                "developerMessage": None
+            }
+        }
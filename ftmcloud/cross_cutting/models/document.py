@@ -4,15 +4,48 @@ from beanie import Document
 from pydantic.class_validators import Optional
 from pydantic.config import Extra
 from pydantic.fields import Field
-from pydantic.types import SecretBytes
 from beanie.odm.fields import PydanticObjectId
+from pymongo import ASCENDING, IndexModel
+
+
+# Matches the documents that are not soft-deleted. The indexes serving scoped reads only hold
+# these documents, so a query uses them only if it includes this exact predicate.
+LIVE_FILTER = {"isDeleted": False}
+
+
+def live(query: dict | None = None) -> dict:
+    """ Restricts a query to the documents that are not soft-deleted.
+
+    :param query: dict | None
+        the query to restrict
+    :return: dict
+    """
+    return {**(query or {}), **LIVE_FILTER}
+
+
+def live_index(keys: list, **kwargs) -> IndexModel:
+    """ An index holding only the documents that are not soft-deleted.
+
+    :param keys: list
+        the keys of the index
+    :param kwargs: the options of the index
+    :return: IndexModel
+    """
+    return IndexModel(keys, partialFilterExpression=LIVE_FILTER, **kwargs)
+
+
+# Every document is looked up by its pid, directly or through the loader.
+PID_INDEX = live_index([("pid", ASCENDING)], name="pid_1")
 
 
 class BaseDocument(Document):
 
     # id: PydanticObjectId = Field(..., exclude=True)
     createdAt: datetime.datetime = Field(default=datetime.datetime.now())
-    isDeleted: SecretBytes = Field(default=False, exclude=True)
+    # Stored for the live filter to match. Hidden fields are left out of queries, projections and dict().
+    isDeleted: bool = Field(default=False, hidden=True)
+    # Incremented by every patch; patches apply only to the revision they were computed from.
+    revision: int = 0
 
     class Config:
         extra = Extra.forbid
@@ -0,0 +1,23 @@
+import unittest
+
+from ftmcloud.domains.privileges.models.models import Privilege
+from ftmcloud.domains.privileges.services.privilege_services import PrivilegesService
+
+
+class TestBaseDocument(unittest.TestCase):
+
+    def test_stores_the_deleted_flag(self):
+        privilege = Privilege.construct(pid="privilege", name="users:get", isDeleted=False, revision=0)
+        # Beanie encodes documents for the database through _iter(to_dict=False).
+        self.assertIs(False, dict(privilege._iter(to_dict=False, by_alias=True))["isDeleted"])
+
+    def test_hides_the_deleted_flag(self):
+        # Beanie leaves the hidden fields out of dict() and json() once the document is initialized.
+        self.assertIn("isDeleted", Privilege.get_hidden_fields())
+        service = PrivilegesService()
+        self.assertNotIn("isDeleted", service.get_projection_model_from_fields("-name").__fields__)
+        self.assertNotIn("isDeleted", service.get_projection_model_from_fields("pid").__fields__)
+
+
+if __name__ == '__main__':
+    unittest.main()
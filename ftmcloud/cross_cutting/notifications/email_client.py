@@ -6,7 +6,7 @@ from pydantic.class_validators import validator
 from pydantic.main import BaseModel
 from azure.communication.email import EmailClient as AzureEmailClient
 
-from ftmcloud.core.config.config import Settings
+from ftmcloud.core.config.config import get_settings
 
 
 class EmailAttachment(BaseModel):
@@ -41,7 +41,7 @@ class EmailClient:
         Provides communication via email to send notifications
         to users.
         """
-        self.settings = Settings()
+        self.settings = get_settings()
         self._logger = logging.getLogger(self.__class__.__name__)
         self._email_client = AzureEmailClient.from_connection_string(
             conn_str=self.settings.AZURE_COMMUNICATION_URI
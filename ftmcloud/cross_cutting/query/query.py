@@ -1,7 +1,12 @@
+import datetime
 import json
 from json import JSONDecodeError
 
+from pydantic import BaseModel
+from pymongo import IndexModel
+
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.cache.cache import LRUCache
 
 
 def validate_is_json(raw):
@@ -14,4 +19,347 @@ def validate_is_json(raw):
     try:
         return json.loads(raw)
     except JSONDecodeError as E:
-        raise FtmException("error.general.InvalidJson", developer_message=E.__str__())
\ No newline at end of file
+        raise FtmException("error.general.InvalidJson", developer_message=E.__str__())
+
+
+# Operators a client may use in q. Anything else, $where, $expr and $function included, is rejected.
+LOGICAL_OPERATORS = frozenset({"$and", "$or", "$nor"})
+FIELD_OPERATORS = frozenset({
+    "$eq", "$ne", "$gt", "$gte", "$lt", "$lte", "$in", "$nin", "$exists", "$regex", "$options", "$not",
+    "$size", "$all", "$elemMatch"
+})
+# Operators that match by exclusion and therefore cannot narrow an index scan.
+NEGATIVE_OPERATORS = frozenset({"$ne", "$nin", "$not"})
+# Multiline mode is left out: it lets '^' match after any newline, which unanchors the pattern.
+REGEX_OPTIONS = frozenset("isx")
+MAX_DEPTH = 8
+
+# Marks a field whose subfields cannot be resolved from the model, such as a dict or a union.
+_any_field = object()
+
+
+def _invalid(message: str):
+    return FtmException("error.query.InvalidQuery", developer_message=message)
+
+
+class FieldPredicate:
+    """
+    A condition on a single field: equality to a value, or a set of field operators.
+    """
+
+    def __init__(self, path: str, operators: dict | None = None, value=None):
+        """
+        :param path: str
+            the dotted Mongo path of the field
+        :param operators: dict | None
+            the field operators and their compiled operands, None for an equality
+        :param value:
+            the value of an equality
+        """
+        self.path = path
+        self.operators = operators
+        self.value = value
+
+    def to_mongo(self) -> dict:
+        return {self.path: self.operators if self.operators is not None else self.value}
+
+    def index_fields(self) -> set[str]:
+        if self.operators is not None:
+            if all(_op in NEGATIVE_OPERATORS for _op in self.operators):
+                return set()
+            if self.operators.get("$exists") is False:
+                return set()
+        return {self.path}
+
+
+class LogicalClause:
+    """
+    A $and, $or or $nor over nested conjunctions.
+    """
+
+    def __init__(self, operator: str, branches: list):
+        """
+        :param operator: str
+            the logical operator
+        :param branches: list[Conjunction]
+            the nested conjunctions
+        """
+        self.operator = operator
+        self.branches = branches
+
+    def to_mongo(self) -> dict:
+        return {self.operator: [_branch.to_mongo() for _branch in self.branches]}
+
+    def is_indexed(self, indexed_fields: frozenset) -> bool:
+        if self.operator == "$and":
+            return any(_branch.is_indexed(indexed_fields) for _branch in self.branches)
+        if self.operator == "$or":
+            # Each branch of a $or is planned on its own and must have an index to avoid a scan.
+            return all(_branch.is_indexed(indexed_fields) for _branch in self.branches)
+        return False
+
+
+class Conjunction:
+    """
+    The clauses of a query document, all of which must match. The root of a compiled query.
+    """
+
+    def __init__(self, clauses: list):
+        """
+        :param clauses: list[FieldPredicate | LogicalClause]
+        """
+        self.clauses = clauses
+
+    def to_mongo(self) -> dict:
+        query = {}
+        for _clause in self.clauses:
+            query.update(_clause.to_mongo())
+        return query
+
+    def is_indexed(self, indexed_fields: frozenset) -> bool:
+        """ Whether the conjunction can be satisfied with an index scan on one of its clauses.
+
+        :param indexed_fields: frozenset
+            the leading fields of the declared indexes
+        :return: bool
+        """
+        for _clause in self.clauses:
+            if isinstance(_clause, FieldPredicate):
+                if _clause.index_fields() & indexed_fields:
+                    return True
+            elif _clause.is_indexed(indexed_fields):
+                return True
+        return False
+
+
+class CompiledQuery:
+    """
+    The result of compiling a q string. Compiled queries are shared through the cache and
+    must not be modified.
+    """
+
+    def __init__(self, ast: Conjunction, indexed: bool):
+        """
+        :param ast: Conjunction
+            the validated syntax tree
+        :param indexed: bool
+            whether a declared index can serve the query
+        """
+        self.ast = ast
+        self.filter = ast.to_mongo()
+        self.indexed = indexed
+
+
+def declared_index_fields(model) -> frozenset:
+    """ Collects the leading field of every index declared on a document model, through
+    Indexed field types or its Settings.managed_indexes. _id is always indexed.
+
+    :param model: the document class
+    :return: the leading fields, frozenset[str]
+    """
+    fields = {"_id"}
+    for field in model.__fields__.values():
+        if getattr(field.outer_type_, "_indexed", None) is not None:
+            fields.add(field.alias)
+    for index in getattr(getattr(model, "Settings", None), "managed_indexes", None) or []:
+        if isinstance(index, IndexModel):
+            keys = list(index.document["key"].items())
+        elif isinstance(index, str):
+            keys = [(index, 1)]
+        else:
+            keys = list(index)
+        if keys:
+            key, direction = keys[0] if isinstance(keys[0], tuple) else (keys[0], 1)
+            # Text indexes only serve $text, which q does not allow.
+            if direction != "text":
+                fields.add(key)
+    return frozenset(fields)
+
+
+class QueryCompiler:
+    """
+    Compiles the q parameter of a model into a validated syntax tree and a Mongo filter.
+    Only the allow-listed operators and the visible fields of the model may be used, regular
+    expressions must be anchored, and ISO strings compared to datetime fields become
+    datetimes. Compiled queries are cached by their normalized JSON.
+    """
+
+    def __init__(self, model, hidden_fields: frozenset = frozenset(), cache_size: int = 512):
+        """
+        :param model: the document class queried
+        :param hidden_fields: frozenset
+            fields that may not be queried in addition to those excluded from serialization
+        :param cache_size: int
+            maximum number of compiled queries cached
+        """
+        self.model = model
+        self.fields = {
+            field.alias: field for name, field in model.__fields__.items()
+            if not field.field_info.exclude and not field.field_info.extra.get("hidden")
+            and name not in hidden_fields and field.alias not in hidden_fields
+        }
+        self.indexed_fields = declared_index_fields(model)
+        self.cache = LRUCache(max_size=cache_size)
+
+    def compile(self, q) -> CompiledQuery:
+        """ Compiles a q string, or returns the cached compilation of an equivalent one.
+
+        :param q: str | dict
+            the raw q parameter
+        :return: CompiledQuery
+        """
+        raw = validate_is_json(q)
+        if not isinstance(raw, dict):
+            raise _invalid("The query must be a JSON object.")
+        cache_key = json.dumps(raw, sort_keys=True, separators=(',', ':'))
+        compiled = self.cache.get(cache_key)
+        if compiled is None:
+            ast = self._parse_document(raw, self.fields, prefix="", depth=0)
+            compiled = CompiledQuery(ast=ast, indexed=ast.is_indexed(self.indexed_fields))
+            self.cache.set(cache_key, compiled)
+        return compiled
+
+    def filter_is_indexed(self, query: dict | None) -> bool:
+        """ Whether a trusted filter built by the service, such as a scope filter, constrains
+        the leading field of a declared index with a top-level condition.
+
+        :param query: dict | None
+        :return: bool
+        """
+        return bool(query) and any(_key in self.indexed_fields for _key in query)
+
+    def check_field(self, path: str):
+        """ Validates that a dotted path names a visible field of the model, such as a sort field.
+
+        :param path: str
+            the dotted Mongo path of the field
+        :return:
+        """
+        self._resolve(self.fields, path)
+
+    def _parse_document(self, raw: dict, fields, prefix: str, depth: int) -> Conjunction:
+        if depth > MAX_DEPTH:
+            raise _invalid("The query is nested too deeply.")
+        clauses = []
+        for key, value in raw.items():
+            if key in LOGICAL_OPERATORS:
+                if not isinstance(value, list) or not value or not all(isinstance(_v, dict) for _v in value):
+                    raise _invalid(f"{key} requires a non-empty list of query documents.")
+                clauses.append(LogicalClause(key, [self._parse_document(_branch, fields, prefix, depth + 1)
+                                                   for _branch in value]))
+            elif key.startswith("$"):
+                raise _invalid(f"The operator '{key}' is not allowed.")
+            else:
+                field = self._resolve(fields, key)
+                clauses.append(self._parse_predicate(prefix + key, field, value, depth))
+        return Conjunction(clauses)
+
+    def _resolve(self, fields, path: str):
+        """ Resolves a dotted path against the fields of a model, returning the model field at
+        its end or _any_field if the path descends into a value the model does not describe.
+        """
+        field = _any_field
+        for part in path.split("."):
+            if fields is _any_field:
+                return _any_field
+            if part.isdigit():
+                # An array position leaves the element type unchanged.
+                continue
+            if part not in fields:
+                raise _invalid(f"The field '{path}' cannot be queried.")
+            field = fields[part]
+            fields = self._subfields(field)
+        return field
+
+    @staticmethod
+    def _subfields(field):
+        if isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+            return {_field.alias: _field for _field in field.type_.__fields__.values()}
+        if isinstance(field.type_, type) and field.type_ is not dict:
+            return {}
+        return _any_field
+
+    def _parse_predicate(self, path: str, field, value, depth: int) -> FieldPredicate:
+        if isinstance(value, dict) and value and all(_key.startswith("$") for _key in value):
+            return FieldPredicate(path, operators=self._parse_operators(path, field, value, depth))
+        return FieldPredicate(path, value=self._literal(field, value))
+
+    def _parse_operators(self, path: str, field, raw: dict, depth: int) -> dict:
+        operators = {}
+        for operator, operand in raw.items():
+            if operator not in FIELD_OPERATORS:
+                raise _invalid(f"The operator '{operator}' is not allowed.")
+            if operator in ("$in", "$nin", "$all"):
+                if not isinstance(operand, list):
+                    raise _invalid(f"{operator} requires a list.")
+                operators[operator] = [self._literal(field, _v) for _v in operand]
+            elif operator == "$exists":
+                if not isinstance(operand, bool):
+                    raise _invalid("$exists requires a boolean.")
+                operators[operator] = operand
+            elif operator == "$size":
+                if not isinstance(operand, int) or isinstance(operand, bool) or operand < 0:
+                    raise _invalid("$size requires a non-negative integer.")
+                operators[operator] = operand
+            elif operator == "$regex":
+                if not isinstance(operand, str) or not operand.startswith("^"):
+                    raise _invalid("$regex must be a string anchored with '^'.")
+                operators[operator] = operand
+            elif operator == "$options":
+                if "$regex" not in raw or not isinstance(operand, str) or not set(operand) <= REGEX_OPTIONS:
+                    raise _invalid("$options requires a $regex and may only hold the options 'isx'.")
+                operators[operator] = operand
+            elif operator == "$not":
+                if not isinstance(operand, dict) or not operand or not all(_k.startswith("$") for _k in operand):
+                    raise _invalid("$not requires an operator expression.")
+                operators[operator] = self._parse_operators(path, field, operand, depth + 1)
+            elif operator == "$elemMatch":
+                if not isinstance(operand, dict) or not operand:
+                    raise _invalid("$elemMatch requires a query document.")
+                if all(_k.startswith("$") and _k not in LOGICAL_OPERATORS for _k in operand):
+                    operators[operator] = self._parse_operators(path, field, operand, depth + 1)
+                else:
+                    subfields = _any_field if field is _any_field else self._subfields(field)
+                    operators[operator] = self._parse_document(operand, subfields, prefix="",
+                                                               depth=depth + 1).to_mongo()
+            else:
+                operators[operator] = self._literal(field, operand)
+        return operators
+
+    @staticmethod
+    def _literal(field, value):
+        """ Validates a literal operand and converts ISO strings compared to a datetime field.
+        """
+        if isinstance(value, dict):
+            if any(_key.startswith("$") for _key in value):
+                raise _invalid("Operators are not allowed within a value.")
+            return {_key: QueryCompiler._literal(_any_field, _v) for _key, _v in value.items()}
+        if isinstance(value, list):
+            return [QueryCompiler._literal(_any_field, _v) for _v in value]
+        if isinstance(value, str) and field is not _any_field and field.type_ is datetime.datetime:
+            try:
+                return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+            except ValueError:
+                raise _invalid(f"'{value}' is not an ISO 8601 datetime.")
+        return value
+
+
+_compilers: dict[tuple, QueryCompiler] = {}
+
+
+def get_query_compiler(model, hidden_fields: frozenset = frozenset(), cache_size: int = 512) -> QueryCompiler:
+    """ Returns the compiler of a model, shared by every service instance of this process so
+    that its cache outlives a request.
+
+    :param model: the document class queried
+    :param hidden_fields: frozenset
+        fields that may not be queried
+    :param cache_size: int
+        maximum number of compiled queries cached
+    :return: QueryCompiler
+    """
+    key = (model, hidden_fields)
+    compiler = _compilers.get(key)
+    if compiler is None:
+        compiler = _compilers[key] = QueryCompiler(model, hidden_fields=hidden_fields, cache_size=cache_size)
+    return compiler
@@ -0,0 +1,79 @@
+import datetime
+import json
+import unittest
+
+from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.query.query import QueryCompiler
+from ftmcloud.domains.ftm_tasks.models.models import FtmTask
+from ftmcloud.domains.users.models.models import User
+
+
+class TestQueryCompiler(unittest.TestCase):
+    """
+    Test the validation and compilation of the q parameter
+    """
+    def setUp(self):
+        self._users = QueryCompiler(User, hidden_fields=frozenset({"password"}))
+        self._tasks = QueryCompiler(FtmTask)
+
+    def assertInvalid(self, compiler, q):
+        with self.assertRaises(FtmException) as context:
+            compiler.compile(q)
+        self.assertEqual("error.query.InvalidQuery", context.exception.error_code)
+
+    def test_rejects_disallowed_operators(self):
+        self.assertInvalid(self._users, {"$where": "sleep(1000)"})
+        self.assertInvalid(self._users, {"$expr": {"$eq": ["$email", "$firstName"]}})
+        self.assertInvalid(self._users, {"email": {"$where": "true"}})
+        self.assertInvalid(self._users, {"$or": [{"$where": "true"}]})
+        self.assertInvalid(self._users, {"email": {"$not": {"$where": "true"}}})
+
+    def test_rejects_unanchored_regex(self):
+        self.assertInvalid(self._users, {"email": {"$regex": ".*@email.com"}})
+        self.assertInvalid(self._users, {"email": {"$regex": "^user", "$options": "e"}})
+        self.assertInvalid(self._users, {"email": {"$regex": "^user", "$options": "m"}})
+        self.assertEqual({"email": {"$regex": "^user", "$options": "i"}},
+                         self._users.compile({"email": {"$regex": "^user", "$options": "i"}}).filter)
+
+    def test_rejects_hidden_fields(self):
+        self.assertInvalid(self._users, {"password": "$2b$12$hash"})
+        self.assertInvalid(self._users, {"password": {"$regex": "^\\$2b"}})
+        self.assertInvalid(self._users, {"$or": [{"email": "user@email.com"}, {"password": {"$exists": True}}]})
+        self.assertInvalid(self._users, {"isDeleted": True})
+
+    def test_rejects_unknown_fields(self):
+        self.assertInvalid(self._users, {"unknown": 1})
+        self.assertInvalid(self._tasks, {"taskStatus": "completed"})
+        self.assertInvalid(self._tasks, {"dataExample.unknown": 1})
+
+    def test_rejects_operators_within_values(self):
+        self.assertInvalid(self._users, {"email": {"address": {"$ne": None}}})
+        self.assertInvalid(self._users, {"email": {"$in": [{"$where": "true"}]}})
+
+    def test_converts_iso_strings_of_datetime_fields(self):
+        compiled = self._tasks.compile({"lockDatetime": {"$lt": "2023-10-18T12:00:00Z"},
+                                        "completedDatetime": {"$in": [None, "2023-10-18T12:00:00"]},
+                                        "taskDescription": "2023-10-18T12:00:00Z"})
+        self.assertEqual({
+            "lockDatetime": {"$lt": datetime.datetime(2023, 10, 18, 12, tzinfo=datetime.timezone.utc)},
+            "completedDatetime": {"$in": [None, datetime.datetime(2023, 10, 18, 12)]},
+            "taskDescription": "2023-10-18T12:00:00Z",
+        }, compiled.filter)
+        self.assertInvalid(self._tasks, {"lockDatetime": "yesterday"})
+
+    def test_caches_equivalent_queries(self):
+        compiled = self._users.compile('{"email": "user@email.com", "firstName": {"$in": ["a", "b"]}}')
+        self.assertIs(compiled, self._users.compile({"firstName": {"$in": ["a", "b"]}, "email": "user@email.com"}))
+        self.assertIs(compiled, self._users.compile(json.dumps({"firstName": {"$in": ["a", "b"]},
+                                                                "email": "user@email.com"}, indent=2)))
+        self.assertIsNot(compiled, self._users.compile({"email": "user@email.com", "firstName": {"$in": ["b", "a"]}}))
+
+    def test_reports_index_use(self):
+        self.assertTrue(self._users.compile({"email": "user@email.com"}).indexed)
+        self.assertFalse(self._users.compile({"firstName": "First"}).indexed)
+        self.assertFalse(self._users.compile({"email": {"$ne": "user@email.com"}}).indexed)
+        self.assertFalse(self._users.compile({"$or": [{"email": "user@email.com"}, {"firstName": "First"}]}).indexed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 from ftmcloud.core.exception.exception import FtmException
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.cache.reference import get_reference_cache
+from ftmcloud.cross_cutting.models.document import BaseDocument, LIVE_FILTER
 
 
 class Repository:
@@ -16,6 +17,7 @@ class Repository:
         :param model_cls: the model_cls to reference
         """
         self._model_cls = model_cls
+        self._reference_cache = get_reference_cache(model_cls)
 
     async def find(self, query, first, internal=False):
         """ Finds the specified document in the class.
@@ -27,8 +29,15 @@ class Repository:
         :return:
         """
         try:
+            cache = self._reference_cache
+            if cache is not None and first and not internal and len(query) == 1:
+                # Lookups of a reference document by pid or name are served by its cache.
+                if isinstance(query.get("pid"), str):
+                    return await cache.get(query["pid"])
+                if isinstance(query.get("name"), str):
+                    return await cache.get_by_name(query["name"])
             if not internal:
-                query['isDeleted'] = {'$ne': 'true'}
+                query.update(LIVE_FILTER)
             return await self._model_cls.find(query, first=first)
         except Exception as E:
             raise FtmException from E
@@ -52,9 +61,11 @@ class Repository:
         :return:
         """
         try:
-            return await self._model_cls.delete(query)
+            result = await self._model_cls.delete(query)
         except Exception as E:
             raise FtmException from E
+        self._invalidate()
+        return result
 
     async def update(self, query, update):
         """ Performs an update query.
@@ -64,9 +75,11 @@ class Repository:
         :return:
         """
         try:
-            return await self._model_cls.update(query, update)
+            result = await self._model_cls.update(query, update)
         except Exception as E:
             raise FtmException from E
+        self._invalidate()
+        return result
 
     async def insert(self, new_document):
         """ Inserts a new document.
@@ -75,6 +88,17 @@ class Repository:
         :return: None
         """
         try:
-            return await self._model_cls.insert(new_document)
+            result = await self._model_cls.insert(new_document)
         except Exception as E:
             raise FtmException from E
+        self._invalidate(getattr(new_document, "pid", None))
+        return result
+
+    def _invalidate(self, pid: str | None = None):
+        """ Forgets the documents a write may have modified from the reference cache, if any.
+
+        :param pid: pid of the modified document, None if unknown
+        :return: None
+        """
+        if self._reference_cache is not None:
+            self._reference_cache.invalidate(pid)
@@ -0,0 +1,81 @@
+import base64
+import binascii
+
+from bson import json_util
+from bson.errors import InvalidBSON
+
+from ftmcloud.core.exception.exception import FtmException
+
+
+def encode_cursor(sort_field: str, sort_direction: int, value, document_id) -> str:
+    """ Encodes the position after a document as an opaque cursor.
+
+    :param sort_field: str
+        the field the page is sorted by
+    :param sort_direction: int
+        1 for ascending, -1 for descending
+    :param value:
+        the value of the sort field in the last document of the page
+    :param document_id: ObjectId
+        the _id of the last document of the page
+
+    :return: cursor: str
+    """
+    raw = json_util.dumps({"f": sort_field, "d": sort_direction, "v": value, "i": document_id})
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, sort_field: str, sort_direction: int) -> dict:
+    """ Decodes a cursor and asserts it was issued for the same sort.
+
+    :param cursor: str
+        the cursor returned by a previous page
+    :param sort_field: str
+        the field the page is sorted by
+    :param sort_direction: int
+        1 for ascending, -1 for descending
+
+    :return: position: dict
+        the sort value "v" and _id "i" of the last document of the previous page
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        position = json_util.loads(raw.decode('utf-8'))
+    except (binascii.Error, UnicodeDecodeError, ValueError, InvalidBSON) as E:
+        raise FtmException('error.query.InvalidCursor', developer_message=E.__str__())
+    if not isinstance(position, dict) or position.keys() != {"f", "d", "v", "i"}:
+        raise FtmException('error.query.InvalidCursor')
+    if position["f"] != sort_field or position["d"] != sort_direction:
+        raise FtmException('error.query.InvalidCursor')
+    return position
+
+
+def keyset_filter(sort_field: str, sort_direction: int, value, document_id) -> dict:
+    """ Builds the filter matching the documents after a position in (sort_field, _id) order.
+
+    Mongo orders null and missing values before any other value, so they need their own
+    branch: they follow every value in descending order and precede them in ascending order.
+
+    :param sort_field: str
+        the field the page is sorted by
+    :param sort_direction: int
+        1 for ascending, -1 for descending
+    :param value:
+        the sort value of the last document of the previous page
+    :param document_id: ObjectId
+        the _id of the last document of the previous page
+
+    :return: filter: dict
+    """
+    after = "$gt" if sort_direction == 1 else "$lt"
+    if sort_field == "_id":
+        return {"_id": {after: document_id}}
+    branches = [{sort_field: value, "_id": {after: document_id}}]
+    if value is None:
+        if sort_direction == 1:
+            branches.append({sort_field: {"$ne": None}})
+    else:
+        branches.append({sort_field: {after: value}})
+        if sort_direction == -1:
+            branches.append({sort_field: None})
+    return {"$or": branches}
@@ -0,0 +1,86 @@
+from jsonpointer import JsonPointer
+
+_missing = object()
+
+
+def _document_path(parts: list[str], old: dict, new: dict) -> list[str]:
+    """ Maps the tokens of a JSON pointer to the deepest Mongo field path that can be updated
+    on its own. Descends only through objects present in both versions of the document, so an
+    operation inside an array or a replaced object updates that array or object as a whole.
+
+    :param parts: list[str]
+        the tokens of the JSON pointer
+    :param old: dict
+        the document before the patch
+    :param new: dict
+        the validated document after the patch
+    :return: path: list[str]
+    """
+    path = []
+    old_node, new_node = old, new
+    for token in parts:
+        if not token or '.' in token or token.startswith('$'):
+            break
+        path.append(token)
+        old_node = old_node.get(token, _missing)
+        new_node = new_node.get(token, _missing)
+        if not isinstance(old_node, dict) or not isinstance(new_node, dict):
+            break
+    return path
+
+
+def _resolve(document: dict, path: list[str]):
+    node = document
+    for token in path:
+        if not isinstance(node, dict) or token not in node:
+            return _missing
+        node = node[token]
+    return node
+
+
+def build_minimal_update(operations: list[dict], old: dict, new: dict) -> dict:
+    """ Builds the smallest update turning the old document into the new one, restricted to
+    the fields touched by the JSON patch operations. Values are taken from the validated new
+    document, overlapping paths collapse into their common ancestor, and elements appended to
+    the end of an array become a $push.
+
+    :param operations: list[dict]
+        the JSON patch operations
+    :param old: dict
+        the document before the patch
+    :param new: dict
+        the validated document after the patch
+    :return: update: dict
+        the update document, empty if the patch changes nothing
+    """
+    paths = []
+    for operation in operations:
+        if operation['op'] == 'test':
+            continue
+        pointers = [operation['path']]
+        if operation['op'] == 'move':
+            pointers.append(operation['from'])
+        for pointer in pointers:
+            path = _document_path(JsonPointer(pointer).parts, old, new)
+            if path:
+                paths.append(path)
+
+    kept = []
+    for path in sorted(paths, key=len):
+        if not any(path[:len(_kept)] == _kept for _kept in kept):
+            kept.append(path)
+
+    update = {}
+    for path in kept:
+        field = '.'.join(path)
+        old_value = _resolve(old, path)
+        new_value = _resolve(new, path)
+        if new_value is _missing:
+            if old_value is not _missing:
+                update.setdefault("$unset", {})[field] = ""
+        elif isinstance(old_value, list) and isinstance(new_value, list) \
+                and len(new_value) > len(old_value) and new_value[:len(old_value)] == old_value:
+            update.setdefault("$push", {})[field] = {"$each": new_value[len(old_value):]}
+        elif old_value is _missing or old_value != new_value:
+            update.setdefault("$set", {})[field] = new_value
+    return update
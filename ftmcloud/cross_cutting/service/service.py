@@ -1,19 +1,66 @@
+import asyncio
 import datetime
+import enum
 import json
 import logging
 from json import JSONDecodeError
-from copy import deepcopy
+from typing import Optional
 
-from jsonpatch import JsonPatch, JsonPatchException
+from beanie.odm.utils.parsing import parse_obj
+from beanie.odm.utils.projection import get_projection
+from bson import json_util
+from beanie.odm.utils.encoder import Encoder
+from beanie.odm.utils.dump import get_dict
+from jsonpatch import JsonPatch, JsonPatchException, JsonPatchTestFailed
+from jsonpointer import JsonPointerException
 
 import uuid
 
+from pymongo import InsertOne, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from pydantic import Field, create_model
 from pydantic.error_wrappers import ValidationError
 
-from ftmcloud.core.config.config import Settings
+from ftmcloud.core.config.config import get_settings
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.cache.cache import LRUCache
+from ftmcloud.cross_cutting.cache.reference import get_reference_cache
+from ftmcloud.cross_cutting.loader.loader import get_loader
+from ftmcloud.cross_cutting.query.query import get_query_compiler
+from ftmcloud.cross_cutting.models.bulk import BulkOperation, BulkOperationResult
+from ftmcloud.cross_cutting.models.document import live
+from ftmcloud.cross_cutting.service.cursor import decode_cursor, encode_cursor, keyset_filter
+from ftmcloud.cross_cutting.service.patch import build_minimal_update
 from ftmcloud.domains.users.models.models import User
 
+_settings = get_settings()
+
+# Estimated totals, keyed by collection and normalized query.
+count_cache = LRUCache(max_size=_settings.COUNT_CACHE_SIZE, ttl=_settings.COUNT_CACHE_TTL)
+
+# Projection models generated from fields parameters, keyed by collection and field set.
+projection_model_cache = LRUCache(max_size=_settings.PROJECTION_MODEL_CACHE_SIZE)
+
+
+class ConditionedUpdate(UpdateOne):
+    """
+    An update of a document applied only if it is still at the revision it was read at. The
+    update increments the revision, so the document holds the next revision once written.
+    """
+    __slots__ = ("document_id", "written_revision")
+
+    def __init__(self, filter: dict, update: dict):
+        """
+        :param filter: The _id and revision of the document.
+        :param update: The update of the document, incrementing its revision.
+        """
+        super().__init__(filter, update)
+        self.document_id = filter["_id"]
+        # Documents written before revisions were introduced are matched as revision 0.
+        revision = filter["revision"]
+        self.written_revision = (revision if isinstance(revision, int) else 0) + 1
+
 
 class AbstractService:
 
@@ -24,7 +71,7 @@ class AbstractService:
         AbstractService provides general purpose utilities to be used across different
         types of domains.
         """
-        self.settings = Settings()
+        self.settings = get_settings()
         self._logger = logging.getLogger(self.__class__.__name__)
 
     @staticmethod
@@ -38,8 +85,37 @@ class AbstractService:
             raise FtmException("error.general.InvalidJson", developer_message=E.__str__())
 
 
+    @staticmethod
+    def parse_fields(fields):
+        """
+        Parses a comma separated list of field names. Names prefixed with '-' are excluded
+        rather than included, and both modes cannot be mixed.
+
+        :param fields: The comma separated field names.
+        :return: The set of field names and whether they are to be included.
+        """
+        names = [_name.strip() for _name in fields.split(',') if _name.strip()]
+        if not names:
+            raise FtmException("error.query.InvalidQuery")
+        excluded = [_name.startswith('-') for _name in names]
+        if any(excluded) and not all(excluded):
+            raise FtmException("error.query.InvalidQuery")
+        return frozenset(_name.lstrip('-') for _name in names), not any(excluded)
+
+
 class Service(AbstractService):
 
+    # Fields that may never be projected into a response, in addition to those excluded
+    # from serialization on the model.
+    hidden_fields = frozenset()
+
+    # Fields whose values must be unique, mapped to the error raised when a bulk request
+    # creates several documents with the same value.
+    bulk_unique_fields = {}
+
+    # Fields a patch may not modify.
+    _protected_fields = frozenset({"_id", "id", "pid", "isDeleted", "revision", "revision_id"})
+
     def __init__(self, collection, base_model=None):
         """Initialize a service which provides create-read-update-delete functionality
         against a mongo collection.
@@ -51,13 +127,38 @@ class Service(AbstractService):
         self.collection = collection
         self.base_model = base_model
 
+    @property
+    def loader(self):
+        """The document loader of the current request, batching and memoizing lookups by pid.
+        """
+        return get_loader()
+
+    @property
+    def reference_cache(self):
+        """The cache of the collection if it is a reference model, None otherwise.
+        """
+        return get_reference_cache(self.collection)
+
+    def invalidate_reference(self, pid: str | None = None):
+        """Forgets a modified document from the reference cache of the collection, if any.
+
+        :param pid: pid of the modified document, None if unknown
+        :return: None
+        """
+        cache = self.reference_cache
+        if cache is not None:
+            cache.invalidate(pid)
+
     async def find_one(self, q):
         """Finds one by the specified query.
 
         :param q:
         :return:
         """
-        exists = await self.collection.find_one({"isDeleted": {"$ne": "true"}, **q})
+        cache = self.reference_cache
+        if cache is not None and q.keys() == {"name"} and isinstance(q["name"], str):
+            return await cache.get_by_name(q["name"])
+        exists = await self.collection.find_one(live(q))
         return exists
 
     async def add_validator(self, new_document):
@@ -80,7 +181,9 @@ class Service(AbstractService):
         new_pid = str(uuid.uuid4())
         new_document.pid = new_pid
         new_document.createdAt = datetime.datetime.now()
+        new_document.revision = 0
         document = await new_document.create()
+        self.invalidate_reference(new_pid)
         return document
 
     async def insert_documents(self, documents):
@@ -96,23 +199,43 @@ class Service(AbstractService):
             new_pid = str(uuid.uuid4())
             _document.pid = new_pid
             _document.createdAt = datetime.datetime.now()
+            _document.revision = 0
             insert_docs.append(_document)
         await self.collection.insert_many(insert_docs)
+        self.invalidate_reference()
+
+    @property
+    def query_compiler(self):
+        """The compiler of the q parameter for the collection of this service.
+        """
+        return get_query_compiler(self.collection, hidden_fields=self.hidden_fields,
+                                  cache_size=self.settings.QUERY_CACHE_SIZE)
+
+    def compile_q(self, q, additional_filters=None):
+        """
+        Compiles the q against the allow-listed operators and fields of the collection. A query
+        no declared index can serve, even with the additional filters, is rejected when
+        QUERY_REJECT_UNINDEXED is set and logged otherwise.
+
+        :param q: Represents a stringify-d JSON to be processed as a query param.
+        :param additional_filters: A dict query applied after the q.
+        :return: The compiled query.
+        """
+        compiled = self.query_compiler.compile(q)
+        if not compiled.indexed and not self.query_compiler.filter_is_indexed(additional_filters):
+            if self.settings.QUERY_REJECT_UNINDEXED:
+                raise FtmException("error.query.UnindexedQuery")
+            self._logger.warning(f"Unindexed query on {self.collection.__name__}: {json_util.dumps(compiled.filter)}")
+        return compiled
 
     def process_q(self, q, additional_filters):
         """
-        Parse the q, combine additional filters and add the default
+        Compile the q, combine additional filters and add the default
         delete filter.
         """
-        deleted_filter = {"isDeleted": {"$ne": "true"}}
+        deleted_filter = live()
         if q is not None:
-            # TODO: Should sanitize the query for invalid query values to prevent abuse.
-            # self._sanitize_query(q)
-
-            # TODO: Should create a datetime query if one is found.
-            # q = self._create_datetime_query(json.dumps(q))
-
-            q_list = [self.validate_is_json(q)]
+            q_list = [self.compile_q(q, additional_filters=additional_filters).filter]
         else:
             q_list = []
 
@@ -128,76 +251,271 @@ class Service(AbstractService):
 
         return q
 
-    def get_projection_model_from_fields(self, fields):
-        """
-        Acts as a factory method to generate a projection model instance with a subset
-        of collection fields.
+    def get_projection_model_from_fields(self, fields=None):
         """
-        projection_model = deepcopy(self.collection)
-        field_values = fields.values()
+        Acts as a factory method to generate a projection model with a subset of collection
+        fields. Projection models are cached per collection and field set, and the id is always
+        projected. Fields excluded from serialization or hidden by the service cannot be requested.
 
-        if all(x == "1" for x in field_values):
-            is_inclusion = True
-        elif all(x == "0" for x in field_values):
-            is_inclusion = False
+        :param fields: Comma separated names of the fields to include, or to exclude if each
+            name is prefixed with '-'.
+        :return: The projection model, or None if no fields were specified.
+        """
+        if fields is None:
+            return None
+        names, is_inclusion = self.parse_fields(fields)
+        return self._projection_model(names, is_inclusion)
+
+    def _projection_model(self, names: frozenset, is_inclusion: bool):
+        """Builds, or gets from the cache, the projection model of the visible fields selected by
+        the names.
+
+        :param names: The names of the fields to include or exclude.
+        :param is_inclusion: Whether the names are included rather than excluded.
+        :return: The projection model.
+        """
+        cache_key = (self.collection.__name__, names, is_inclusion)
+        projection_model = projection_model_cache.get(cache_key)
+        if projection_model is not None:
+            return projection_model
+
+        visible_fields = {
+            name: field for name, field in self.collection.__fields__.items()
+            if not field.field_info.exclude and not field.field_info.extra.get("hidden")
+            and name not in self.hidden_fields
+        }
+        if not names.issubset(visible_fields.keys()):
+            raise FtmException("error.query.InvalidQuery")
+        if is_inclusion:
+            selected = [name for name in visible_fields if name in names or name == "id"]
         else:
-            raise FtmException("error.user.InvalidQuery")
+            selected = [name for name in visible_fields if name not in names or name == "id"]
+
+        projection_model = create_model(
+            f"{self.collection.__name__}Projection",
+            __config__=self.collection.__config__,
+            **{
+                name: (Optional[visible_fields[name].outer_type_], Field(None, alias=visible_fields[name].alias))
+                for name in selected
+            }
+        )
+        projection_model_cache.set(cache_key, projection_model)
+        return projection_model
 
-        field_name_map = {}
-        for field in self.collection.__fields__.keys():
-            field_name_map[field] = True
+    def resolve_limit(self, limit=None, q=None, additional_filters=None):
+        """Resolves the page size requested against the configured limits. Pages of a query no
+        index can serve are capped to UNINDEXED_QUERY_LIMIT.
 
-        new_fields = {} if is_inclusion else self.collection.__fields__
+        :param limit: The max number of documents requested.
+        :param q: Represents a stringify-d JSON to be processed as a query param.
+        :param additional_filters: A dict query applied after the q.
+        :return: The number of documents a page will hold.
+        """
+        config = self.settings
+        if limit is None or limit > config.MAX_QUERY_LIMIT:
+            limit = config.DEFAULT_QUERY_LIMIT
+        if q is not None and not self.query_compiler.compile(q).indexed \
+                and not self.query_compiler.filter_is_indexed(additional_filters):
+            limit = min(limit, config.UNINDEXED_QUERY_LIMIT)
+        return limit
 
-        for key in fields.keys():
-            if is_inclusion and key in field_name_map:
-                new_fields[key] = self.collection.__fields__[key]
-            elif not is_inclusion and key in field_name_map:
-                new_fields.pop(key)
-            else:
-                raise FtmException("error.query.InvalidQuery")
+    @staticmethod
+    def parse_sort(sort=None):
+        """Parses the sort criteria using '^' for ascending and '-' for descending.
 
-        projection_model.__fields__ = new_fields
-        projection_model.init_fields()
+        :param sort: The field to sort by, prefixed with its direction.
+        :return: The sort field and direction, or None if no sort was specified.
+        """
+        if sort is None:
+            return None
+        sort_direction = sort[0]
+        if sort_direction != '^' and sort_direction != '-':
+            raise FtmException('error.query.InvalidSort')
+        return sort[1:], 1 if sort_direction == '^' else -1
+
+    def _keyset_sort(self, sort=None):
+        """Parses the sort criteria, defaulting to _id. The sort field must be a visible field of
+        the collection: its value is copied into cursors and compared with those of cursors.
+
+        :param sort: The field to sort by, prefixed with its direction.
+        :return: The sort field and direction.
+        """
+        sort_field, sort_direction = self.parse_sort(sort) or ("_id", 1)
+        if sort_field == "id":
+            sort_field = "_id"
+        if sort_field != "_id":
+            self.query_compiler.check_field(sort_field)
+        return sort_field, sort_direction
+
+    def sort_criteria(self, sort=None) -> list:
+        """Parses the sort criteria of a page retrieved by offset. The sort field must be a visible
+        field of the collection, and ties are broken by _id so that pages do not overlap.
+
+        :param sort: The field to sort by, prefixed with its direction.
+        :return: The list of the sort fields and directions.
+        """
+        sort_field, sort_direction = self._keyset_sort(sort)
+        if sort_field == "_id":
+            return [(sort_field, sort_direction)]
+        return [(sort_field, sort_direction), ("_id", sort_direction)]
 
-        return projection_model
+    def _page_query(self, q=None, offset=None, sort=None, limit=None, additional_filters=None, cursor=None,
+                    projection_model=None):
+        """Builds the filter, sort, skip and limit of a page.
+
+        :return: The filter of the whole result set, the filter of the page, the sort criteria,
+            the number of documents to skip and the page size.
+        """
+        query = self.process_q(q=q, additional_filters=additional_filters)
+        limit = self.resolve_limit(limit, q=q, additional_filters=additional_filters)
+
+        if cursor is not None:
+            sort_field, sort_direction = self._keyset_sort(sort)
+            if projection_model is not None and sort_field != "_id" \
+                    and sort_field.split('.')[0] not in projection_model.__fields__:
+                # The next cursor is read from the sort field of the last document.
+                raise FtmException("error.query.InvalidQuery")
+            sort_criteria = [(sort_field, sort_direction)]
+            if sort_field != "_id":
+                sort_criteria.append(("_id", sort_direction))
+            page_query = query
+            if cursor:
+                position = decode_cursor(cursor, sort_field=sort_field, sort_direction=sort_direction)
+                page_query = {"$and": [query, keyset_filter(sort_field, sort_direction, position["v"], position["i"])]}
+            return query, page_query, sort_criteria, None, limit
+
+        return query, query, self.sort_criteria(sort), offset, limit
 
     async def get_all(self, q=None, offset=None, sort=None, limit=None,
-                      additional_filters=None):
+                      additional_filters=None, cursor=None, projection_model=None):
         """Retrieves all documents in the collection.
 
+        Passing a cursor switches to keyset pagination: the documents are ordered by the sort
+        field with _id as a tiebreaker, and the page starts after the position encoded in the
+        cursor instead of skipping offset documents. An empty cursor requests the first page.
+
         :param additional_filters: A dict query applied after the q.
         :param q: Represents a stringify-d JSON to be processed as a query param.
         :param offset: Represents the offset from the initial document in the collection.
         :param sort: The field to sort by.
         :param limit: The max number of documents returned from the request.
-        :param fields: The fields to include in the request
+        :param cursor: The cursor returned with the previous page, if paginating by keyset.
+        :param projection_model: The projection model to retrieve the documents as, if any.
         :return: The list of documents.
         """
+        _, query, sort_criteria, offset, limit = self._page_query(q=q, offset=offset, sort=sort, limit=limit,
+                                                                  additional_filters=additional_filters,
+                                                                  cursor=cursor, projection_model=projection_model)
 
-        query = self.process_q(q=q, additional_filters=additional_filters)
-
-        config = self.settings
-        if limit is None:
-            limit = config.DEFAULT_QUERY_LIMIT
-        elif limit > config.MAX_QUERY_LIMIT:
-            limit = config.DEFAULT_QUERY_LIMIT
-        sort_criteria = []
-        if sort is not None:
-            sort_direction = sort[0]
-            if sort_direction != '^' and sort_direction != '-':
-                raise FtmException('error.query.InvalidSort')
-            sort_field = sort[1:]
-            if sort_direction == '^':
-                sort_direction = 1
-            elif sort_direction == '-':
-                sort_direction = -1
-            sort_criteria.append((sort_field, sort_direction))
-
-        documents = await self.collection.find(query, limit=limit, skip=offset, sort=sort_criteria).to_list()
+        documents = await self.collection.find(query, limit=limit, skip=offset, sort=sort_criteria,
+                                               projection_model=projection_model).to_list()
 
         return documents
 
+    async def get_page(self, q=None, offset=None, sort=None, limit=None, additional_filters=None, cursor=None,
+                       include_totals=False, estimate_totals=False, projection_model=None):
+        """Retrieves a page of documents along with the total of documents matching the query.
+
+        The exact total is counted concurrently with the page, which is read with a find so that
+        its sort can use an index and be merged with its limit. The estimated total is cached
+        for COUNT_CACHE_TTL seconds per collection and query, which already includes any scope
+        filter.
+
+        :param additional_filters: A dict query applied after the q.
+        :param q: Represents a stringify-d JSON to be processed as a query param.
+        :param offset: Represents the offset from the initial document in the collection.
+        :param sort: The field to sort by.
+        :param limit: The max number of documents returned from the request.
+        :param cursor: The cursor returned with the previous page, if paginating by keyset.
+        :param include_totals: Whether to count the documents matching the query.
+        :param estimate_totals: Whether a cached, possibly stale, total is acceptable.
+        :param projection_model: The projection model to retrieve the documents as, if any.
+        :return: The list of documents and the total, None if totals were not requested.
+        """
+        query, page_query, sort_criteria, offset, limit = self._page_query(
+            q=q, offset=offset, sort=sort, limit=limit, additional_filters=additional_filters, cursor=cursor,
+            projection_model=projection_model
+        )
+        find = self.collection.find(page_query, limit=limit, skip=offset, sort=sort_criteria,
+                                    projection_model=projection_model)
+
+        if not include_totals:
+            return await find.to_list(), None
+
+        if estimate_totals:
+            cache_key = (self.collection.__name__, json_util.dumps(query, sort_keys=True))
+            total = count_cache.get(cache_key)
+            if total is None:
+                documents, total = await asyncio.gather(find.to_list(), self.collection.find(query).count())
+                count_cache.set(cache_key, total)
+                return documents, total
+            return await find.to_list(), total
+
+        documents, total = await asyncio.gather(find.to_list(), self.collection.find(query).count())
+        return documents, total
+
+    def export(self, q=None, sort=None, additional_filters=None, projection_model=None):
+        """Exports every document matching the query as newline delimited JSON.
+
+        The query is validated before this returns, so errors are raised before a response
+        starts. Documents are then read from the Motor cursor EXPORT_BATCH_SIZE at a time and
+        each batch is encoded and emitted before the next is fetched, so memory stays constant
+        regardless of the size of the export. Without a projection model, documents are exported
+        with every visible field, so that the fields hidden by the service and those excluded
+        from serialization, which a list response leaves out, are not even read.
+
+        :param q: Represents a stringify-d JSON to be processed as a query param.
+        :param sort: The field to sort by.
+        :param additional_filters: A dict query applied after the q.
+        :param projection_model: The projection model to export the documents as, if any.
+        :return: An async iterator over chunks of NDJSON.
+        """
+        query = self.process_q(q=q, additional_filters=additional_filters)
+        sort_criteria = self.sort_criteria(sort)
+        model = projection_model or self._projection_model(frozenset(), is_inclusion=False)
+        batch_size = self.settings.EXPORT_BATCH_SIZE
+        cursor = self.collection.get_motor_collection().find(
+            query,
+            projection=get_projection(model),
+            sort=sort_criteria,
+            batch_size=batch_size
+        )
+
+        async def stream():
+            lines = []
+            async for raw in cursor:
+                lines.append(parse_obj(model, raw).json(by_alias=True))
+                if len(lines) == batch_size:
+                    yield '\n'.join(lines) + '\n'
+                    lines = []
+            if lines:
+                yield '\n'.join(lines) + '\n'
+
+        return stream()
+
+    def next_cursor(self, documents, sort=None, limit=None, q=None, additional_filters=None):
+        """Encodes the cursor of the page following a page retrieved by keyset.
+
+        :param documents: The documents of the page.
+        :param sort: The sort the page was retrieved with.
+        :param limit: The limit the page was retrieved with.
+        :param q: The q the page was retrieved with.
+        :param additional_filters: The additional filters the page was retrieved with.
+        :return: The cursor of the next page, or None if this page was the last one.
+        """
+        if not documents or len(documents) < self.resolve_limit(limit, q=q, additional_filters=additional_filters):
+            return None
+        sort_field, sort_direction = self._keyset_sort(sort)
+        last = documents[-1]
+        value = last.id
+        if sort_field != "_id":
+            value = last
+            for part in sort_field.split('.'):
+                value = value.get(part) if isinstance(value, dict) else getattr(value, part, None)
+            if isinstance(value, enum.Enum):
+                value = value.value
+        return encode_cursor(sort_field, sort_direction, value, last.id)
+
     async def total(self, q=None, additional_filters=None):
         """Retrieves the total of documents that fit the specified criteria.
 
@@ -205,29 +523,29 @@ class Service(AbstractService):
         :param additional_filters: Represents the additional filters to apply, if any.
         :return: The total count of documents matching the specified criteria.
         """
-        query = {}
-        try:
-            if q is not None:
-                query = json.loads(q)
-            if additional_filters is not None:
-                query = {**query, **additional_filters}
-        except ValueError as E:
-            raise FtmException('error.general.InvalidJson', developer_message=E.__str__())
-        return await self.collection.find(query, {"isDeleted": {"$ne": "true"}}).count()
+        query = self.process_q(q=q, additional_filters=additional_filters)
+        return await self.collection.find(query).count()
 
-    async def validate_exists(self, pid: str, additional_filters=None):
+    async def validate_exists(self, pid: str, additional_filters=None, projection_model=None):
         """Validate the document exists.
 
         :param additional_filters:
         :param pid:
+        :param projection_model: The projection model to retrieve the document as, if any.
         :return:
         """
-        query = {"isDeleted": {"$ne": "true"}}
+        cache = self.reference_cache
+        if cache is not None and pid is not None and additional_filters is None and projection_model is None:
+            exists = await cache.get(pid)
+            if exists is None:
+                raise FtmException(f"error.{self.collection.__name__.lower()}.NotFound")
+            return exists
+        query = live()
         if pid is not None:
             query["pid"] = pid
         if additional_filters is not None:
             query = {**query, **additional_filters}
-        exists = await self.collection.find_one(query)
+        exists = await self.collection.find_one(query, projection_model=projection_model)
         if exists is None:
             raise FtmException(f"error.{self.collection.__name__.lower()}.NotFound")
         return exists
@@ -238,10 +556,33 @@ class Service(AbstractService):
         :param pid_list: the list of pids
         :return:
         """
-        pid_list_len = len(pid_list)
-        if pid_list_len:
-            for i in range(0, pid_list_len):
-                await self.validate_exists(pid=pid_list[i])
+        await self.validate_many_exist(pids=pid_list)
+
+    async def validate_many_exist(self, pids, additional_filters=None):
+        """Validates all the specified pids exist with a single $in query.
+
+        :param pids: list[str]
+            the pids to validate
+        :param additional_filters: dict
+            additional filters the documents must match
+        :return: None
+        """
+        requested = list(dict.fromkeys(pids))
+        if not requested:
+            return
+        cache = self.reference_cache
+        if cache is not None and additional_filters is None:
+            found = {_pid for _pid, _document in (await cache.get_many(requested)).items() if _document is not None}
+        else:
+            query = live({"pid": {"$in": requested}})
+            if additional_filters is not None:
+                query = {**query, **additional_filters}
+            found = set(await self.collection.get_motor_collection().distinct("pid", query))
+        missing = [_pid for _pid in requested if _pid not in found]
+        if missing:
+            raise FtmException(f"error.{self.collection.__name__.lower()}.NotFound",
+                               developer_message=f"No {self.collection.__name__} exists for the pids: "
+                                                 f"{', '.join(map(str, missing))}")
 
     async def patch_document_validator(self, document, patch_document_list, current_user: User | None = None):
         """ This function allows a passthru to validate patch documents in the list before
@@ -258,43 +599,111 @@ class Service(AbstractService):
         """
         pass
 
+    def _parse_patch(self, patch_document_list: list):
+        """Constructs the JSON patch from the patch documents and asserts it does not touch
+        a protected field.
+
+        :param patch_document_list: list[PatchDocument]
+        :return: The JSON patch and the list of its operations.
+        """
+        try:
+            patch = JsonPatch(list(map(lambda x: x.dict(), patch_document_list)))
+        except JsonPatchException:
+            raise FtmException('error.patch.InvalidPatch')
+        patch_list = list(patch)
+        for i in range(0, len(patch_list)):
+            if patch_list[i]['op'] == 'test' and patch_list[i]['path'] == '/revision':
+                continue
+            for pointer in (patch_list[i]['path'], patch_list[i].get('from')):
+                if pointer is not None and (pointer == '' or pointer.split('/')[1] in self._protected_fields):
+                    raise FtmException('error.patch.InvalidPatch')
+        return patch, patch_list
+
+    async def _prepare_patch(self, document, patch, patch_list: list, current_user: User | None = None,
+                             additional_filters: dict = None):
+        """Validates and applies the patch to the document, and builds the update writing it.
+
+        :param document: The document as last read.
+        :param patch: JsonPatch
+        :param patch_list: list[dict]
+        :param current_user: User | None
+        :param additional_filters: Fields the patched document must still match, if any.
+        :return: The filter and update of the write, or None if the patch changes nothing.
+        """
+        await self.patch_document_validator(document, patch_list, current_user)
+        current_doc = document.dict()
+        try:
+            diff_doc = patch.apply(current_doc)
+        except JsonPatchTestFailed:
+            raise FtmException('error.patch.Conflict')
+        except (JsonPatchException, JsonPointerException):
+            raise FtmException('error.patch.InvalidPatch')
+        try:
+            new_doc = self.collection(**diff_doc)
+        except ValidationError:
+            raise FtmException('error.patch.InvalidPatch')
+        if additional_filters and not self._in_scope(new_doc, additional_filters):
+            raise FtmException('error.bulk.OutOfScope')
+        update_query = build_minimal_update(patch_list, current_doc, new_doc.dict())
+        if not update_query:
+            return None
+        encoder = Encoder(custom_encoders=self.collection.get_settings().bson_encoders, to_db=True)
+        update_query = encoder.encode(update_query)
+        update_query["$inc"] = {"revision": 1}
+        return {"_id": document.id, "revision": self._revision_filter(document)}, update_query
+
+    @staticmethod
+    def _revision_filter(document):
+        # Documents written before revisions were introduced have no revision field.
+        return document.revision if document.revision else {"$in": [None, 0]}
+
+    @staticmethod
+    def _in_scope(document, additional_filters: dict) -> bool:
+        return all(getattr(document, _field, None) == _value for _field, _value in additional_filters.items())
+
     async def patch(self, pid: str, patch_document_list: list, current_user: User | None = None):
         """Patch the resource within the space by pid. Attempts to
         construct a patch document from the list provided. If the formatting
-        fits, attempts to find the resource, creates a diff doc, then attempts
-        to construct a model with the diff doc. If any errors present, routes
-        the errors back to the user.
+        fits, attempts to find the resource, applies the patch, then attempts
+        to construct a model with the patched document. If any errors present,
+        routes the errors back to the user.
+
+        Only the fields touched by the patch are written, in a single update
+        conditioned on the revision the patch was applied to. When the document
+        changed in between, the patch is not reapplied: the conflict is reported
+        so that the client reads the new revision and decides again. A `test`
+        operation on `/revision` lets the client require the revision it last read.
 
         :param pid:
         :param patch_document_list:
         :param current_user: User | None
-        :return:
+        :return: The patched document.
         """
         if len(patch_document_list) == 0:
             return
-        patch = JsonPatch(list(map(lambda x: x.dict(), patch_document_list)))
-        patch_list = list(patch)
-        for i in range(0, len(patch_list)):
-            if patch_list[i]['path'] == '/_id' \
-                    or patch_list[i]['path'] == '/pid' \
-                    or patch_list[i]['path'] == '/isDeleted':
-                raise FtmException('error.patch.InvalidPatch')
-        result = await self.collection.find_one({"pid": pid})
+        patch, patch_list = self._parse_patch(patch_document_list)
+        result = await self.collection.find_one(live({"pid": pid}))
         if result is None:
             raise FtmException(f"error.{self.collection.__name__.lower()}.NotFound")
-        await self.patch_document_validator(result, patch_list, current_user)
-        try:
-            diff_doc = patch.apply(result.dict())
-            try:
-                new_doc = self.collection(**diff_doc)
-            except ValidationError:
-                raise FtmException('error.patch.InvalidPatch')
-            update_query = {"$set": {
-                field: value for field, value in new_doc.dict().items() if field != "id"
-            }}
-            await result.update(update_query)
-        except JsonPatchException:
-            raise FtmException('error.patch.InvalidPatch')
+        write = await self._prepare_patch(result, patch, patch_list, current_user)
+        if write is None:
+            return result
+        updated = await self.collection.get_motor_collection().find_one_and_update(
+            *write, return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            raise FtmException('error.patch.Conflict')
+        self.invalidate_reference(pid)
+        return parse_obj(self.collection, updated)
+
+    async def delete_validator(self, document):
+        """ Validates the document may be deleted.
+
+        :param document: model_cls
+            the document to delete
+        :return:
+        """
+        pass
 
     async def delete_document(self, pid: str, additional_filters: dict = None):
         """Delete the specified document by asserting the isDeleted field
@@ -305,8 +714,203 @@ class Service(AbstractService):
         :param additional_filters: Additional filters to use on the documents
         :return: None
         """
-        q = self.process_q(q={"pid": pid}, additional_filters=additional_filters)
+        q = self.process_q(q=json.dumps({"pid": pid}), additional_filters=additional_filters)
         exists = await self.collection.find_one(q)
         if exists is None:
             raise FtmException(f"error.{self.collection.__name__.lower()}.NotFound")
-        await exists.update({"$set": {"isDeleted": "true"}})
+        await self.delete_validator(exists)
+        # The revision is bumped so that a patch computed before the delete conflicts.
+        await exists.update({"$set": {"isDeleted": True}, "$inc": {"revision": 1}})
+        self.invalidate_reference(pid)
+
+    async def _prepare_bulk_operation(self, index: int, operation: BulkOperation, targets: dict,
+                                      additional_filters: dict = None, current_user: User | None = None):
+        """Validates a bulk operation and builds its write.
+
+        :return: The write request and the result reported if it succeeds.
+        """
+        result = BulkOperationResult(index=index, op=operation.op, pid=operation.pid, statusCode=200)
+        if operation.op == "create":
+            if operation.document is None:
+                raise FtmException('error.bulk.InvalidOperation', developer_message="A create requires a document.")
+            try:
+                new_document = self.collection.parse_obj(operation.document)
+            except ValidationError as E:
+                raise FtmException('error.bulk.InvalidOperation', developer_message=E.__str__())
+            if additional_filters and not self._in_scope(new_document, additional_filters):
+                raise FtmException('error.bulk.OutOfScope')
+            await self.add_validator(new_document)
+            new_document.pid = str(uuid.uuid4())
+            new_document.createdAt = datetime.datetime.now()
+            new_document.revision = 0
+            result.pid = new_document.pid
+            result.statusCode = 201
+            return InsertOne(get_dict(new_document, to_db=True)), result
+
+        document = targets.get(operation.pid)
+        if document is None:
+            raise FtmException(f"error.{self.collection.__name__.lower()}.NotFound")
+        if operation.op == "patch":
+            if not operation.patch:
+                raise FtmException('error.bulk.InvalidOperation', developer_message="A patch requires patch documents.")
+            patch, patch_list = self._parse_patch(operation.patch)
+            write = await self._prepare_patch(document, patch, patch_list, current_user,
+                                              additional_filters=additional_filters)
+            if write is None:
+                return None, result
+            return self.conditioned_update(*write), result
+
+        await self.delete_validator(document)
+        return self.conditioned_update({"_id": document.id, "revision": self._revision_filter(document)},
+                                       {"$set": {"isDeleted": True}, "$inc": {"revision": 1}}), result
+
+    @staticmethod
+    def conditioned_update(filter: dict, update: dict) -> ConditionedUpdate:
+        """Builds a bulk update of a document applied only if it is still at the revision it was
+        read at.
+
+        :param filter: The _id and revision of the document.
+        :param update: The update of the document.
+        :return: ConditionedUpdate
+        """
+        return ConditionedUpdate(filter, update)
+
+    async def write_unordered(self, requests: list, creates: frozenset = frozenset()) -> dict[int, FtmException]:
+        """Executes requests with a single unordered bulk write and classifies the outcome of
+        each. Write errors are reported at their position. A bulk write only counts the
+        updates that matched a document, so if conditioned updates are missing from the count,
+        their documents are read back: one that is gone or was deleted in between is reported
+        not found, and one that does not hold the revision the update writes is reported as a
+        conflict. If more documents hold that revision than the count allows, a concurrent
+        write reached the same revision and which updates were written cannot be told apart,
+        so they are all reported as conflicts rather than reporting an update not written.
+
+        :param requests: InsertOne requests, updates built with conditioned_update, and upserts
+            creating a document unless one matches their filter.
+        :param creates: The positions of the upserts creating a document. One that matched an
+            existing document instead is reported as a conflict.
+        :return: The error of each request that was not written, by position.
+        """
+        try:
+            result = (await self.collection.get_motor_collection().bulk_write(requests, ordered=False)).bulk_api_result
+        except BulkWriteError as E:
+            result = E.details
+        errors = {_error["index"]: FtmException('error.bulk.WriteFailed', developer_message=_error.get("errmsg"))
+                  for _error in result.get("writeErrors", [])}
+        upserted = {_upsert["index"] for _upsert in result.get("upserted", [])}
+        matched_creates = creates - upserted - errors.keys()
+        for position in matched_creates:
+            errors[position] = FtmException('error.patch.Conflict')
+
+        conditioned = [_position for _position, _request in enumerate(requests)
+                       if isinstance(_request, ConditionedUpdate) and _position not in errors]
+        matched = result.get("nMatched", 0) - len(matched_creates)
+        if len(conditioned) == matched:
+            return errors
+        cursor = self.collection.get_motor_collection().find(
+            {"_id": {"$in": [requests[_position].document_id for _position in conditioned]}},
+            {"revision": 1, "isDeleted": 1}
+        )
+        documents = {_document["_id"]: _document for _document in await cursor.to_list(length=None)}
+        written = []
+        for position in conditioned:
+            request = requests[position]
+            document = documents.get(request.document_id)
+            if document is not None and (document.get("revision") or 0) == request.written_revision:
+                written.append(position)
+            elif document is None or document.get("isDeleted") is True:
+                errors[position] = FtmException(f"error.{self.collection.__name__.lower()}.NotFound")
+            else:
+                errors[position] = FtmException('error.patch.Conflict')
+        if len(written) > matched:
+            for position in written:
+                errors[position] = FtmException('error.patch.Conflict')
+        return errors
+
+    @staticmethod
+    def _failed(index: int, operation: BulkOperation, error: FtmException) -> BulkOperationResult:
+        return BulkOperationResult(index=index, op=operation.op, pid=operation.pid, statusCode=error.status_code,
+                                   errorCode=error.error_code, developerMessage=error.developer_message)
+
+    async def bulk_write(self, operations: list[BulkOperation], additional_filters: dict = None,
+                         current_user: User | None = None) -> list[BulkOperationResult]:
+        """Creates, patches and deletes many documents with a single unordered bulk write.
+
+        The documents targeted by patches and deletes are read with one query, and the
+        operations are validated concurrently in batches of BULK_VALIDATION_BATCH_SIZE so that
+        the lookups of their validators are coalesced by the loader. An operation failing
+        validation is reported without preventing the others from being written. Patches and
+        deletes are conditioned on the revision they were validated against, and report a
+        conflict if the document changed in between, as classified by write_unordered.
+
+        :param operations: The operations, at most MAX_BULK_OPERATIONS.
+        :param additional_filters: Fields every document read or written must match, if any.
+        :param current_user: User | None
+        :return: The result of each operation, in the order of the operations.
+        """
+        if len(operations) > self.settings.MAX_BULK_OPERATIONS:
+            raise FtmException('error.bulk.TooManyOperations',
+                               developer_message=f"At most {self.settings.MAX_BULK_OPERATIONS} operations are "
+                                                 f"allowed per request, {len(operations)} were sent.")
+        results: list[BulkOperationResult | None] = [None] * len(operations)
+
+        # Checks that span operations: a pid is targeted once and unique fields are not repeated.
+        targeted, unique_values = {}, {}
+        for i, operation in enumerate(operations):
+            if operation.op != "create":
+                if operation.pid is None or operation.pid in targeted:
+                    message = "A patch or delete requires a pid." if operation.pid is None else \
+                        f"The pid is already targeted by the operation at index {targeted[operation.pid]}."
+                    results[i] = self._failed(i, operation, FtmException('error.bulk.InvalidOperation',
+                                                                         developer_message=message))
+                    continue
+                targeted[operation.pid] = i
+            elif operation.document is not None:
+                for field, error_code in self.bulk_unique_fields.items():
+                    value = operation.document.get(field)
+                    if value is None:
+                        continue
+                    if (field, value) in unique_values:
+                        results[i] = self._failed(i, operation, FtmException(error_code))
+                        break
+                    unique_values[(field, value)] = i
+
+        targets = {}
+        if targeted:
+            query = live({"pid": {"$in": list(targeted)}, **(additional_filters or {})})
+            targets = {_document.pid: _document for _document in await self.collection.find(query).to_list()}
+
+        async def prepare(index):
+            try:
+                return await self._prepare_bulk_operation(index, operations[index], targets,
+                                                          additional_filters=additional_filters,
+                                                          current_user=current_user)
+            except FtmException as E:
+                return E
+
+        pending = [_i for _i in range(len(operations)) if results[_i] is None]
+        requests, request_indexes = [], []
+        batch_size = self.settings.BULK_VALIDATION_BATCH_SIZE
+        for start in range(0, len(pending), batch_size):
+            batch = pending[start:start + batch_size]
+            for index, prepared in zip(batch, await asyncio.gather(*(prepare(_i) for _i in batch))):
+                if isinstance(prepared, FtmException):
+                    results[index] = self._failed(index, operations[index], prepared)
+                    continue
+                request, results[index] = prepared
+                if request is not None:
+                    requests.append(request)
+                    request_indexes.append(index)
+
+        if not requests:
+            return results
+
+        for position, error in (await self.write_unordered(requests)).items():
+            index = request_indexes[position]
+            results[index] = self._failed(index, operations[index], error)
+
+        loader = self.loader
+        for pid in targeted:
+            loader.clear(self.collection, pid)
+            self.invalidate_reference(pid)
+        return results
@@ -0,0 +1,102 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from ftmcloud.domains.privileges.models.models import Privilege
+from ftmcloud.domains.privileges.services.privilege_services import PrivilegesService
+
+
+class _Cursor:
+
+    def __init__(self, documents):
+        self._documents = documents
+
+    async def to_list(self, length=None):
+        return self._documents
+
+
+class _Collection:
+    """Answers a bulk write with a result and the read back of documents with their state."""
+
+    def __init__(self, result, documents=(), failed=False):
+        self.result = result
+        self.documents = {_document["_id"]: _document for _document in documents}
+        self.failed = failed
+        self.requests = None
+        self.reads = []
+
+    async def bulk_write(self, requests, ordered=True):
+        self.requests = requests
+        if self.failed:
+            raise BulkWriteError(self.result)
+        return mock.Mock(bulk_api_result=self.result)
+
+    def find(self, query, projection=None):
+        self.reads.append(query)
+        return _Cursor([self.documents[_id] for _id in query["_id"]["$in"] if _id in self.documents])
+
+
+def _update(document_id, revision):
+    return PrivilegesService.conditioned_update({"_id": document_id, "revision": revision},
+                                                {"$set": {"name": "name"}, "$inc": {"revision": 1}})
+
+
+class TestWriteUnordered(unittest.TestCase):
+    """
+    Test the classification of the outcome of each request of a bulk write
+    """
+    def setUp(self):
+        self._service = PrivilegesService()
+
+    def _write(self, collection, requests, creates=frozenset()):
+        with mock.patch.object(Privilege, "get_motor_collection", return_value=collection):
+            errors = asyncio.run(self._service.write_unordered(requests, creates=creates))
+        return {_position: _error.error_code for _position, _error in errors.items()}
+
+    def test_conditioned_updates_are_not_upserts(self):
+        request = _update("a", 3)
+        self.assertFalse(request._upsert)
+        self.assertEqual(("a", 4), (request.document_id, request.written_revision))
+        self.assertEqual(1, _update("a", {"$in": [None, 0]}).written_revision)
+
+    def test_every_update_matched(self):
+        collection = _Collection({"nMatched": 2, "upserted": []})
+        self.assertEqual({}, self._write(collection, [_update("a", 1), InsertOne({}), _update("b", 0)]))
+        self.assertEqual([], collection.reads)
+
+    def test_unmatched_updates_are_read_back(self):
+        collection = _Collection({"nMatched": 1, "upserted": []}, documents=[
+            {"_id": "a", "revision": 2},
+            {"_id": "b", "revision": 5},
+            {"_id": "c", "revision": 3, "isDeleted": True},
+        ])
+        requests = [_update("a", 1), _update("b", 1), _update("c", 1), _update("d", 1)]
+        self.assertEqual({1: "error.patch.Conflict", 2: "error.privilege.NotFound", 3: "error.privilege.NotFound"},
+                         self._write(collection, requests))
+        self.assertEqual(1, len(collection.reads))
+
+    def test_revisions_reached_concurrently_are_conflicts(self):
+        collection = _Collection({"nMatched": 1, "upserted": []}, documents=[
+            {"_id": "a", "revision": 2},
+            {"_id": "b", "revision": 2},
+            {"_id": "c", "revision": 7},
+        ])
+        requests = [_update("a", 1), _update("b", 1), _update("c", 1)]
+        self.assertEqual({0: "error.patch.Conflict", 1: "error.patch.Conflict", 2: "error.patch.Conflict"},
+                         self._write(collection, requests))
+
+    def test_write_errors_and_creates(self):
+        collection = _Collection({"nMatched": 2, "upserted": [{"index": 1, "_id": "x"}], "writeErrors": [
+            {"index": 0, "code": 11000, "errmsg": "E11000 duplicate key error"}]}, failed=True)
+        requests = [InsertOne({}), UpdateOne({"name": "x"}, {"$setOnInsert": {}}, upsert=True),
+                    UpdateOne({"name": "y"}, {"$setOnInsert": {}}, upsert=True), _update("a", 1)]
+        self.assertEqual({0: "error.bulk.WriteFailed", 2: "error.patch.Conflict"},
+                         self._write(collection, requests, creates=frozenset({1, 2})))
+        self.assertEqual([], collection.reads)
+
+
+if __name__ == '__main__':
+    unittest.main()
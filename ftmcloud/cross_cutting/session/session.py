@@ -1,9 +1,17 @@
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.cross_cutting.cache.cache import LRUCache
+from ftmcloud.cross_cutting.models.document import live
 from ftmcloud.domains.privileges.models.models import Privilege
 from ftmcloud.domains.organizations.models.models import Organization
 from ftmcloud.domains.users.models.models import User
 
+import asyncio
 import random
 import string
+import time
+from types import MappingProxyType
+
+from pydantic import BaseModel
 
 
 class PasswordGenerator:
@@ -16,36 +24,188 @@ class PasswordGenerator:
         return password
 
 
-privilege_pid_to_name = {}
-privilege_name_to_pid = {}
-default_organization_pid = None
+_settings = get_settings()
+
+# Users resolved from access tokens, keyed by user pid. The TTL bounds how long another
+# worker may serve a user after it was modified elsewhere; writes through the UserService
+# invalidate the entry in this process immediately.
+current_user_cache = LRUCache(max_size=_settings.USER_CACHE_SIZE, ttl=_settings.USER_CACHE_TTL)
+
 
-async def init_privilege_name_to_pid():
-    """ Loads the mapping of privilege name to privilege pid into memory for the
-    current process.
+class SessionSnapshot:
+    """
+    An immutable, in-memory view of the privileges and organizations known to this
+    process. A refresh builds a new snapshot and swaps it in whole, so readers always
+    see a consistent version.
+    """
 
-    :return:
+    def __init__(self, version: int, privileges: list[Privilege], organizations: list[dict], generation: int = 0):
+        """
+        Builds the lookups of the snapshot.
+
+        :param version: int
+            version of the snapshot within this process
+        :param privileges: list[Privilege]
+            the live privilege documents
+        :param organizations: list[dict]
+            the pid and name of every live organization
+        :param generation: int
+            value of the shared session version counter the snapshot was loaded at
+        """
+        self.version = version
+        self.generation = generation
+        self.loaded_at = time.time()
+        self.privileges_by_pid = MappingProxyType({_privilege.pid: _privilege for _privilege in privileges})
+        self.privilege_pid_to_name = MappingProxyType(
+            {_privilege.pid: _privilege.name for _privilege in privileges})
+        self.privilege_name_to_pid = MappingProxyType(
+            {_privilege.name: _privilege.pid for _privilege in privileges})
+        self.organization_pids = frozenset(_organization['pid'] for _organization in organizations)
+        self.default_organization_pid = next(
+            (_organization['pid'] for _organization in organizations if _organization.get('name') == "Default"),
+            None
+        )
+
+
+class SessionSnapshotInfo(BaseModel):
+    """Describes the session snapshot a worker is serving, for debugging refreshes.
     """
-    global privilege_pid_to_name
-    global privilege_name_to_pid
-    privileges = await Privilege.find().to_list()
-    for _privilege in privileges:
-        privilege_pid_to_name[_privilege.pid] = _privilege.name
-        privilege_name_to_pid[_privilege.name] = _privilege.pid
+    version: int
+    generation: int
+    loadedAt: float
+    privileges: int
+    organizations: int
+    refreshMode: str
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "version": 3,
+                "generation": 12,
+                "loadedAt": 1697587200.0,
+                "privileges": 4,
+                "organizations": 27,
+                "refreshMode": "change_stream"
+            }
+        }
+
+
+_snapshot = SessionSnapshot(version=0, privileges=[], organizations=[])
+_refresh_lock = asyncio.Lock()
+
+# A single document counting changes to privileges and organizations. Writers increment it
+# so every worker can tell its snapshot is stale without reloading the collections.
+SESSION_VERSION_COLLECTION = "session_versions"
+SESSION_VERSION_ID = "session"
+
 
+def get_session_snapshot() -> SessionSnapshot:
+    return _snapshot
 
-async def init_default_organization():
-    """ Finds the default organization and initializes so all new users are assigned to it.
 
-    :return:
+def _session_version_collection():
+    return Privilege.get_motor_collection().database[SESSION_VERSION_COLLECTION]
+
+
+async def get_session_generation() -> int:
+    """ Reads the shared session version counter.
+
+    :return: generation: int
+        the current value of the counter, 0 if nothing has been published yet
     """
-    global default_organization_pid
-    org = await Organization.find({"name": "Default"}).to_list()
-    default_organization_pid = org[0].pid
+    document = await _session_version_collection().find_one({"_id": SESSION_VERSION_ID})
+    return document["generation"] if document else 0
+
+
+async def publish_session_change():
+    """ Increments the shared session version counter so that other workers reload their
+    snapshot, then refreshes the snapshot of the current process.
+
+    :return: snapshot: SessionSnapshot
+        the new snapshot
+    """
+    await _session_version_collection().update_one(
+        {"_id": SESSION_VERSION_ID}, {"$inc": {"generation": 1}}, upsert=True
+    )
+    return await refresh_session_snapshot()
+
+
+async def refresh_session_snapshot():
+    """ Loads the privileges and organizations into a new snapshot and swaps it in
+    for the current process.
+
+    :return: snapshot: SessionSnapshot
+        the new snapshot
+    """
+    global _snapshot
+    async with _refresh_lock:
+        # Read the counter before the collections: a change landing mid-load leaves the
+        # snapshot behind the counter, so the next check reloads it again.
+        generation = await get_session_generation()
+        privileges = await Privilege.find(live()).to_list()
+        organizations = await Organization.get_motor_collection().find(
+            live(), {"_id": 0, "pid": 1, "name": 1}
+        ).to_list(length=None)
+        _snapshot = SessionSnapshot(version=_snapshot.version + 1, privileges=privileges,
+                                    organizations=organizations, generation=generation)
+    return _snapshot
+
+
+async def _refresh_on_miss():
+    """ Refreshes the snapshot after a lookup missed, at most once per
+    SESSION_SNAPSHOT_MISS_REFRESH_INTERVAL, so unknown pids cannot force a reload per request.
+
+    :return: whether a newer snapshot may be available
+    """
+    if time.time() - _snapshot.loaded_at < _settings.SESSION_SNAPSHOT_MISS_REFRESH_INTERVAL:
+        return False
+    if _refresh_lock.locked():
+        # Another request is already refreshing; wait for it rather than reloading again.
+        async with _refresh_lock:
+            return True
+    await refresh_session_snapshot()
+    return True
+
+
+async def get_privilege(privilege_pid: str) -> Privilege | None:
+    """ Retrieves the privilege from the session snapshot.
+
+    :param privilege_pid: str
+        pid of the privilege
+    :return: the privilege, or None if it does not exist
+    """
+    privilege = _snapshot.privileges_by_pid.get(privilege_pid)
+    if privilege is None and await _refresh_on_miss():
+        privilege = _snapshot.privileges_by_pid.get(privilege_pid)
+    return privilege
+
+
+async def organization_exists(organization_pid: str) -> bool:
+    """ Validates the organization exists using the session snapshot.
+
+    :param organization_pid: str
+        pid of the organization
+    :return: whether the organization exists
+    """
+    if organization_pid in _snapshot.organization_pids:
+        return True
+    if await _refresh_on_miss():
+        return organization_pid in _snapshot.organization_pids
+    return False
 
 
 def get_default_organization_pid():
-    return default_organization_pid
+    return _snapshot.default_organization_pid
+
+
+def invalidate_current_user(pid: str):
+    """ Evicts the user from the current-user cache of this process.
+
+    :param pid: str
+        pid of the user that was modified
+    :return: None
+    """
+    current_user_cache.pop(pid)
 
 
 def validate_user_privilege_in_list(privilege_pid: str, privilege_names: list[str]):
@@ -60,12 +220,7 @@ def validate_user_privilege_in_list(privilege_pid: str, privilege_names: list[st
     :return: in_list: bool
         whether the privilege is in the specified list
     """
-    in_list = False
-    if privilege_pid in privilege_pid_to_name:
-        if privilege_pid_to_name[privilege_pid] in privilege_names:
-            in_list = True
-
-    return in_list
+    return _snapshot.privilege_pid_to_name.get(privilege_pid) in privilege_names
 
 
 def get_privilege_pid_for_name(privilege_name: str):
@@ -77,7 +232,7 @@ def get_privilege_pid_for_name(privilege_name: str):
     :return: privilege_pid: str
         pid of the privilege
     """
-    return privilege_name_to_pid[privilege_name]
+    return _snapshot.privilege_name_to_pid[privilege_name]
 
 
 def has_elevated_privileges(user: User):
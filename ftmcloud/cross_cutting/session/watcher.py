@@ -0,0 +1,100 @@
+import asyncio
+import logging
+
+import pymongo.errors
+
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.cross_cutting.session import session
+from ftmcloud.domains.organizations.models.models import Organization
+from ftmcloud.domains.privileges.models.models import Privilege
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSnapshotWatcher:
+    """
+    Keeps the session snapshot of this worker current. Follows a change stream on the
+    privileges, organizations and session version collections where the deployment
+    supports one, and otherwise polls the shared session version counter.
+    """
+
+    MODE_STOPPED = "stopped"
+    MODE_CHANGE_STREAM = "change_stream"
+    MODE_POLLING = "polling"
+
+    def __init__(self, poll_interval: float, use_change_streams: bool = True):
+        """
+        Initializes the watcher.
+
+        :param poll_interval: float
+            seconds between two reads of the session version counter when polling
+        :param use_change_streams: bool
+            whether to try a change stream before falling back to polling
+        """
+        self._poll_interval = poll_interval
+        self._use_change_streams = use_change_streams
+        self._task: asyncio.Task | None = None
+        self.mode = self.MODE_STOPPED
+
+    def start(self):
+        """ Starts watching in the background of the running event loop.
+
+        :return: None
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """ Stops watching and waits for the background task to finish.
+
+        :return: None
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.mode = self.MODE_STOPPED
+
+    async def _run(self):
+        if self._use_change_streams:
+            try:
+                await self._watch_change_stream()
+            except pymongo.errors.PyMongoError as e:
+                logger.warning(f"Session change stream unavailable, falling back to polling: {e}")
+        await self._poll()
+
+    async def _watch_change_stream(self):
+        database = Privilege.get_motor_collection().database
+        collections = [
+            Privilege.get_motor_collection().name,
+            Organization.get_motor_collection().name,
+            session.SESSION_VERSION_COLLECTION
+        ]
+        pipeline = [{"$match": {"ns.coll": {"$in": collections}}}]
+        async with database.watch(pipeline=pipeline) as stream:
+            self.mode = self.MODE_CHANGE_STREAM
+            # Changes made while the stream was being opened would otherwise go unseen.
+            await session.refresh_session_snapshot()
+            async for _ in stream:
+                # Coalesce a burst of changes into a single reload.
+                while stream.alive and await stream.try_next() is not None:
+                    pass
+                await session.refresh_session_snapshot()
+
+    async def _poll(self):
+        self.mode = self.MODE_POLLING
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                if await session.get_session_generation() != session.get_session_snapshot().generation:
+                    await session.refresh_session_snapshot()
+            except pymongo.errors.PyMongoError as e:
+                logger.warning(f"Unable to check the session version: {e}")
+
+
+_settings = get_settings()
+session_snapshot_watcher = SessionSnapshotWatcher(poll_interval=_settings.SESSION_SNAPSHOT_POLL_INTERVAL,
+                                                  use_change_streams=_settings.SESSION_SNAPSHOT_CHANGE_STREAMS)
@@ -0,0 +1,64 @@
+from fastapi.responses import StreamingResponse
+
+from ftmcloud.cross_cutting.models.response import ResponseWithHttpInfo
+
+
+async def list_response(service, model, description: str, q: str | None = None, limit: int | None = None,
+                        offset: int | None = None, sort: str | None = None, include_totals: bool | None = None,
+                        estimate_totals: bool | None = None, cursor: str | None = None, fields: str | None = None,
+                        format: str = "json", additional_filters: dict | None = None):
+    """ Responds to a list endpoint with a page of documents, or with every document as NDJSON.
+    The page carries its total in X-Total-Count if requested, and the cursor of the next page
+    in X-Next-Cursor if paginated by keyset.
+
+    :param service: Service
+        the service of the collection listed
+    :param model:
+        the response model of the documents when no fields are requested
+    :param description: str
+        the description of the response
+    :param q: str | None
+        the query
+    :param limit: int | None
+        the page size
+    :param offset: int | None
+        the number of documents skipped, if paginating by offset
+    :param sort: str | None
+        the sort field, prefixed with its direction
+    :param include_totals: bool | None
+        whether to count the documents, requested by the presence of the parameter
+    :param estimate_totals: bool | None
+        whether a cached, possibly stale, total is acceptable
+    :param cursor: str | None
+        the cursor of the page, if paginating by keyset
+    :param fields: str | None
+        the fields to include, or exclude if prefixed with '-'
+    :param format: str
+        json for a page, ndjson for an export
+    :param additional_filters: dict | None
+        fields every document listed must match, if any
+    :return: ResponseWithHttpInfo | StreamingResponse
+    """
+    projection_model = service.get_projection_model_from_fields(fields)
+    if format == "ndjson":
+        return StreamingResponse(
+            service.export(q=q, sort=sort, additional_filters=additional_filters, projection_model=projection_model),
+            media_type="application/x-ndjson"
+        )
+    documents, total = await service.get_page(
+        q=q, limit=limit, offset=offset, sort=sort, additional_filters=additional_filters, cursor=cursor,
+        include_totals=include_totals is not None, estimate_totals=bool(estimate_totals),
+        projection_model=projection_model
+    )
+    headers = {}
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    if cursor is not None:
+        next_cursor = service.next_cursor(documents, sort=sort, limit=limit, q=q,
+                                          additional_filters=additional_filters)
+        if next_cursor is not None:
+            headers["X-Next-Cursor"] = next_cursor
+    return ResponseWithHttpInfo(data=documents,
+                                model=projection_model or model,
+                                description=description,
+                                headers=headers)
@@ -6,6 +6,9 @@ from fastapi import APIRouter, Depends
 from pydantic.typing import is_classvar
 from starlette.routing import Route, WebSocketRoute
 
+from ftmcloud.cross_cutting.container.container import Provide
+from ftmcloud.cross_cutting.loader.loader import bind_request_loader
+
 _T = TypeVar("_T")
 
 _CBV_KEY = "__cbv_initialized__"
@@ -15,7 +18,8 @@ def _init_cbv(cls: Type[Any]) -> None:
     """
     Idempotently modifies the provided `cls`, performing the following modifications:
     * The `__init__` method is updated to set any class-annotated dependencies
-    as instance attributes.
+    as instance attributes. Attributes provided by the container are left as they are:
+    they resolve to process-wide singletons rather than per-request dependencies.
     * The `__signature__` attribute is updated to indicate to FastAPI what arguments
     should be passed to the initializer.
     """
@@ -35,7 +39,7 @@ def _init_cbv(cls: Type[Any]) -> None:
     ]
     dependency_names: List[str] = []
     for name, hint in get_type_hints(cls).items():
-        if is_classvar(hint):
+        if is_classvar(hint) or isinstance(getattr(cls, name, None), Provide):
             continue
         parameter_kwargs = {"default": getattr(cls, name, Ellipsis)}
         dependency_names.append(name)
@@ -85,6 +89,8 @@ def controller(router: APIRouter) -> Callable[[Type[_T]], Type[_T]]:
     the router provided to this function will become endpoints in the router.
     The first positional argument to the methods (typically `self`)
     will be populated with an instance created using FastAPI's dependency-injection.
+    Every route also binds a request-scoped DocumentLoader, which the services
+    resolve through `get_loader`.
     """
 
     def dec(cls: Type[_T]) -> Type[_T]:
@@ -101,7 +107,7 @@ def controller(router: APIRouter) -> Callable[[Type[_T]], Type[_T]]:
             router.routes.remove(route)
             _update_cbv_route_endpoint_signature(cls, route)
             view_router.routes.append(route)
-        router.include_router(view_router)
+        router.include_router(view_router, dependencies=[Depends(bind_request_loader)])
         return cls
 
     return dec
\ No newline at end of file
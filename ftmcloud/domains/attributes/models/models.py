@@ -1,10 +1,13 @@
 from pydantic.class_validators import Optional, root_validator
 from pydantic import BaseModel
 from pydantic.schema import Literal
+from pymongo import ASCENDING
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.cache.reference import reference_model
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
+@reference_model
 class Attribute(BaseDocument):
     """
     Properties of product types or products that a user may specify to query by.
@@ -16,6 +19,10 @@ class Attribute(BaseDocument):
 
     class Settings:
         name = "attributes"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("name", ASCENDING)], name="name_1"),
+        ]
 
     class Config:
         schema_extra = {
@@ -1,27 +1,47 @@
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.models.document import live
 from ftmcloud.cross_cutting.service.service import Service
 from ftmcloud.domains.attributes.models.models import Attribute
 from ftmcloud.domains.products.models.models import Product
 from ftmcloud.domains.product_types.models.models import ProductType
 
 
+def prefetch_attributes(loader, attribute_values) -> None:
+    """Issues the lookup of every attribute referenced by the attribute values without
+    awaiting them, so that the loader resolves them all with a single query.
+
+    :param loader: DocumentLoader
+        the loader of the request
+    :param attribute_values: list[AttributeValue | dict]
+        the attribute values, parsed or raw
+    :return: None
+    """
+    for _value in attribute_values:
+        if isinstance(_value, dict):
+            attribute_pid = _value.get("attributePid")
+        else:
+            attribute_pid = getattr(_value, "attributePid", None)
+        if isinstance(attribute_pid, str):
+            loader.load(Attribute, attribute_pid)
+
+
 class AttributesService(Service):
 
+    bulk_unique_fields = {"name": 'error.attribute.InvalidName'}
+
     def __init__(self):
         super(AttributesService, self).__init__(collection=Attribute)
 
-    async def add_document(self, new_attribute: Attribute):
+    async def add_validator(self, new_attribute: Attribute):
         attribute_exists = await self.find_one(
             {"name": new_attribute.name})
         if attribute_exists:
             raise FtmException('error.attribute.InvalidName')
-        return await super(AttributesService, self).add_document(new_document=new_attribute)
 
-    async def delete_document(self, pid: str):
-        products = await Product.find_one({"attributeValues.attributePid": pid, "isDeleted": {"$ne": True}})
+    async def delete_validator(self, attribute: Attribute):
+        products = await Product.find_one(live({"attributeValues.attributePid": attribute.pid}))
         if products is not None:
             raise FtmException('error.attribute.NotEmpty')
-        product_types = await ProductType.find_one({"attributeValues.attributePid": pid, "isDeleted": {"$ne": True}})
+        product_types = await ProductType.find_one(live({"attributeValues.attributePid": attribute.pid}))
         if product_types is not None:
             raise FtmException('error.attribute.NotEmpty')
-        return await super(AttributesService, self).delete_document(pid=pid)
@@ -1,8 +1,11 @@
 from pydantic.class_validators import Optional
+from pymongo import ASCENDING
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.cache.reference import reference_model
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
+@reference_model
 class Category(BaseDocument):
     """Represents a type of product category to standardize formatting.
     """
@@ -13,6 +16,10 @@ class Category(BaseDocument):
 
     class Settings:
         name = "categories"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("name", ASCENDING)], name="name_1"),
+        ]
 
     class Config:
         schema_extra = {
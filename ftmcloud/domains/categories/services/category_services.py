@@ -1,4 +1,5 @@
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.models.document import live
 from ftmcloud.cross_cutting.service.service import Service
 from ftmcloud.domains.categories.models.models import Category
 from ftmcloud.domains.product_types.models.models import ProductType
@@ -11,11 +12,11 @@ class CategoriesService(Service):
 
     async def add_document(self, new_category: Category):
         category_exists = await self.find_one(
-            {"name": new_category.name, "isDeleted": {"$ne": "true"}})
+            {"name": new_category.name})
         if category_exists:
             raise FtmException('error.category.InvalidName')
         if new_category.parentCategoryPid is not None:
-            parent_category_exists = await self.find_one({"pid": new_category.parentCategoryPid, "isDeleted": {"$ne": "true"}})
+            parent_category_exists = await self.loader.load(Category, new_category.parentCategoryPid)
             if not parent_category_exists:
                 raise FtmException('error.category.NotFound', developer_message="Parent category not found!",
                                    user_message="We couldn't find the parent category you specified.")
@@ -24,14 +25,13 @@ class CategoriesService(Service):
     async def patch(self, pid: str, patch_document_list: list):
         for i in range(0, len(patch_document_list)):
             if patch_document_list[i].path == '/parentProductCategoryPid':
-                exists = await self.base_model.find_one(
-                    {"pid": patch_document_list[i].value, "isDeleted": {"$ne": "true"}})
+                exists = await self.loader.load(Category, patch_document_list[i].value)
                 if exists is None:
                     raise FtmException('error.category.NotFound')
         return await super(CategoriesService, self).patch(pid=pid, patch_document_list=patch_document_list)
 
     async def delete_document(self, pid: str):
-        product_types = await ProductType.find_one({"productCategoryPid": pid, "isDeleted": {"$ne": "true"}})
+        product_types = await ProductType.find_one(live({"categoryPid": pid}))
         if product_types is not None:
             raise FtmException('error.category.NotEmpty')
         return await super(CategoriesService, self).delete_document(pid=pid)
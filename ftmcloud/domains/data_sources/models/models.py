@@ -1,9 +1,12 @@
 from pydantic.class_validators import Optional
+from pymongo import ASCENDING
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.cache.reference import reference_model
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 from ftmcloud.cross_cutting.repository.repository import Repository
 
 
+@reference_model
 class DataSource(BaseDocument):
     """
     Represents a unique source of data.
@@ -14,6 +17,10 @@ class DataSource(BaseDocument):
 
     class Settings:
         name = "data_sources"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("name", ASCENDING)], name="name_1"),
+        ]
 
     class Config:
         schema_extra = {
@@ -1,8 +1,9 @@
 import datetime
 from pydantic.schema import Literal, Optional
 from pydantic.main import BaseModel
+from pymongo import ASCENDING, DESCENDING, IndexModel
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
 class KeyValueRecord(BaseModel):
@@ -40,6 +41,13 @@ class FtmTask(BaseDocument):
 
     class Settings:
         name = "ftm_tasks"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("completedDatetime", ASCENDING), ("lockDatetime", ASCENDING), ("createdAt", DESCENDING)],
+                       name="completedDatetime_1_lockDatetime_1_createdAt_-1"),
+            IndexModel([("assigneeUserPid", ASCENDING)], name="assigneeUserPid_1",
+                       partialFilterExpression={"assigneeUserPid": {"$exists": True}}),
+        ]
 
     class Config:
         schema_extra = {
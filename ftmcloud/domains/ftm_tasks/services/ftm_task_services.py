@@ -1,7 +1,7 @@
-import json
 from datetime import datetime, timedelta
 
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.models.document import live
 from ftmcloud.cross_cutting.service.service import Service
 from ftmcloud.cross_cutting.session.session import validate_user_privilege_in_list
 from ftmcloud.domains.ftm_tasks.models.models import FtmTask
@@ -13,9 +13,6 @@ class FtmTasksService(Service):
     def __init__(self):
         super(FtmTasksService, self).__init__(collection=FtmTask)
 
-    def _date_to_iso_string(self, dt):
-        return dt.isoformat() + 'Z'
-
     async def patch_document_validator(self, document, patch_document_list, current_user: User | None = None):
         """ Validates FtmTask patch documents.
 
@@ -32,7 +29,7 @@ class FtmTasksService(Service):
                 case _:
                     # Don't allow the user to change any metadata about the task.
                     if validate_user_privilege_in_list(current_user.privilegePid, ['reviewer', 'user']):
-                        raise FtmException('error.patch.invalidPatch')
+                        raise FtmException('error.patch.InvalidPatch')
 
     def get_task_assignment_query(
             self,
@@ -53,23 +50,35 @@ class FtmTasksService(Service):
             whether to show completed
 
         :return: query: dict
-            the query
+            the query, matching live tasks only
         """
+        # Completed is the only task status, held by the completion datetime.
+        show_completed = showCompleted or taskStatus == "completed"
         assignable_q = {
             "$or": [
-                {"lockDatetime": {"$lt": self._date_to_iso_string(datetime.now() - timedelta(minutes=15))}},
+                {"lockDatetime": {"$lt": datetime.now() - timedelta(minutes=15)}},
                 {"lockDatetime": None}
             ],
-            "completedDatetime": None if not showCompleted else {"$ne": None}
+            "completedDatetime": None if not show_completed else {"$ne": None}
         }
         for k, v in {
             "taskType": taskType,
-            "taskStatus": taskStatus,
             "targetApplication": targetApplication
         }.items():
             if v is not None:
                 assignable_q[k] = v
-        return assignable_q
+        return live(assignable_q)
+
+    async def count_task_assignments(self, query: dict) -> int:
+        """ Counts the tasks matching a task assignment query.
+
+        :param query: dict
+            the query, as built by get_task_assignment_query
+
+        :return: count: int
+            the number of matching tasks
+        """
+        return await self.collection.get_motor_collection().count_documents(query)
 
     async def get_task_assignment(
             self,
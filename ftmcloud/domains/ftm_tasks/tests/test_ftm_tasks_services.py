@@ -0,0 +1,30 @@
+import datetime
+import unittest
+
+from ftmcloud.cross_cutting.models.document import LIVE_FILTER
+from ftmcloud.domains.ftm_tasks.services.ftm_task_services import FtmTasksService
+
+
+class TestFtmTasksServices(unittest.TestCase):
+
+    def setUp(self):
+        self._service = FtmTasksService()
+
+    def test_task_assignment_query(self):
+        query = self._service.get_task_assignment_query(taskType="DatasetReview", targetApplication="analytix")
+        expired, unlocked = query["$or"]
+        self.assertIsInstance(expired["lockDatetime"]["$lt"], datetime.datetime)
+        self.assertEqual({"lockDatetime": None}, unlocked)
+        self.assertIsNone(query["completedDatetime"])
+        self.assertEqual(("DatasetReview", "analytix"), (query["taskType"], query["targetApplication"]))
+        self.assertTrue(all(query[_key] == _value for _key, _value in LIVE_FILTER.items()))
+
+    def test_completed_task_status(self):
+        for query in (self._service.get_task_assignment_query(taskStatus="completed"),
+                      self._service.get_task_assignment_query(showCompleted=True)):
+            self.assertEqual({"$ne": None}, query["completedDatetime"])
+            self.assertNotIn("taskStatus", query)
+
+
+if __name__ == '__main__':
+    unittest.main()
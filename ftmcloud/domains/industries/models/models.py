@@ -1,8 +1,11 @@
 from pydantic.class_validators import Optional
+from pymongo import ASCENDING
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.cache.reference import reference_model
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
+@reference_model
 class Industry(BaseDocument):
     """Represents a grouping of organizations that exist within the space.
     """
@@ -13,6 +16,10 @@ class Industry(BaseDocument):
 
     class Settings:
         name = "industries"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("name", ASCENDING)], name="name_1"),
+        ]
 
     class Config:
         schema_extra = {
@@ -1,6 +1,7 @@
 from pydantic.class_validators import Optional
+from pymongo import ASCENDING, DESCENDING
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
 class Invitation(BaseDocument):
@@ -13,4 +14,10 @@ class Invitation(BaseDocument):
 
     class Settings:
         name = "invitations"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("organizationPid", ASCENDING), ("createdAt", DESCENDING)],
+                       name="organizationPid_1_createdAt_-1"),
+            live_index([("createdAt", DESCENDING)], name="createdAt_-1"),
+        ]
         
\ No newline at end of file
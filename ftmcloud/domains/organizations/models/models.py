@@ -1,6 +1,7 @@
 from pydantic.class_validators import Optional
+from pymongo import ASCENDING
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
 class Organization(BaseDocument):
@@ -24,6 +25,10 @@ class Organization(BaseDocument):
 
     class Settings:
         name = "organizations"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("name", ASCENDING)], name="name_1"),
+        ]
 
     class Config:
         schema_extra = {
@@ -1,7 +1,8 @@
 from ftmcloud.core.exception.exception import FtmException
 from ftmcloud.cross_cutting.service.service import Service
+from ftmcloud.cross_cutting.session.session import publish_session_change
 from ftmcloud.domains.data_sources.models.models import DataSourceRepository
-from ftmcloud.domains.industries.models.models import Industry
+from ftmcloud.domains.industries.services.industry_services import IndustriesService
 from ftmcloud.domains.organizations.models.models import Organization
 from ftmcloud.domains.users.models.models import User
 
@@ -10,6 +11,7 @@ class OrganizationsService(Service):
 
     def __init__(self):
         self._data_source_repository = DataSourceRepository()
+        self._industries_service = IndustriesService()
         super(OrganizationsService, self).__init__(collection=Organization)
 
     async def _validate_data_source_pid(self, pid):
@@ -23,12 +25,22 @@ class OrganizationsService(Service):
 
     async def patch_document_validator(self, document, patch_document_list, current_user: User | None = None):
         for i in range(0, len(patch_document_list)):
-            if patch_document_list[i].path == '/industryPids':
-                patch_len = len(patch_document_list[i].value)
-                for j in range(0, patch_len):
-                    exists = await Industry.find_one(
-                        {"pid": patch_document_list[i].value[j], "isDeleted": {"$ne": "true"}})
-                    if exists is None:
-                        raise FtmException('error.industry.NotFound')
-            if patch_document_list[i].path == '/dataSourcePid':
-                await self._validate_data_source_pid(pid=patch_document_list[i].value)
+            if patch_document_list[i]['path'] == '/industryPids':
+                await self._industries_service.validate_many_exist(pids=patch_document_list[i]['value'])
+            if patch_document_list[i]['path'] == '/dataSourcePid':
+                await self._validate_data_source_pid(pid=patch_document_list[i]['value'])
+
+    async def add_document(self, new_document):
+        document = await super(OrganizationsService, self).add_document(new_document=new_document)
+        await publish_session_change()
+        return document
+
+    async def patch(self, pid: str, patch_document_list: list, current_user: User | None = None):
+        document = await super(OrganizationsService, self).patch(pid=pid, patch_document_list=patch_document_list,
+                                                                 current_user=current_user)
+        await publish_session_change()
+        return document
+
+    async def delete_document(self, pid: str, additional_filters: dict = None):
+        await super(OrganizationsService, self).delete_document(pid=pid, additional_filters=additional_filters)
+        await publish_session_change()
@@ -1,8 +1,11 @@
 from pydantic.class_validators import Optional
+from pymongo import ASCENDING
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.cache.reference import reference_model
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
+@reference_model
 class Privilege(BaseDocument):
     """Represents different access control levels a user might have within
     the database.
@@ -14,6 +17,10 @@ class Privilege(BaseDocument):
 
     class Settings:
         name = "privileges"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("name", ASCENDING)], name="name_1"),
+        ]
 
     class Config:
         schema_extra = {
@@ -1,8 +1,25 @@
 from ftmcloud.cross_cutting.service.service import Service
+from ftmcloud.cross_cutting.session.session import publish_session_change
 from ftmcloud.domains.privileges.models.models import Privilege
+from ftmcloud.domains.users.models.models import User
 
 
 class PrivilegesService(Service):
 
     def __init__(self):
         super(PrivilegesService, self).__init__(collection=Privilege)
+
+    async def add_document(self, new_document):
+        document = await super(PrivilegesService, self).add_document(new_document=new_document)
+        await publish_session_change()
+        return document
+
+    async def patch(self, pid: str, patch_document_list: list, current_user: User | None = None):
+        document = await super(PrivilegesService, self).patch(pid=pid, patch_document_list=patch_document_list,
+                                                              current_user=current_user)
+        await publish_session_change()
+        return document
+
+    async def delete_document(self, pid: str, additional_filters: dict = None):
+        await super(PrivilegesService, self).delete_document(pid=pid, additional_filters=additional_filters)
+        await publish_session_change()
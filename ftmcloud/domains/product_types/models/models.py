@@ -1,9 +1,12 @@
 from pydantic.class_validators import Optional
+from pymongo import ASCENDING
 
 from ftmcloud.domains.attributes.models.models import AttributeValue
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.cache.reference import reference_model
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 
 
+@reference_model
 class ProductType(BaseDocument):
     """Represents a type of service to standardize formatting.
     """
@@ -15,6 +18,12 @@ class ProductType(BaseDocument):
 
     class Settings:
         name = "product_types"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("name", ASCENDING)], name="name_1"),
+            live_index([("categoryPid", ASCENDING)], name="categoryPid_1"),
+            live_index([("attributeValues.attributePid", ASCENDING)], name="attributeValues.attributePid_1"),
+        ]
 
     class Config:
         schema_extra = {
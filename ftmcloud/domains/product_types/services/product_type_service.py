@@ -1,6 +1,7 @@
 from ftmcloud.core.exception.exception import FtmException
 from ftmcloud.cross_cutting.service.service import Service
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
+from ftmcloud.domains.attributes.services.attribute_services import prefetch_attributes
 from ftmcloud.domains.categories.models.models import Category
 from ftmcloud.domains.product_types.models.models import ProductType
 from ftmcloud.domains.attributes.models.models import Attribute, AttributeBooleanValue, AttributeNumberValue, AttributeDropdownValue, AttributeRangeValue, \
@@ -14,12 +15,11 @@ class ProductTypesService(Service):
 
     async def add_document(self, new_product_type: ProductType):
         product_type_exists = await self.find_one(
-            {"name": new_product_type.name, "isDeleted": {"$ne": "true"}})
+            {"name": new_product_type.name})
         if product_type_exists:
             raise FtmException('error.producttype.InvalidName')
         if new_product_type.categoryPid is not None:
-            category_exists = await Category.find_one({
-                "pid": new_product_type.categoryPid, "isDeleted": {"$ne": "true"}})
+            category_exists = await self.loader.load(Category, new_product_type.categoryPid)
             if category_exists is None:
                 raise FtmException('error.category.NotFound')
         await self.validate_attribute_values_in_product_type(attribute_values=new_product_type.attributeValues)
@@ -33,13 +33,15 @@ class ProductTypesService(Service):
         :param attribute_values:
         :return: None
         """
+        loader = self.loader
+        prefetch_attributes(loader, attribute_values)
         for i in range(0, len(attribute_values)):
             try:
                 attribute_value = AttributeValue.parse_obj(attribute_values[i])
             except:
                 raise FtmException("error.attribute.InvalidAttributeValue")
             
-            attribute = await Attribute.find_one({"pid": attribute_value.attributePid, "isDeleted": {"$ne": "true"}})
+            attribute = await loader.load(Attribute, attribute_value.attributePid)
 
             if attribute is None:
                 raise FtmException('error.attribute.NotFound', developer_message=f"Attribute not found. attributeValues[{i}].attributePid")
@@ -73,8 +75,7 @@ class ProductTypesService(Service):
             if patch_document_list[i].path == "/attributeValues":
                 await self.validate_attribute_values_in_product_type(attribute_values=patch_document_list[i].value)
             elif patch_document_list[i].path == "/categoryPid":
-                category_exists = await Category.find_one({
-                    "pid": patch_document_list[i].value,"isDeleted": {"$ne": "true"}})
+                category_exists = await self.loader.load(Category, patch_document_list[i].value)
                 if category_exists is None:
                     raise FtmException('error.category.NotFound')
-        await super(ProductTypesService, self).patch(pid=pid, patch_document_list=patch_document_list)
+        return await super(ProductTypesService, self).patch(pid=pid, patch_document_list=patch_document_list)
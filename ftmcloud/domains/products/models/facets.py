@@ -0,0 +1,99 @@
+from typing import Any
+
+from pydantic import BaseModel, StrictBool, StrictInt, StrictStr
+from pydantic.schema import Optional, List
+
+from ftmcloud.domains.products.models.models import Product
+
+
+class AttributePredicate(BaseModel):
+    """A condition on the value a product holds for an attribute. equals and anyOf compare
+    number, dropdown, text and boolean values; min and max bound numbers, and select the
+    ranges that overlap [min, max].
+
+    """
+    attributePid: str
+    equals: Optional[StrictBool | StrictInt | StrictStr]
+    anyOf: Optional[List[StrictBool | StrictInt | StrictStr]]
+    min: Optional[int]
+    max: Optional[int]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "attributePid": "attributePid",
+                "min": 4,
+                "max": 20
+            }
+        }
+
+
+class ProductFacetQuery(BaseModel):
+    """Filters the products of a product type by attribute predicates, all of which must hold,
+    and counts the values of the facet attributes among the products matched. The facets
+    default to the attributes of the product type but its text attributes.
+
+    """
+    productTypePid: str
+    filters: List[AttributePredicate] = []
+    facets: Optional[List[str]]
+    limit: Optional[int]
+    offset: int = 0
+    sort: Optional[str]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "productTypePid": "productTypePid",
+                "filters": [
+                    {"attributePid": "attributePid", "min": 4, "max": 20},
+                    {"attributePid": "attributePid 2", "anyOf": ["red", "blue"]}
+                ],
+                "facets": ["attributePid 2"],
+                "limit": 10,
+                "offset": 0,
+                "sort": "^name"
+            }
+        }
+
+
+class FacetValue(BaseModel):
+    """A value of an attribute and the number of products matched holding it. The value of
+    a range is an object of its minValue and maxValue.
+
+    """
+    value: Any
+    count: int
+
+
+class AttributeFacet(BaseModel):
+    """The most frequent values of an attribute among the products matched, up to
+    FACET_VALUE_LIMIT of them.
+
+    """
+    attributePid: str
+    name: str
+    type: str
+    values: List[FacetValue] = []
+
+
+class ProductFacets(BaseModel):
+    """A page of the products matched, their total and the facets counted over all of them.
+    """
+    total: int
+    products: List[Product] = []
+    facets: List[AttributeFacet] = []
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "total": 1,
+                "products": [],
+                "facets": [{
+                    "attributePid": "attributePid 2",
+                    "name": "Color",
+                    "type": "dropdown",
+                    "values": [{"value": "red", "count": 1}]
+                }]
+            }
+        }
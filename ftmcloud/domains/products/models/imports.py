@@ -0,0 +1,69 @@
+from pydantic import BaseModel
+from pydantic.schema import Optional, List
+
+
+class ProductImportRow(BaseModel):
+    """The fields of a product written by an import but its attribute values, which the
+    validator of its product type parses.
+
+    """
+    name: str
+    description: str
+    imgUrl: str = ""
+    productTypePid: str
+    organizationPid: str
+
+
+class ProductImportRowResult(BaseModel):
+    """The outcome of a single row of an import, reported at the number of the row in the
+    file, starting from 1 and not counting the CSV header.
+
+    """
+    row: int
+    name: Optional[str]
+    pid: Optional[str]
+    statusCode: int
+    errorCode: Optional[str]
+    developerMessage: Optional[str]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "row": 12,
+                "name": "Test Product",
+                "pid": None,
+                "statusCode": 400,
+                "errorCode": "error.attribute.InvalidAttributeNumberValue",
+                "developerMessage": "Invalid AttributeNumberValue on attributeValues[0].value"
+            }
+        }
+
+
+class ProductImportResult(BaseModel):
+    """Summarizes an import: how many rows created or updated a product and how many failed,
+    with the results of the failed rows, up to IMPORT_MAX_REPORTED_ERRORS of them.
+
+    """
+    rows: int
+    created: int
+    updated: int
+    failed: int
+    errors: List[ProductImportRowResult]
+
+    class Config:
+        schema_extra = {
+            "example": {
+                "rows": 100000,
+                "created": 99120,
+                "updated": 879,
+                "failed": 1,
+                "errors": [{
+                    "row": 12,
+                    "name": "Test Product",
+                    "pid": None,
+                    "statusCode": 400,
+                    "errorCode": "error.attribute.InvalidAttributeNumberValue",
+                    "developerMessage": "Invalid AttributeNumberValue on attributeValues[0].value"
+                }]
+            }
+        }
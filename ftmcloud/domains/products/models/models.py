@@ -1,7 +1,8 @@
 from beanie import Indexed
+from pymongo import ASCENDING
 
 from ftmcloud.domains.attributes.models.models import AttributeValue
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.models.document import BaseDocument, live_index
 
 
 class Product(BaseDocument):
@@ -17,6 +18,17 @@ class Product(BaseDocument):
 
     class Settings:
         name = "products"
+        managed_indexes = [
+            live_index([("name", ASCENDING)], name="name_1"),
+            live_index([("organizationPid", ASCENDING)], name="organizationPid_1"),
+            # Attribute predicates match the pid and the typed value of the same element with $elemMatch,
+            # which these indexes bound together; their prefix serves the queries on the pid alone.
+            *[live_index([("productTypePid", ASCENDING), ("attributeValues.attributePid", ASCENDING),
+                          (f"attributeValues.{_field}", ASCENDING)],
+                         name=f"productTypePid_1_attributeValues.attributePid_1_attributeValues.{_field}_1")
+              for _field in ("value.value", "value.numValue", "value.minValue")],
+            live_index([("attributeValues.attributePid", ASCENDING)], name="attributeValues.attributePid_1"),
+        ]
 
     class Config:
         schema_extra = {
@@ -0,0 +1,147 @@
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.cache.cache import LRUCache
+from ftmcloud.cross_cutting.cache.reference import get_reference_cache
+from ftmcloud.domains.attributes.models.models import Attribute, AttributeBooleanValue, AttributeDropdownValue, \
+    AttributeNumberValue, AttributeRangeValue, AttributeTextValue, AttributeValue
+from ftmcloud.domains.product_types.models.models import ProductType
+
+_settings = get_settings()
+
+# The model an attribute value is parsed against for each attribute type, with the error
+# raised and the developer message, formatted with the index of the value, when it does not parse.
+_value_models = {
+    "number": (AttributeNumberValue, 'error.attribute.InvalidAttributeNumberValue',
+               "Invalid AttributeNumberValue on attributeValues[{}].value"),
+    "dropdown": (AttributeDropdownValue, 'error.attribute.InvalidAttributeDropdownValue',
+                 "Invalid AttributeDropdownValue attributeValues[{}].value"),
+    "text": (AttributeTextValue, 'error.attribute.InvalidAttributeTextValue',
+             "Invalid AttributeTextValue attributeValues[{}].value"),
+    "range": (AttributeRangeValue, 'error.attribute.InvalidAttributeRangeValue',
+              "Invalid AttributeRangeValue on attributeValues[{}].value"),
+    "boolean": (AttributeBooleanValue, 'error.attribute.InvalidAttributeBooleanValue',
+                "Invalid AttributeBooleanValue on attributeValues[{}].value"),
+}
+
+
+class ProductTypeValidator:
+    """
+    The attribute value rules of a revision of a product type, compiled once: the type and
+    name of each of its attributes, the attributes required and the options of its dropdowns.
+    Validating the attribute values of a product against it does not query the database,
+    except to report an attribute that is not on the product type.
+    """
+
+    def __init__(self, product_type: ProductType, attributes: dict[str, Attribute]):
+        """
+        :param product_type: ProductType
+            the product type compiled
+        :param attributes: dict[str, Attribute]
+            the live attributes of the product type by pid
+        """
+        self.product_type_name = product_type.name
+        self.types: dict[str, str] = {}
+        self.names: dict[str, str] = {}
+        self.options: dict[str, frozenset[str]] = {}
+        self.required: dict[str, str] = {}
+        # Imports name the attributes of a product by their name rather than their pid.
+        self.pids_by_name: dict[str, str] = {}
+        for value in product_type.attributeValues:
+            attribute = attributes.get(value.attributePid)
+            if attribute is None:
+                # Attributes deleted since the product type was defined are neither valid nor required.
+                continue
+            self.types[attribute.pid] = attribute.type
+            self.names[attribute.pid] = attribute.name
+            self.pids_by_name[attribute.name] = attribute.pid
+            if isinstance(value.value, AttributeDropdownValue):
+                self.options[attribute.pid] = frozenset(value.value.options)
+            if value.isRequired:
+                self.required[attribute.pid] = attribute.name
+
+    async def validate(self, attribute_values: list, loader) -> list[AttributeValue]:
+        """ Validates the attribute values of a product against the product type.
+
+        :param attribute_values: list[AttributeValue | dict]
+            the attribute values of the product, parsed or raw
+        :param loader: DocumentLoader
+            the loader of the request, used only to report an attribute not on the product type
+        :return: list[AttributeValue] of the parsed attribute values
+        """
+        found = set()
+        parsed = []
+        for i, raw_value in enumerate(attribute_values):
+            try:
+                attribute_value = AttributeValue.parse_obj(raw_value)
+            except:
+                raise FtmException("error.attribute.InvalidAttributeValue")
+            attribute_pid = attribute_value.attributePid
+            attribute_type = self.types.get(attribute_pid)
+            if attribute_type is None:
+                await self._raise_not_on_product_type(attribute_pid, i, loader)
+            found.add(attribute_pid)
+            parsed.append(attribute_value)
+            value_model, error_code, developer_message = _value_models[attribute_type]
+            try:
+                value_model.parse_obj(attribute_value.value)
+            except:
+                raise FtmException(error_code, developer_message=developer_message.format(i))
+            if attribute_type == "dropdown" and attribute_value.value.value not in self.options.get(attribute_pid, ()):
+                raise FtmException('error.product.InvalidAttributeValue',
+                                   developer_message=f"Invalid value '{attribute_value.value.value}' not specified in "
+                                                     f"product type. attributeValues[{i}].value.value")
+        for attribute_pid, name in self.required.items():
+            if attribute_pid not in found:
+                message = f"Attribute '{name}' is required for product type '{self.product_type_name}'."
+                raise FtmException('error.product.MissingRequiredAttribute', developer_message=message,
+                                   user_message=message)
+        return parsed
+
+    @staticmethod
+    async def _raise_not_on_product_type(attribute_pid: str, i: int, loader):
+        attribute = await loader.load(Attribute, attribute_pid)
+        if attribute is None:
+            raise FtmException('error.attribute.NotFound',
+                               developer_message=f"Attribute not found. attributeValues[{i}].attributePid")
+        raise FtmException('error.product.InvalidAttributeValue',
+                           developer_message=f"Attribute '{attribute.name}' does not exist on product type. "
+                                             f"attributeValues[{i}].attributePid")
+
+
+# Compiled validators keyed by product type pid and revision; a patch of a product type bumps
+# its revision, so a validator never outlives the revision it was compiled from.
+_validators = LRUCache(max_size=_settings.PRODUCT_VALIDATOR_CACHE_SIZE, ttl=_settings.REFERENCE_CACHE_TTL)
+# Incremented whenever an attribute changes, so that a compilation racing the change is not cached.
+_generation = 0
+
+
+def _forget_validators(pid: str | None = None):
+    global _generation
+    _generation += 1
+    _validators.clear()
+
+
+# The type and name of an attribute are compiled into the validators of every product type using it.
+get_reference_cache(Attribute).subscribe(_forget_validators)
+
+
+async def get_product_type_validator(product_type: ProductType, loader) -> ProductTypeValidator:
+    """ The compiled validator of the revision of the product type, compiling it on first use.
+
+    :param product_type: ProductType
+        the product type
+    :param loader: DocumentLoader
+        the loader of the request, used to load the attributes of the product type
+    :return: ProductTypeValidator
+    """
+    key = (product_type.pid, product_type.revision or 0)
+    validator = _validators.get(key)
+    if validator is None:
+        generation = _generation
+        pids = [_value.attributePid for _value in product_type.attributeValues]
+        attributes = await loader.load_many(Attribute, pids)
+        validator = ProductTypeValidator(product_type, {_pid: _attribute for _pid, _attribute in zip(pids, attributes)
+                                                        if _attribute is not None})
+        if generation == _generation:
+            _validators.set(key, validator)
+    return validator
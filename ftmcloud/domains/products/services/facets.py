@@ -0,0 +1,141 @@
+from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.domains.attributes.models.models import Attribute
+from ftmcloud.domains.products.models.facets import AttributeFacet, AttributePredicate, FacetValue
+
+# The field of an attribute value compared by equals and anyOf, for each attribute type.
+_value_fields = {
+    "number": "value.numValue",
+    "dropdown": "value.value",
+    "text": "value.value",
+    "boolean": "value.value",
+}
+
+# The type of the values compared, for each attribute type.
+_value_types = {
+    "number": int,
+    "dropdown": str,
+    "text": str,
+    "boolean": bool,
+}
+
+
+def _invalid(attribute: Attribute, reason: str) -> FtmException:
+    return FtmException('error.query.InvalidQuery',
+                        developer_message=f"Invalid filter on {attribute.type} attribute '{attribute.name}': {reason}")
+
+
+def attribute_filter(attribute: Attribute, predicate: AttributePredicate) -> dict:
+    """ Compiles a predicate into an $elemMatch on the attribute values of products, so that
+    the pid and value are matched against the same element, and a compound index on
+    productTypePid, attributeValues.attributePid and the typed value field bounds both.
+
+    :param attribute: Attribute
+        the attribute of the predicate
+    :param predicate: AttributePredicate
+        the predicate
+    :return: dict of the filter
+    """
+    clause = {"attributePid": attribute.pid}
+    if attribute.type == "range":
+        if predicate.equals is not None or predicate.anyOf is not None:
+            raise _invalid(attribute, "ranges are filtered with min and max.")
+        if predicate.min is None and predicate.max is None:
+            raise _invalid(attribute, "the filter has no condition.")
+        if predicate.max is not None:
+            clause["value.minValue"] = {"$lte": predicate.max}
+        if predicate.min is not None:
+            clause["value.maxValue"] = {"$gte": predicate.min}
+        return {"attributeValues": {"$elemMatch": clause}}
+
+    if predicate.equals is not None and predicate.anyOf is not None:
+        raise _invalid(attribute, "equals and anyOf are exclusive.")
+    values = [predicate.equals] if predicate.equals is not None else predicate.anyOf
+    if values is not None and any(type(_value) is not _value_types[attribute.type] for _value in values):
+        raise _invalid(attribute, f"the values must be of type {_value_types[attribute.type].__name__}.")
+    condition = {}
+    if values is not None:
+        if attribute.type == "boolean":
+            # Booleans registered through the attribute value union are stored as their string.
+            values = [*values, *(str(_value) for _value in values)]
+        condition = {"$eq": values[0]} if len(values) == 1 else {"$in": values}
+    if predicate.min is not None or predicate.max is not None:
+        if attribute.type != "number":
+            raise _invalid(attribute, "min and max bound numbers and ranges.")
+        if predicate.min is not None:
+            condition["$gte"] = predicate.min
+        if predicate.max is not None:
+            condition["$lte"] = predicate.max
+    if not condition:
+        raise _invalid(attribute, "the filter has no condition.")
+    clause[_value_fields[attribute.type]] = condition
+    return {"attributeValues": {"$elemMatch": clause}}
+
+
+def facet_pipeline(attribute_pids: list[str], limit: int) -> list[dict]:
+    """ Builds the $facet sub-pipeline counting the products holding each value of the
+    attributes. Attribute values are unwound once for every attribute and grouped per product
+    first, so that a product holding a value twice counts once, and the values of each
+    attribute are kept by descending count, up to the limit.
+
+    :param attribute_pids: list[str]
+        pids of the facet attributes
+    :param limit: int
+        maximum number of values kept per attribute
+    :return: list[dict] of the stages
+    """
+    return [
+        {"$unwind": "$attributeValues"},
+        {"$match": {"attributeValues.attributePid": {"$in": attribute_pids}}},
+        # Fields missing from a value are left out of the key, so every attribute type groups by its own.
+        {"$group": {"_id": {"attributePid": "$attributeValues.attributePid",
+                            "value": "$attributeValues.value.value",
+                            "numValue": "$attributeValues.value.numValue",
+                            "minValue": "$attributeValues.value.minValue",
+                            "maxValue": "$attributeValues.value.maxValue",
+                            "product": "$_id"}}},
+        {"$group": {"_id": {"attributePid": "$_id.attributePid", "value": "$_id.value", "numValue": "$_id.numValue",
+                            "minValue": "$_id.minValue", "maxValue": "$_id.maxValue"},
+                    "count": {"$sum": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$group": {"_id": "$_id.attributePid", "values": {"$push": {"key": "$_id", "count": "$count"}}}},
+        {"$project": {"values": {"$slice": ["$values", limit]}}},
+    ]
+
+
+def _facet_value(attribute_type: str, key: dict):
+    if attribute_type == "range":
+        return {"minValue": key.get("minValue"), "maxValue": key.get("maxValue")}
+    if attribute_type == "number":
+        return key.get("numValue")
+    value = key.get("value")
+    if attribute_type == "boolean" and isinstance(value, str):
+        return value.lower() == "true"
+    return value
+
+
+def read_facets(attributes: list[Attribute], groups: list[dict]) -> list[AttributeFacet]:
+    """ Reads the output of the facet sub-pipeline into the facets of the attributes, in the
+    order of the attributes.
+
+    :param attributes: list[Attribute]
+        the facet attributes
+    :param groups: list[dict]
+        the documents output by the sub-pipeline, one per attribute held by a product matched
+    :return: list[AttributeFacet]
+    """
+    values_by_pid = {_group["_id"]: _group["values"] for _group in groups}
+    facets = []
+    for attribute in attributes:
+        counts = {}
+        for entry in values_by_pid.get(attribute.pid, []):
+            value = _facet_value(attribute.type, entry["key"])
+            # Ranges are not hashable; booleans stored both ways merge into one value.
+            key = (value["minValue"], value["maxValue"]) if attribute.type == "range" else value
+            if key in counts:
+                counts[key].count += entry["count"]
+            else:
+                counts[key] = FacetValue(value=value, count=entry["count"])
+        values = sorted(counts.values(), key=lambda _value: _value.count, reverse=True)
+        facets.append(AttributeFacet(attributePid=attribute.pid, name=attribute.name, type=attribute.type,
+                                     values=values))
+    return facets
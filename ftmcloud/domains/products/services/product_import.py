@@ -0,0 +1,137 @@
+import codecs
+import csv
+import json
+import re
+from typing import AsyncIterable, AsyncIterator
+
+from ftmcloud.core.exception.exception import FtmException
+
+# The columns holding fields of the product; every other column names an attribute of its product type.
+PRODUCT_COLUMNS = frozenset({"name", "description", "imgUrl", "productTypePid", "attributeValues"})
+# The columns of an exported product that the import does not write: the organization is the one
+# imported into, and the rest is managed by the service.
+IGNORED_COLUMNS = frozenset({"_id", "id", "pid", "organizationPid", "createdAt", "revision"})
+
+# A range written in a single cell, such as "4-20" or "-3 - 5".
+_range_pattern = re.compile(r"^\s*(-?\d+)\s*-\s*(-?\d+)\s*$")
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """ Splits a stream of UTF-8 bytes into lines, keeping their line endings, so that only the
+    line being read is held in memory. A byte order mark is skipped.
+
+    :param chunks: AsyncIterable[bytes]
+        the stream, in chunks of any size
+    :return: an async iterator of the lines
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        lines = (pending + decoder.decode(chunk)).split("\n")
+        # The last line may continue in the next chunk.
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def read_csv(chunks: AsyncIterable[bytes]) -> AsyncIterator[dict | FtmException]:
+    """ Reads the records of a CSV file with a header row, as dictionaries keyed by column.
+    A quoted value may span lines.
+
+    :param chunks: AsyncIterable[bytes]
+        the file, in chunks of any size
+    :return: an async iterator of the records, or of the error of a record that cannot be read
+    """
+    header = None
+    record = ""
+    async for line in iter_lines(chunks):
+        record += line
+        if not record.strip():
+            record = ""
+            continue
+        # Quotes within a quoted value are doubled, so a record is complete once its quotes pair up.
+        if record.count('"') % 2:
+            continue
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as E:
+            values = E
+        record = ""
+        if header is None:
+            if isinstance(values, csv.Error):
+                raise FtmException('error.import.InvalidFile', developer_message=f"Invalid header: {values}")
+            header = [_column.strip() for _column in values]
+            if "name" not in header:
+                raise FtmException('error.import.InvalidFile', developer_message="The header has no 'name' column.")
+            continue
+        if isinstance(values, csv.Error):
+            yield FtmException('error.import.InvalidRow', developer_message=str(values))
+        elif len(values) != len(header):
+            yield FtmException('error.import.InvalidRow',
+                               developer_message=f"The row has {len(values)} columns, the header {len(header)}.")
+        else:
+            yield dict(zip(header, values))
+    if record.strip():
+        yield FtmException('error.import.InvalidRow', developer_message="The file ends within a quoted value.")
+    if header is None:
+        raise FtmException('error.import.InvalidFile', developer_message="The file has no header row.")
+
+
+async def read_ndjson(chunks: AsyncIterable[bytes]) -> AsyncIterator[dict | FtmException]:
+    """ Reads the records of an NDJSON file, one JSON object per line. Blank lines are skipped.
+
+    :param chunks: AsyncIterable[bytes]
+        the file, in chunks of any size
+    :return: an async iterator of the records, or of the error of a line that cannot be read
+    """
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as E:
+            yield FtmException('error.import.InvalidRow', developer_message=f"Invalid JSON: {E}")
+            continue
+        if not isinstance(record, dict):
+            yield FtmException('error.import.InvalidRow', developer_message="The line is not a JSON object.")
+        else:
+            yield record
+
+
+readers = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+}
+
+
+def attribute_value(attribute_pid: str, attribute_type: str, raw, options) -> dict:
+    """ Maps the value of an attribute column to an attribute value. The value is left for
+    the validator of the product type to check, so that it reports the same errors as a
+    product registered through the API.
+
+    :param attribute_pid: str
+        pid of the attribute
+    :param attribute_type: str
+        type of the attribute
+    :param raw: the value of the column, a string read from CSV or any JSON value
+    :param options: the options of the attribute if it is a dropdown
+    :return: dict of the attribute value
+    """
+    if attribute_type == "number":
+        value = {"numValue": raw}
+    elif attribute_type == "range":
+        match = _range_pattern.match(raw) if isinstance(raw, str) else None
+        if match is not None:
+            value = {"minValue": int(match.group(1)), "maxValue": int(match.group(2))}
+        elif isinstance(raw, list) and len(raw) == 2:
+            value = {"minValue": raw[0], "maxValue": raw[1]}
+        else:
+            value = raw if isinstance(raw, dict) else {"minValue": raw}
+    elif attribute_type == "dropdown":
+        value = {"options": sorted(options or ()), "value": raw}
+    else:
+        value = {"value": raw}
+    return {"attributePid": attribute_pid, "value": value}
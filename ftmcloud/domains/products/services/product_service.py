@@ -1,30 +1,45 @@
+import datetime
+import uuid
+from typing import AsyncIterable, AsyncIterator
+
+from beanie.odm.utils.parsing import parse_obj
+from jsonpatch import JsonPatch, JsonPatchException
+from jsonpointer import JsonPointerException
+from pydantic.error_wrappers import ValidationError
+from pymongo import UpdateOne
+
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.models.document import live
+from ftmcloud.domains.attributes.models.models import Attribute
 from ftmcloud.cross_cutting.service.service import Service
-from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
 from ftmcloud.domains.organizations.models.models import Organization
 from ftmcloud.domains.product_types.models.models import ProductType
+from ftmcloud.domains.products.models.facets import ProductFacetQuery, ProductFacets
+from ftmcloud.domains.products.models.imports import ProductImportResult, ProductImportRow, ProductImportRowResult
 from ftmcloud.domains.products.models.models import Product
-from ftmcloud.domains.attributes.models.models import Attribute, AttributeBooleanValue, AttributeNumberValue, AttributeDropdownValue, AttributeRangeValue, AttributeTextValue, AttributeValue
+from ftmcloud.domains.users.models.models import User
+from ftmcloud.domains.products.services.attribute_validator import get_product_type_validator
+from ftmcloud.domains.products.services.facets import attribute_filter, facet_pipeline, read_facets
+from ftmcloud.domains.products.services.product_import import IGNORED_COLUMNS, PRODUCT_COLUMNS, attribute_value, \
+    readers
 
 
 class ProductService(Service):
 
+    bulk_unique_fields = {"name": 'error.product.InvalidName'}
+
     def __init__(self):
         super(ProductService, self).__init__(collection=Product)
 
-    async def add_document(self, new_product: Product):
+    async def add_validator(self, new_product: Product):
         product_type_exists = await self.find_one(
-            {"name": new_product.name, "isDeleted": {"$ne": "true"}})
+            {"name": new_product.name})
         if product_type_exists:
             raise FtmException('error.product.InvalidName')
-        organization_exists = await Organization.find_one({
-            "pid": new_product.organizationPid,
-            "isDeleted": {"$ne": "true"}
-        })
+        organization_exists = await self.loader.load(Organization, new_product.organizationPid)
         if organization_exists is None:
             raise FtmException('error.organization.NotFound')
         await self.validate_attribute_values_in_product(product=new_product)
-        return await super(ProductService, self).add_document(new_document=new_product)
 
     async def validate_attribute_values_in_product(self, product: Product):
         """Validates the product's attribute values by checking against the nture of
@@ -34,94 +49,290 @@ class ProductService(Service):
         It is important to note that since this method handles validation against the
         product type, it also handles validation of the product type.
         """
-        product_type = await ProductType.find_one({
-            "pid": product.productTypePid,
-            "isDeleted": {"$ne": "true"}
-        })
+        await self._validate_attribute_values(product.productTypePid, product.attributeValues)
+
+    async def _validate_attribute_values(self, product_type_pid: str, attribute_values: list):
+        loader = self.loader
+        product_type = await loader.load(ProductType, product_type_pid)
         if product_type is None:
             raise FtmException('error.producttype.NotFound')
-        product_type_attribute_pid_mapping = {}
-        required_attribute_to_found = {}
-        for value in product_type.attributeValues:
-            product_type_attribute_pid_mapping[value.attributePid] = value
-            if value.isRequired:
-                required_attribute_to_found[value.attributePid] = False
-        attribute_values = product.attributeValues
-        for i in range(0, len(attribute_values)):
+        validator = await get_product_type_validator(product_type, loader)
+        await validator.validate(attribute_values, loader)
+
+    async def patch_document_validator(self, document, patch_document_list, current_user: User | None = None):
+        """ Validates the product type and organization a patch points the product to, and the
+        attribute values of the patched product against its product type.
 
+        :param document: Product
+            the product
+        :param patch_document_list: list[dict]
+            list of json patch document
+        :param current_user: User | None
+            the current user
+        :return:
+        """
+        loader = self.loader
+        lookups = []
+        validate_attribute_values = False
+        for _patch_doc in patch_document_list:
+            field = _patch_doc['path'].split('/')[1]
+            if field in ("attributeValues", "productTypePid"):
+                validate_attribute_values = True
+            elif _patch_doc['path'] == "/organizationPid":
+                lookups.append((loader.load(Organization, _patch_doc.get('value')), 'error.organization.NotFound'))
+        for lookup, error_code in lookups:
+            if await lookup is None:
+                raise FtmException(error_code)
+        if validate_attribute_values:
             try:
-                attribute_value = AttributeValue.parse_obj(attribute_values[i])
-            except:
-                raise FtmException("error.attribute.InvalidAttributeValue")
-            
-            attribute = await Attribute.find_one({"pid": attribute_value.attributePid, "isDeleted": {"$ne": "true"}})
+                patched = JsonPatch(patch_document_list).apply(document.dict())
+            except (JsonPatchException, JsonPointerException):
+                # Left to the application of the patch, which reports it.
+                return
+            await self._validate_attribute_values(patched.get("productTypePid"), patched.get("attributeValues") or [])
+
+    async def facets(self, query: ProductFacetQuery, additional_filters: dict = None) -> ProductFacets:
+        """ Filters the products of a product type by attribute predicates and counts the values
+        of the facet attributes among them. The page, the total and the facets are computed by
+        a single $facet aggregation over the products matched.
 
+        :param query: ProductFacetQuery
+        :param additional_filters: Fields every product matched must match, if any.
+        :return: ProductFacets
+        """
+        product_type = await self.loader.load(ProductType, query.productTypePid)
+        if product_type is None:
+            raise FtmException('error.producttype.NotFound')
+        attribute_pids = [_value.attributePid for _value in product_type.attributeValues]
+        attributes = dict(zip(attribute_pids, await self.loader.load_many(Attribute, attribute_pids)))
+
+        filters = []
+        for predicate in query.filters:
+            attribute = attributes.get(predicate.attributePid)
             if attribute is None:
-                raise FtmException('error.attribute.NotFound',
-                                   developer_message=f"Attribute not found. attributeValues[{i}].attributePid")
-            if attribute_value.attributePid not in product_type_attribute_pid_mapping:
-                raise FtmException('error.product.InvalidAttributeValue',
-                                   developer_message=f"Attribute '{attribute.name}' does not exist on product type. attributeValues[{i}].attributePid")
-            if attribute_value.attributePid in required_attribute_to_found:
-                required_attribute_to_found[attribute_value.attributePid] = True
-            if attribute.type == "number":
-                try:
-                    AttributeNumberValue.parse_obj(attribute_value.value)
-                except:
-                    raise FtmException('error.attribute.InvaludAttributeNumberValue',
-                                       developer_message=f"Invalid AttributeNumberValue on attributeValues[{i}].value")
-            elif attribute.type == "dropdown":
-                try:
-                    AttributeDropdownValue.parse_obj(attribute_value.value)
-                except:
-                    raise FtmException('error.attribute.InvalidAttributeDropdownValue',
-                                       developer_message=f"Invalid AttributeDropdownValue attributeValues[{i}].value")
-                if attribute_value.value.value not in product_type_attribute_pid_mapping[attribute_value.attributePid].value.options:
-                    raise FtmException('error.product.InvalidAttributeValue',
-                                       developer_message=f"Invalid value '{attribute_value.value.value}' not specified in product type. attributeValues[{i}].value.value")
-            elif attribute.type == "text":
-                try:
-                    AttributeTextValue.parse_obj(attribute_value.value)
-                except:
-                    raise FtmException('error.attribute.InvalidAttributeTextValue',
-                                       developer_message=f"Invalid AttributeTextValue attributeValues[{i}].value")
-            elif attribute.type == "range":
-                try:
-                    AttributeRangeValue.parse_obj(attribute_value.value)
-                except:
-                    raise FtmException('error.attribute.InvalidAttributeRangeValue',
-                                       developer_message=f"Invalid AttributeRangeValue on attributeValues[{i}].value")
-            elif attribute.type == "boolean":
-                try:
-                    AttributeBooleanValue.parse_obj(attribute_value.value)
-                except:
-                    raise FtmException('error.attribute.InvalidAttributeBooleanValue',
-                                       developer_message=f"Invalid AttributeBooleanValue on attributeValues[{i}].value")
-        for key in required_attribute_to_found.keys():
-            if required_attribute_to_found[key] == False:
-                required_attr = await Attribute.find_one({"pid": key, "isDeleted": {"$ne": "true"}})
-                if required_attr is None:
-                    continue
+                raise FtmException('error.query.InvalidQuery',
+                                   developer_message=f"Attribute '{predicate.attributePid}' is not an attribute of "
+                                                     f"product type '{product_type.name}'.")
+            filters.append(attribute_filter(attribute, predicate))
+        if query.facets is None:
+            facet_attributes = [_attribute for _attribute in attributes.values()
+                                if _attribute is not None and _attribute.type != "text"]
+        else:
+            facet_attributes = []
+            for attribute_pid in dict.fromkeys(query.facets):
+                if attributes.get(attribute_pid) is None:
+                    raise FtmException('error.query.InvalidQuery',
+                                       developer_message=f"Attribute '{attribute_pid}' is not an attribute of "
+                                                         f"product type '{product_type.name}'.")
+                facet_attributes.append(attributes[attribute_pid])
+
+        match = live({"productTypePid": product_type.pid, **(additional_filters or {})})
+        if filters:
+            match["$and"] = filters
+        limit = self.resolve_limit(query.limit)
+        page_pipeline = [{"$sort": dict(self.sort_criteria(query.sort))}]
+        if query.offset:
+            page_pipeline.append({"$skip": query.offset})
+        page_pipeline.append({"$limit": limit})
+        facet = {"products": page_pipeline, "total": [{"$count": "count"}]}
+        if facet_attributes:
+            facet["attributes"] = facet_pipeline([_attribute.pid for _attribute in facet_attributes],
+                                                 self.settings.FACET_VALUE_LIMIT)
+        result = await self.collection.get_motor_collection().aggregate(
+            [{"$match": match}, {"$facet": facet}], allowDiskUse=True
+        ).to_list(length=1)
+        output = result[0]
+        return ProductFacets(total=output["total"][0]["count"] if output["total"] else 0,
+                             products=[parse_obj(self.collection, _document) for _document in output["products"]],
+                             facets=read_facets(facet_attributes, output.get("attributes", [])))
+
+    async def import_file(self, chunks: AsyncIterable[bytes], format: str, organization_pid: str,
+                          product_type_pid: str | None = None) -> ProductImportResult:
+        """ Imports the products of a CSV or NDJSON file and summarizes the outcome, reporting
+        the failed rows up to IMPORT_MAX_REPORTED_ERRORS.
+
+        :param chunks: AsyncIterable[bytes]
+            the file, in chunks of any size
+        :param format: str
+            csv or ndjson
+        :param organization_pid: str
+            pid of the organization the products are imported into
+        :param product_type_pid: str | None
+            pid of the product type of the rows that do not specify one
+        :return: ProductImportResult
+        """
+        result = ProductImportResult(rows=0, created=0, updated=0, failed=0, errors=[])
+        max_errors = self.settings.IMPORT_MAX_REPORTED_ERRORS
+        async for row_results in self.import_products(readers[format](chunks), organization_pid, product_type_pid):
+            result.rows += len(row_results)
+            for row_result in row_results:
+                if row_result.statusCode == 201:
+                    result.created += 1
+                elif row_result.statusCode == 200:
+                    result.updated += 1
                 else:
-                    raise FtmException('error.product.MissingRequiredAttribute',
-                                       developer_message=f"Attribute '{required_attr.name}' is required for product type '{product_type.name}'.",
-                                       user_message=f"Attribute '{required_attr.name}' is required for product type '{product_type.name}'.")
-
-    async def patch(self, pid: str, patch_document_list: list[PatchDocument]):
-        for i in range(0, len(patch_document_list)):
-            # TODO: Need to handle checking attributeValues at this level.
-            # if patch_document_list[i].path == "/attributeValues":
-            #     await self.validate_attribute_values_in_product(attribute_values=patch_document_list[i].value)
-            if patch_document_list[i].path == "/productTypePid":
-                category_exists = await ProductType.find_one({
-                    "pid": patch_document_list[i].value, "isDeleted": {"$ne": "true"}})
-                if category_exists is None:
-                    raise FtmException('error.category.NotFound')
-            elif patch_document_list[i].path == "/organizationPid":
-                organization_exists = await Organization.find_one({
-                    "pid": patch_document_list[i].value,
-                    "isDeleted": {"$ne": "true"}
-                })
-                if organization_exists is None:
-                    raise FtmException('error.organization.NotFound')
-        await super(ProductService, self).patch(pid=pid, patch_document_list=patch_document_list)
+                    result.failed += 1
+                    if len(result.errors) < max_errors:
+                        result.errors.append(row_result)
+        return result
+
+    async def import_products(self, records: AsyncIterable[dict | FtmException], organization_pid: str,
+                              product_type_pid: str | None = None) -> AsyncIterator[list[ProductImportRowResult]]:
+        """ Creates or updates products from the records of an import, matching existing products
+        of the organization by name. Records are read and written in chunks of IMPORT_CHUNK_SIZE,
+        so that memory does not grow with the file. Each chunk is validated in memory against
+        the compiled validators of its product types and existing products are read with a
+        single query, then the chunk is written with a single unordered bulk write. An existing
+        product is only updated with the fields its record gives, and its attribute values.
+
+        A column of a record that is not a field of the product names an attribute of its
+        product type; CSV cells are converted to attribute values by the type of the attribute.
+
+        :param records: AsyncIterable[dict | FtmException]
+            the records, or the error of a record that could not be read
+        :param organization_pid: str
+            pid of the organization the products are imported into
+        :param product_type_pid: str | None
+            pid of the product type of the records that do not specify one
+        :return: an async iterator of the results of the rows of each chunk, in the order of the rows
+        """
+        if await self.loader.load(Organization, organization_pid) is None:
+            raise FtmException('error.organization.NotFound')
+        chunk_size = self.settings.IMPORT_CHUNK_SIZE
+        chunk = []
+        row = 0
+        async for record in records:
+            row += 1
+            chunk.append((row, record))
+            if len(chunk) == chunk_size:
+                yield await self._import_chunk(chunk, organization_pid, product_type_pid)
+                chunk = []
+        if chunk:
+            yield await self._import_chunk(chunk, organization_pid, product_type_pid)
+
+    @staticmethod
+    def _import_failed(row: int, record, error: FtmException) -> ProductImportRowResult:
+        name = record.get("name") if isinstance(record, dict) else None
+        return ProductImportRowResult(row=row, name=name if isinstance(name, str) else None,
+                                      statusCode=error.status_code, errorCode=error.error_code,
+                                      developerMessage=error.developer_message)
+
+    @staticmethod
+    def _import_document(record: dict, organization_pid: str, product_type_pid: str, validator) -> dict:
+        """Maps a record to the fields of a product, its attribute columns to attribute values.
+        """
+        document = {"organizationPid": organization_pid, "productTypePid": product_type_pid}
+        attribute_values = record.get("attributeValues") or []
+        if not isinstance(attribute_values, list):
+            raise FtmException('error.import.InvalidRow', developer_message="attributeValues is not a list.")
+        attribute_values = list(attribute_values)
+        for column, raw in record.items():
+            if column in IGNORED_COLUMNS or column in ("productTypePid", "attributeValues"):
+                continue
+            if column in PRODUCT_COLUMNS:
+                if raw != "":
+                    document[column] = raw
+                continue
+            attribute_pid = validator.pids_by_name.get(column)
+            if attribute_pid is None:
+                raise FtmException('error.import.InvalidRow',
+                                   developer_message=f"Column '{column}' is not an attribute of product type "
+                                                     f"'{validator.product_type_name}'.")
+            if raw is None or raw == "":
+                continue
+            attribute_values.append(attribute_value(attribute_pid, validator.types[attribute_pid], raw,
+                                                    validator.options.get(attribute_pid)))
+        document["attributeValues"] = attribute_values
+        return document
+
+    async def _import_chunk(self, chunk: list[tuple[int, dict | FtmException]], organization_pid: str,
+                            default_product_type_pid: str | None) -> list[ProductImportRowResult]:
+        """Validates and writes a chunk of import records.
+
+        :return: The result of each row, in the order of the rows.
+        """
+        loader = self.loader
+        results: dict[int, ProductImportRowResult] = {}
+        product_type_pids = list({_record.get("productTypePid") or default_product_type_pid
+                                  for _row, _record in chunk if isinstance(_record, dict)
+                                  and isinstance(_record.get("productTypePid") or default_product_type_pid, str)})
+        validators = {}
+        for pid, product_type in zip(product_type_pids, await loader.load_many(ProductType, product_type_pids)):
+            if product_type is not None:
+                validators[pid] = await get_product_type_validator(product_type, loader)
+
+        products: dict[int, dict] = {}
+        # The fields of each row given by its record, which are the only ones an update sets.
+        given_fields: dict[int, set[str]] = {}
+        rows_by_name: dict[str, int] = {}
+        for row, record in chunk:
+            try:
+                if isinstance(record, FtmException):
+                    raise record
+                product_type_pid = record.get("productTypePid") or default_product_type_pid
+                if not isinstance(product_type_pid, str):
+                    raise FtmException('error.import.InvalidRow', developer_message="The row has no productTypePid.")
+                validator = validators.get(product_type_pid)
+                if validator is None:
+                    raise FtmException('error.producttype.NotFound')
+                document = self._import_document(record, organization_pid, product_type_pid, validator)
+                attribute_values = await validator.validate(document.pop("attributeValues"), loader)
+                try:
+                    product = ProductImportRow.parse_obj(document)
+                except ValidationError as E:
+                    raise FtmException('error.import.InvalidRow', developer_message=E.__str__())
+                # A chunk is written with an unordered bulk write, which cannot write a product twice.
+                if product.name in rows_by_name:
+                    raise FtmException('error.product.InvalidName',
+                                       developer_message=f"The name is already imported by row "
+                                                         f"{rows_by_name[product.name]}.")
+                rows_by_name[product.name] = row
+                products[row] = dict(product, attributeValues=[
+                    {"attributePid": _value.attributePid, "value": dict(_value.value), "isRequired": _value.isRequired}
+                    for _value in attribute_values
+                ])
+                given_fields[row] = product.__fields_set__ | {"attributeValues"}
+            except FtmException as E:
+                results[row] = self._import_failed(row, record, E)
+
+        existing = {}
+        if products:
+            cursor = self.collection.get_motor_collection().find(
+                live({"name": {"$in": list(rows_by_name)}}), {"name": 1, "pid": 1, "organizationPid": 1, "revision": 1}
+            )
+            existing = {_document["name"]: _document for _document in await cursor.to_list(length=None)}
+
+        requests, request_rows, creates, updates = [], [], set(), {}
+        now = datetime.datetime.now()
+        for row, fields in products.items():
+            name = fields["name"]
+            current = existing.get(name)
+            if current is None:
+                pid = str(uuid.uuid4())
+                inserted = {_key: _value for _key, _value in fields.items() if _key != "name"}
+                # The name filter makes the insert a no-op if the name was taken since it was read.
+                creates.add(len(requests))
+                requests.append(UpdateOne(live({"name": name}),
+                                          {"$setOnInsert": {**inserted, "pid": pid, "createdAt": now, "revision": 0}},
+                                          upsert=True))
+                results[row] = ProductImportRowResult(row=row, name=name, pid=pid, statusCode=201)
+            elif current.get("organizationPid") != organization_pid:
+                results[row] = self._import_failed(row, fields, FtmException('error.product.InvalidName'))
+                continue
+            else:
+                updates[len(requests)] = current
+                requests.append(self.conditioned_update(
+                    {"_id": current["_id"], "revision": current.get("revision") or {"$in": [None, 0]}},
+                    {"$set": {_key: _value for _key, _value in fields.items() if _key in given_fields[row]},
+                     "$inc": {"revision": 1}}
+                ))
+                results[row] = ProductImportRowResult(row=row, name=name, pid=current["pid"], statusCode=200)
+            request_rows.append(row)
+
+        if requests:
+            for position, error in (await self.write_unordered(requests, creates=frozenset(creates))).items():
+                row = request_rows[position]
+                results[row] = self._import_failed(row, products[row], error)
+            for current in updates.values():
+                loader.clear(Product, current["pid"])
+        return [results[_row] for _row, _record in chunk]
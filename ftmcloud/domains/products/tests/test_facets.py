@@ -0,0 +1,103 @@
+import unittest
+
+from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.domains.attributes.models.models import Attribute
+from ftmcloud.domains.products.models.facets import AttributePredicate
+from ftmcloud.domains.products.services.facets import attribute_filter
+from ftmcloud.domains.products.services.product_service import ProductService
+
+_attributes = {_type: Attribute.construct(pid=f"{_type}-pid", name=_type, type=_type)
+               for _type in ("number", "range", "dropdown", "text", "boolean")}
+
+
+def _clause(attribute_type: str, **predicate) -> dict:
+    attribute = _attributes[attribute_type]
+    return attribute_filter(attribute, AttributePredicate(attributePid=attribute.pid, **predicate))
+
+
+class TestAttributeFilter(unittest.TestCase):
+    """
+    Test the compilation of facet predicates into filters on the attribute values
+    """
+
+    def assertInvalid(self, attribute_type: str, **predicate):
+        with self.assertRaises(FtmException) as context:
+            _clause(attribute_type, **predicate)
+        self.assertEqual("error.query.InvalidQuery", context.exception.error_code)
+
+    def test_equals_and_any_of(self):
+        self.assertEqual({"attributeValues": {"$elemMatch": {"attributePid": "number-pid",
+                                                             "value.numValue": {"$eq": 4}}}},
+                         _clause("number", equals=4))
+        self.assertEqual({"attributeValues": {"$elemMatch": {"attributePid": "dropdown-pid",
+                                                             "value.value": {"$in": ["red", "blue"]}}}},
+                         _clause("dropdown", anyOf=["red", "blue"]))
+        self.assertEqual({"attributeValues": {"$elemMatch": {"attributePid": "text-pid", "value.value": {"$eq": "a"}}}},
+                         _clause("text", anyOf=["a"]))
+
+    def test_booleans_match_their_string(self):
+        self.assertEqual({"attributeValues": {"$elemMatch": {"attributePid": "boolean-pid",
+                                                             "value.value": {"$in": [True, "True"]}}}},
+                         _clause("boolean", equals=True))
+        self.assertEqual({"$in": [False, True, "False", "True"]},
+                         _clause("boolean", anyOf=[False, True])["attributeValues"]["$elemMatch"]["value.value"])
+
+    def test_values_must_be_of_the_attribute_type(self):
+        self.assertInvalid("number", equals="4")
+        self.assertInvalid("number", equals=True)
+        self.assertInvalid("boolean", equals=1)
+        self.assertInvalid("boolean", equals="true")
+        self.assertInvalid("dropdown", anyOf=["red", 1])
+        self.assertInvalid("text", equals=False)
+
+    def test_number_bounds(self):
+        self.assertEqual({"$gte": 2, "$lte": 8},
+                         _clause("number", min=2, max=8)["attributeValues"]["$elemMatch"]["value.numValue"])
+        self.assertEqual({"$in": [2, 3], "$gte": 2},
+                         _clause("number", anyOf=[2, 3], min=2)["attributeValues"]["$elemMatch"]["value.numValue"])
+        self.assertInvalid("dropdown", min=2)
+        self.assertInvalid("boolean", max=2)
+
+    def test_ranges_overlap(self):
+        self.assertEqual({"attributeValues": {"$elemMatch": {"attributePid": "range-pid", "value.minValue": {"$lte": 8},
+                                                             "value.maxValue": {"$gte": 2}}}},
+                         _clause("range", min=2, max=8))
+        self.assertEqual({"attributePid": "range-pid", "value.maxValue": {"$gte": 2}},
+                         _clause("range", min=2)["attributeValues"]["$elemMatch"])
+        self.assertInvalid("range", equals=2)
+        self.assertInvalid("range", anyOf=[2])
+        self.assertInvalid("range")
+
+    def test_invalid_predicates(self):
+        self.assertInvalid("text")
+        self.assertInvalid("dropdown", equals="red", anyOf=["red"])
+
+
+class TestFacetSort(unittest.TestCase):
+    """
+    Test the sort criteria of a page of facets
+    """
+
+    def setUp(self):
+        self._service = ProductService()
+
+    def test_sort_is_broken_by_id(self):
+        self.assertEqual([("_id", 1)], self._service.sort_criteria(None))
+        self.assertEqual([("_id", 1)], self._service.sort_criteria("^id"))
+        self.assertEqual([("_id", -1)], self._service.sort_criteria("-id"))
+        self.assertEqual([("name", -1), ("_id", -1)], self._service.sort_criteria("-name"))
+        self.assertEqual([("attributeValues.attributePid", 1), ("_id", 1)],
+                         self._service.sort_criteria("^attributeValues.attributePid"))
+
+    def test_sort_field_must_be_visible(self):
+        for sort in ("^unknown", "-isDeleted", "^attributeValues.unknown"):
+            with self.assertRaises(FtmException) as context:
+                self._service.sort_criteria(sort)
+            self.assertEqual("error.query.InvalidQuery", context.exception.error_code)
+        with self.assertRaises(FtmException) as context:
+            self._service.sort_criteria("name")
+        self.assertEqual("error.query.InvalidSort", context.exception.error_code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,18 @@
 import statistics
 
-from ftmcloud.core.config.config import Settings
+from ftmcloud.core.config.config import get_settings
 from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.cross_cutting.cache.reference import get_reference_cache
+from ftmcloud.cross_cutting.models.document import live
 from ftmcloud.domains.attributes.models.models import Attribute
 from ftmcloud.domains.products.models.models import Product
 from ftmcloud.domains.product_types.models.models import ProductType
 from ftmcloud.domains.reports.models.models import Hit, HitList
+from ftmcloud.domains.reports.services.scoring import ProductScorer, top_window
 
 
 class ReportService:
-    _hit_limit = Settings().MAX_QUERY_LIMIT
+    _hit_limit = get_settings().MAX_QUERY_LIMIT
 
     def __init__(self):
         """
@@ -18,6 +21,8 @@ class ReportService:
         self.products_collection = Product
         self.attributes_collection = Attribute
         self.product_types_collection = ProductType
+        self.attributes_cache = get_reference_cache(Attribute)
+        self.product_types_cache = get_reference_cache(ProductType)
 
     def _product_match_score(self, product, requirement_attr_pid_to_value, attribute_pid_mapping, attribute_pid_to_mean):
         """
@@ -68,7 +73,7 @@ class ReportService:
                                                           .attributePid]))
                         break
                     case "boolean":
-                        if requirement_attr_pid_to_value[product.attributeValues[i].attributePid].value.value == \
+                        if requirement_attr_pid_to_value[product.attributeValues[i].attributePid].value == \
                                 product.attributeValues[i].value.value:
                             product_score += 1
                         else:
@@ -77,7 +82,7 @@ class ReportService:
                         requirement_values = product.attributeValues[i].value.options
                         requirement_values = requirement_attr_pid_to_value[
                             product.attributeValues[i].attributePid
-                        ].value.options
+                        ].options
                         match = any(lambda x: x in requirement_values for x in requirement_values)
                         if match:
                             product_score += 1
@@ -86,33 +91,37 @@ class ReportService:
                         break
                     case "text":
                         # Rank based on levenshtein distance formula.
-                        if requirement_attr_pid_to_value[product.attributeValues[i].attributePid].value.value == \
+                        if requirement_attr_pid_to_value[product.attributeValues[i].attributePid].value == \
                                 product.attributeValues[i].value.value:
                             product_score += 1
                         break
         return product_score
 
-    def  _rank_product_hits(self, products, requirement_attr_pid_to_value, attribute_pid_mapping, attribute_pid_to_mean):
+    def _rank_product_hits(self, products, requirement_attr_pid_to_value, attribute_pid_mapping,
+                           attribute_pid_to_mean=None, offset=0, limit=None):
         """
         For each product in the subset, cross-references the attribute data type. Applies a variance
         matching algorithm for numbers and ranges and a string matching. Begins each product with
         a 0 score, indicating a neutral attribute value match. Each attribute match contributes
-        to an overall score of the product.
+        to an overall score of the product. The products are scored together by the ProductScorer,
+        with the scores of _product_match_score, and only the hits of the requested window are built.
 
         :param requirement_attr_pid_to_value: mapping of attribute pid to value in the products
         :param products:
         :param attribute_pid_mapping:
-        :return: a list of hits
+        :param attribute_pid_to_mean: mapping of attribute PIDs to mean, computed from the products if None
+        :param offset: the number of ranked hits skipped
+        :param limit: the max number of hits returned, all of them if None
+        :return: a hit list of the window, with the total and max score of every product
         """
-        hits = []
-        for i in range(0, len(products)):
-            product_score = self._product_match_score(products[i], requirement_attr_pid_to_value,
-                                                      attribute_pid_mapping, attribute_pid_to_mean)
-            hit = Hit(hit=products[i], score=product_score)
-            hits.append(hit)
-        hits.sort(key=lambda x: x.score, reverse=True)
+        scorer = ProductScorer(requirement_attr_pid_to_value, attribute_pid_mapping,
+                               lambda _product, _means: self._product_match_score(
+                                   _product, requirement_attr_pid_to_value, attribute_pid_mapping, _means))
+        scores = scorer.score(products, attribute_pid_to_mean)
+        window = top_window(scores, offset, len(products) if limit is None else limit)
+        hits = [Hit(hit=products[i], score=score) for i, score in zip(window.tolist(), scores[window].tolist())]
 
-        return hits
+        return HitList(hits=hits, maxScore=float(scores.max()) if len(products) > 0 else 0, total=len(products))
 
     def _generate_attr_pid_to_mean(self, products, attribute_pid_mapping):
         """
@@ -140,24 +149,27 @@ class ReportService:
 
         return attribute_pid_to_mean
 
-    async def search_products(self, searchText=None, productTypePid=None, limit=_hit_limit, requirements=None):
+    async def search_products(self, searchText=None, productTypePid=None, limit=_hit_limit, offset=0,
+                              requirements=None):
         """
         Searches products and ranks each product based upon relevance. First, identifies a subset
         of the products that match the user's search text, product type and attribute requirements. Then,
         with that subset, applies a scoring algorithm which will rank by relevance. Finally, returns the
-        list of hits sorted by the resulting score.
+        window of the hits sorted by the resulting score.
 
         :param searchText: represents the text being searched for
         :param limit: represents the max number of hits allowed
+        :param offset: represents the number of ranked hits skipped
         :param requirements: an array of attribute value requirements
-        :return: a list of hits
+        :return: a hit list
         """
         if searchText == "" or searchText is None:
             raise FtmException('error.query.InvalidQuery', developer_message="Invalid search query!")
+        if limit < 0 or offset < 0:
+            raise FtmException('error.query.InvalidQuery', developer_message="Limit and offset must be >= 0!")
         if limit > self._hit_limit:
             limit = self._hit_limit
-        product_type_exists = await self.product_types_collection.find_one({"pid": productTypePid,
-                                                                            "isDeleted": {"$ne": True}})
+        product_type_exists = await self.product_types_cache.get(productTypePid)
         if product_type_exists is None:
             raise FtmException('error.producttype.NotFound', developer_message="Invalid product type specified!",
                                user_message="Invalid product type specified!")
@@ -165,7 +177,8 @@ class ReportService:
         requirement_attr_pid_to_value = {}
         attribute_pids = list(map(lambda x: x.attributePid, product_type_exists.attributeValues))
         has_attributes = False
-        attributes = await self.attributes_collection.find({"pid": {"$in": attribute_pids}}).to_list()
+        attributes = [_attribute for _attribute in (await self.attributes_cache.get_many(attribute_pids)).values()
+                      if _attribute is not None]
         for i in range(0, len(attributes)):
             attribute_pid_mapping[attributes[i].pid] = attributes[i]
         for j in range(0, len(requirements)):
@@ -179,18 +192,11 @@ class ReportService:
         if not has_attributes:
             raise FtmException('error.query.InvalidQuery', developer_message="Requirements length must be > 0!",
                                user_message="You must specify at least one attribute in your requirement!")
-        query = {"name": {"$regex": searchText, "$options": "i"},
-                 "productTypePid": productTypePid,
-                 "isDeleted": {"$ne": True},
-                 "attributeValues.attributePid": {"$in": attribute_pids}}
+        query = live({"name": {"$regex": searchText, "$options": "i"},
+                      "productTypePid": productTypePid,
+                      "attributeValues.attributePid": {"$in": attribute_pids}})
         products = await self.products_collection.find(query).to_list()
-        attribute_pid_to_mean = self._generate_attr_pid_to_mean(products, attribute_pid_mapping)
-        hits = self._rank_product_hits(products=products,
+        return self._rank_product_hits(products=products,
                                        requirement_attr_pid_to_value=requirement_attr_pid_to_value,
                                        attribute_pid_mapping=attribute_pid_mapping,
-                                       attribute_pid_to_mean=attribute_pid_to_mean)
-        total_result_len = len(hits)
-        end_ind = limit if total_result_len > limit else total_result_len
-        results = HitList(hits=hits[:end_ind], maxScore=hits[0].score if total_result_len > 0 else 0,
-                          total=total_result_len)
-        return results
+                                       offset=offset, limit=limit)
@@ -0,0 +1,207 @@
+import numpy as np
+
+# Position of a requirement attribute a product does not hold.
+_ABSENT = np.iinfo(np.int64).max
+# Numbers beyond this magnitude are not exact as float64 and are scored by the fallback.
+_MAX_EXACT = 2 ** 53
+_missing = object()
+# The fields of a requirement value read by each attribute type.
+_requirement_fields = {
+    "range": ("minValue", "maxValue"),
+    "number": ("numValue",),
+    "dropdown": ("options",),
+    "boolean": ("value",),
+    "text": ("value",),
+}
+
+
+class ProductScorer:
+    """
+    Scores candidate products against the attribute requirements of a search with array
+    operations rather than a loop per product and attribute. The attribute values of the
+    candidates are packed into one column per requirement attribute, holding the position of
+    the value in the product and its typed fields, and each attribute type contributes with
+    a vectorized expression.
+
+    Scores are identical to those of ReportService._product_match_score, which visits the
+    attribute values of a product in order: a boolean requirement contributes and the visit
+    continues, any other requirement contributes and ends the visit. A product holding a
+    requirement attribute twice, or a value not of the type of its attribute, is scored by
+    the fallback, which is that method.
+    """
+
+    def __init__(self, requirement_attr_pid_to_value: dict, attribute_pid_mapping: dict, fallback):
+        """
+        :param requirement_attr_pid_to_value: mapping of requirement attribute PIDs to values
+        :param attribute_pid_mapping: attribute PIDs to attributes
+        :param fallback: callable scoring a single product, given the attribute PIDs to mean
+        """
+        self.pids = list(requirement_attr_pid_to_value)
+        self.values = [requirement_attr_pid_to_value[_pid] for _pid in self.pids]
+        self.types = [attribute_pid_mapping[_pid].type for _pid in self.pids]
+        self.fallback = fallback
+        # A requirement not of the type of its attribute fails the way the fallback does.
+        self.exact = all(hasattr(_value, _field) for _value, _type in zip(self.values, self.types)
+                         for _field in _requirement_fields.get(_type, ()))
+
+    def _pack(self, products: list):
+        """Packs the values of the requirement attributes of the products.
+
+        :return: The positions, the first and second field of the values, the codes of the
+            text and boolean values, the sums and counts of the number values, and the rows
+            to score with the fallback.
+        """
+        index = {_pid: _k for _k, _pid in enumerate(self.pids)}
+        types = self.types
+        codes = [{} for _ in self.pids]
+        sums, counts = [0] * len(self.pids), [0] * len(self.pids)
+        entries = []
+        fallback_rows = set()
+        for row, product in enumerate(products):
+            for j, attribute_value in enumerate(product.attributeValues):
+                k = index.get(attribute_value.attributePid)
+                if k is None:
+                    continue
+                value = attribute_value.value
+                data_type = types[k]
+                if data_type == "number":
+                    first = getattr(value, "numValue", _missing)
+                    if first is _missing:
+                        fallback_rows.add(row)
+                        continue
+                    # The mean of a number attribute is taken over every value of every candidate.
+                    sums[k] += first
+                    counts[k] += 1
+                    if not -_MAX_EXACT < first < _MAX_EXACT:
+                        fallback_rows.add(row)
+                        continue
+                    entries.append((k, row, j, first, 0))
+                elif data_type == "range":
+                    first, second = getattr(value, "minValue", _missing), getattr(value, "maxValue", _missing)
+                    if first is _missing or second is _missing or not -_MAX_EXACT < first < _MAX_EXACT \
+                            or not -_MAX_EXACT < second < _MAX_EXACT:
+                        fallback_rows.add(row)
+                        continue
+                    entries.append((k, row, j, first, second))
+                elif data_type == "dropdown":
+                    if not hasattr(value, "options"):
+                        fallback_rows.add(row)
+                        continue
+                    entries.append((k, row, j, 0, 0))
+                else:
+                    raw = getattr(value, "value", _missing)
+                    if raw is _missing:
+                        fallback_rows.add(row)
+                        continue
+                    entries.append((k, row, j, codes[k].setdefault(raw, len(codes[k])), 0))
+
+        shape = (len(self.pids), len(products))
+        position = np.full(shape, _ABSENT, dtype=np.int64)
+        first_field = np.zeros(shape, dtype=np.float64)
+        second_field = np.zeros(shape, dtype=np.float64)
+        if entries:
+            packed = np.array(entries, dtype=np.float64)
+            ks, rows = packed[:, 0].astype(np.int64), packed[:, 1].astype(np.int64)
+            position[ks, rows] = packed[:, 2]
+            first_field[ks, rows] = packed[:, 3]
+            second_field[ks, rows] = packed[:, 4]
+            # A product holding a requirement attribute twice is scored by the fallback.
+            keys = np.sort(rows * len(self.pids) + ks)
+            duplicates = keys[1:][keys[1:] == keys[:-1]] // len(self.pids)
+            fallback_rows.update(duplicates.tolist())
+        fallback_rows = sorted(fallback_rows)
+        return position, first_field, second_field, codes, sums, counts, fallback_rows
+
+    def score(self, products: list, attribute_pid_to_mean: dict | None = None) -> np.ndarray:
+        """ Scores the products.
+
+        :param products: the candidate products
+        :param attribute_pid_to_mean: mapping of number attribute PIDs to the mean of their
+            values among the candidates, computed while packing if not provided
+        :return: the float64 array of the scores, in the order of the products
+        """
+        position, first_field, second_field, codes, sums, counts, fallback_rows = self._pack(products)
+        if attribute_pid_to_mean is None:
+            # statistics.mean of ints is their exact sum divided by their count, correctly rounded.
+            attribute_pid_to_mean = {_pid: sums[_k] / counts[_k] for _k, _pid in enumerate(self.pids)
+                                     if counts[_k]}
+        if not self.exact:
+            return np.array([self.fallback(_product, attribute_pid_to_mean) for _product in products],
+                            dtype=np.float64)
+        fallback = np.zeros(len(products), dtype=bool)
+        fallback[fallback_rows] = True
+
+        # The visit of a product ends at its first requirement attribute that is not a boolean.
+        stops = [_k for _k, _type in enumerate(self.types) if _type != "boolean"]
+        stop = position[stops].min(axis=0) if stops else np.full(len(products), _ABSENT, dtype=np.int64)
+
+        boolean_scores = np.zeros(len(products), dtype=np.float64)
+        stop_scores = np.zeros(len(products), dtype=np.float64)
+        for k, data_type in enumerate(self.types):
+            present = position[k] != _ABSENT
+            if data_type == "boolean":
+                matched = first_field[k] == codes[k].get(self.values[k].value, -1)
+                boolean_scores += np.where(present & (position[k] < stop), np.where(matched, 1.0, -1.0), 0.0)
+                continue
+            reached = present & (position[k] == stop)
+            contribution = self._contribution(k, data_type, first_field[k], second_field[k], codes[k],
+                                              attribute_pid_to_mean, reached & ~fallback)
+            stop_scores += np.where(reached, contribution, 0.0)
+        scores = boolean_scores + stop_scores
+
+        for row in fallback_rows:
+            scores[row] = self.fallback(products[row], attribute_pid_to_mean)
+        return scores
+
+    def _contribution(self, k: int, data_type: str, first: np.ndarray, second: np.ndarray, codes: dict,
+                      attribute_pid_to_mean: dict, reached: np.ndarray) -> np.ndarray:
+        requirement = self.values[k]
+        if data_type == "range":
+            min_value, max_value = requirement.minValue, requirement.maxValue
+            equal = (first == min_value) & (second == max_value)
+            # A product range within the requirement contributes nothing.
+            within = (min_value < first) & (max_value > second)
+            around = (second > max_value) & (first < min_value)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                closeness = 1 / (second - max_value) + 1 / (min_value - first)
+            return np.select([equal, within, around], [1.0, 0.0, closeness], default=-1.0)
+        if data_type == "number":
+            equal = first == requirement.numValue
+            mean = attribute_pid_to_mean.get(self.pids[k])
+            if mean is None or mean == 0:
+                return np.where(equal, 1.0, 0.0)
+            if np.any(reached & ~equal & (first == mean)):
+                raise ZeroDivisionError("float division by zero")
+            with np.errstate(divide="ignore"):
+                return np.where(equal, 1.0, 1 / np.abs(first - mean))
+        if data_type == "dropdown":
+            # The options of the requirement are compared with themselves, so any requirement
+            # with options matches.
+            return np.full(first.shape, 1.0 if requirement.options else -1.0)
+        # Text
+        return np.where(first == codes.get(requirement.value, -1), 1.0, 0.0)
+
+
+def top_window(scores: np.ndarray, offset: int, limit: int) -> np.ndarray:
+    """ Selects the window of a ranking by descending score, without sorting every score. The
+    order is that of a stable sort: products of equal score keep their order as candidates.
+
+    :param scores: the scores of the candidates
+    :param offset: the rank of the first product of the window
+    :param limit: the maximum number of products of the window
+    :return: the indices of the products of the window, in ranking order
+    """
+    k = min(offset + limit, len(scores))
+    if offset >= k:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        # Every score above the k-th largest is ranked before it, and of the scores equal to it
+        # only the first candidates are.
+        threshold = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.flatnonzero(scores > threshold)
+        equal = np.flatnonzero(scores == threshold)[:k - len(above)]
+        candidates = np.sort(np.concatenate((above, equal)))
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(-scores[candidates], kind="stable")]
+    return order[offset:k]
@@ -0,0 +1,104 @@
+import random
+import unittest
+
+import numpy as np
+
+from ftmcloud.domains.attributes.models.models import Attribute, AttributeValue
+from ftmcloud.domains.products.models.models import Product
+from ftmcloud.domains.reports.services.report_service import ReportService
+from ftmcloud.domains.reports.services.scoring import ProductScorer, top_window
+
+_types = ("number", "range", "dropdown", "boolean", "text", "number", "boolean")
+_attributes = {f"attribute-{_i}": Attribute.construct(pid=f"attribute-{_i}", name=f"attribute {_i}", type=_type)
+               for _i, _type in enumerate(_types)}
+_options = ["red", "green", "blue"]
+
+
+def _value(attribute_type: str, rng: random.Random) -> dict:
+    if attribute_type == "number":
+        return {"numValue": rng.randint(-5, 5)}
+    if attribute_type == "range":
+        min_value = rng.randint(-4, 4)
+        return {"minValue": min_value, "maxValue": min_value + rng.randint(1, 6)}
+    if attribute_type == "dropdown":
+        return {"options": _options, "value": rng.choice(_options)}
+    if attribute_type == "boolean":
+        return {"value": rng.choice((True, False))}
+    return {"value": rng.choice(("a", "b", "c"))}
+
+
+def _product(rng: random.Random) -> Product:
+    pids = rng.sample(list(_attributes), rng.randint(0, len(_attributes)))
+    # Some products hold an attribute twice.
+    if pids and rng.random() < 0.1:
+        pids.insert(rng.randrange(len(pids) + 1), rng.choice(pids))
+    attribute_values = [AttributeValue(attributePid=_pid, value=_value(_attributes[_pid].type, rng)) for _pid in pids]
+    return Product.construct(name="product", attributeValues=attribute_values)
+
+
+def _requirements(rng: random.Random) -> dict:
+    pids = rng.sample(list(_attributes), rng.randint(1, len(_attributes)))
+    return {_pid: AttributeValue(attributePid=_pid, value=_value(_attributes[_pid].type, rng)).value for _pid in pids}
+
+
+class TestProductScorer(unittest.TestCase):
+    """
+    Test the ProductScorer against ReportService._product_match_score
+    """
+    def setUp(self):
+        self._report_service = ReportService()
+
+    def _legacy_scores(self, products, requirements):
+        means = self._report_service._generate_attr_pid_to_mean(products, _attributes)
+        return [self._report_service._product_match_score(_product, requirements, _attributes, means)
+                for _product in products]
+
+    def test_scores_match_product_match_score(self):
+        rng = random.Random(20231018)
+        for _ in range(300):
+            products = [_product(rng) for _ in range(rng.randint(0, 40))]
+            requirements = _requirements(rng)
+            try:
+                expected = self._legacy_scores(products, requirements)
+            except ZeroDivisionError:
+                with self.assertRaises(ZeroDivisionError):
+                    ProductScorer(requirements, _attributes, None).score(products)
+                continue
+            scorer = ProductScorer(requirements, _attributes, lambda _product, _means: self._report_service
+                                   ._product_match_score(_product, requirements, _attributes, _means))
+            self.assertEqual(expected, scorer.score(products).tolist())
+
+    def test_hits_are_ranked_by_score(self):
+        rng = random.Random(7)
+        products = [_product(rng) for _ in range(50)]
+        requirements = {"attribute-1": AttributeValue(attributePid="attribute-1",
+                                                      value={"minValue": 0, "maxValue": 3}).value,
+                        "attribute-3": AttributeValue(attributePid="attribute-3", value={"value": True}).value}
+        scores = self._legacy_scores(products, requirements)
+        ranking = sorted(range(len(products)), key=lambda _i: scores[_i], reverse=True)
+        for offset, limit in ((0, 10), (0, 50), (5, 10), (45, 10), (60, 10), (0, 0), (3, None)):
+            hit_list = self._report_service._rank_product_hits(products, requirements, _attributes,
+                                                               offset=offset, limit=limit)
+            window = ranking[offset:None if limit is None else offset + limit]
+            self.assertEqual([products[_i] for _i in window], [_hit.hit for _hit in hit_list.hits])
+            self.assertEqual([scores[_i] for _i in window], [_hit.score for _hit in hit_list.hits])
+            self.assertEqual(len(products), hit_list.total)
+            self.assertEqual(max(scores), hit_list.maxScore)
+
+    def test_top_window_matches_stable_sort(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            scores = [float(rng.randint(-3, 3)) for _ in range(rng.randint(0, 30))]
+            ranking = sorted(range(len(scores)), key=lambda _i: scores[_i], reverse=True)
+            offset, limit = rng.randint(0, 10), rng.randint(0, 10)
+            self.assertEqual(ranking[offset:offset + limit],
+                             top_window(np.array(scores), offset, limit).tolist())
+
+    def test_empty_candidates(self):
+        hit_list = self._report_service._rank_product_hits([], {"attribute-0": AttributeValue(
+            attributePid="attribute-0", value={"numValue": 1}).value}, _attributes, limit=10)
+        self.assertEqual(([], 0, 0), (hit_list.hits, hit_list.total, hit_list.maxScore))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,14 +18,14 @@ class SearchService(AbstractService):
             offset: int,
             include_totals: int,
             additional_filters: int | None,
-            fields: list[dict]
+            fields: str | None
     ):
         """
         Searches domains for the specified text.
 
         :param: index the index to search
         :param: q the query
-        :param: fields the fields to include for limiting data
+        :param: fields comma separated fields to include, or to exclude when prefixed with '-'
         :param: limit the limit to data returned in one call
         :param: offset the offset from index 0
         :param: include_totals whether to include totals in the response
@@ -33,6 +33,13 @@ class SearchService(AbstractService):
         :return: the search query results
         """
         q = self.validate_is_json(q)
+        source_includes = source_excludes = None
+        if fields is not None:
+            names, is_inclusion = self.parse_fields(fields)
+            if is_inclusion:
+                source_includes = sorted(names)
+            else:
+                source_excludes = sorted(names)
         return await self.es_connector.query_index(
             q={"match": q},
             filter_path="hits.hits,hits.total",
@@ -40,5 +47,7 @@ class SearchService(AbstractService):
             limit=limit,
             include_totals=include_totals,
             additional_filters=additional_filters,
+            source_includes=source_includes,
+            source_excludes=source_excludes,
         )
 
@@ -3,8 +3,9 @@ from typing import Optional
 from ftmcloud.cross_cutting.repository.repository import Repository
 from pydantic import EmailStr, BaseModel, SecretStr, Field
 from pydantic.schema import Literal
+from pymongo import ASCENDING, TEXT, IndexModel
 
-from ftmcloud.cross_cutting.models.document import BaseDocument
+from ftmcloud.cross_cutting.models.document import BaseDocument, PID_INDEX, live_index
 from ftmcloud.domains.organizations.models.models import Organization
 from ftmcloud.domains.privileges.models.models import Privilege
 
@@ -34,6 +35,10 @@ class User(BaseDocument):
 
     class Settings:
         name = "users"
+        managed_indexes = [
+            PID_INDEX,
+            live_index([("email", ASCENDING)], name="email_1"),
+        ]
 
     class Config:
         schema_extra = {
@@ -43,7 +48,7 @@ class User(BaseDocument):
                 "email": "user@user.com",
                 "galleryPids": ["6245c82b1b91870b51573438", "6245c82b1b91870b51573439"],
                 "privilegePid": "6245c82b1b91870b51573559",
-                "isDeleted": "false",
+                "isDeleted": False,
                 "organizationPid": "organization",
                 "pid": "userPid",
                 "addressStreet1": "1 Test Avenue",
@@ -118,6 +123,10 @@ class UserContact(BaseDocument):
 
     class Settings:
         name = "user_contacts"
+        managed_indexes = [
+            PID_INDEX,
+            IndexModel([("message", TEXT), ("subject", TEXT)], name="user_contacts_search_index"),
+        ]
 
     class Config:
         schema_extra = {
@@ -5,14 +5,15 @@ from passlib.handlers.bcrypt import bcrypt
 from password_validator import PasswordValidator
 
 from ftmcloud.cross_cutting.auth.jwt_handler import sign_jwt, construct_user_from_aad_token
+from ftmcloud.cross_cutting.auth.password_hasher import password_hasher
 from ftmcloud.core.exception.exception import FtmException
 from ftmcloud.cross_cutting.models.patchdocument import PatchDocument
+from ftmcloud.cross_cutting.models.document import live
 from ftmcloud.cross_cutting.notifications.email_client import EmailClient
 from ftmcloud.cross_cutting.service.service import Service
-from passlib.context import CryptContext
 
-from ftmcloud.cross_cutting.session.session import get_privilege_pid_for_name, default_organization_pid, \
-    get_default_organization_pid
+from ftmcloud.cross_cutting.session.session import get_privilege_pid_for_name, get_default_organization_pid, \
+    invalidate_current_user
 from ftmcloud.domains.users.models.models import User, UserSignIn, UserProfile, UserContact, UserContactsRepository
 
 user_collection = User
@@ -20,6 +21,8 @@ user_collection = User
 
 class UserService(Service):
 
+    hidden_fields = frozenset({"password"})
+
     def __init__(self):
         super(UserService, self).__init__(collection=User)
         self._user_contacts_repository = UserContactsRepository()
@@ -103,7 +106,7 @@ class UserService(Service):
         :param user: the user to validate
         :return: the user with validated fields
         """
-        user_exists = await self.collection.find_one(User.email == user.email, {"isDeleted": {"$ne": "true"}})
+        user_exists = await self.collection.find_one(live(User.email == user.email))
         if user_exists:
             raise FtmException('error.user.InvalidEmail')
         validation_criteria = PasswordValidator()
@@ -111,8 +114,7 @@ class UserService(Service):
         if not validation_criteria.validate(user.password):
             raise FtmException("error.user.PasswordStrength")
         new_user = user
-        hash_helper = CryptContext(schemes=["bcrypt"])
-        new_user.password = hash_helper.encrypt(new_user.password)
+        new_user.password = await password_hasher.hash(new_user.password)
         return new_user
 
     async def login_user_azure_ad(self, token):
@@ -149,6 +151,42 @@ class UserService(Service):
             update_user = user_exists
         return await sign_jwt(user=update_user)
 
+    async def patch(self, pid: str, patch_document_list: list, current_user: User | None = None):
+        """ Patches the user and evicts them from the current-user cache so the
+        change is visible on their next request.
+        """
+        try:
+            return await super(UserService, self).patch(pid=pid, patch_document_list=patch_document_list,
+                                                         current_user=current_user)
+        finally:
+            invalidate_current_user(pid)
+
+    async def update_password_hash(self, user: User, new_hash: str):
+        """ Replaces the hash of the user's password, unless the password changed since the user
+        was read. The revision is bumped like any other write of the user, so that a patch
+        computed before it conflicts, and the user is evicted from the current-user cache.
+
+        :param user: User
+            the user, as read with its current hash
+        :param new_hash: str
+            the hash of the same password with the current parameters
+        :return: None
+        """
+        await self.collection.get_motor_collection().update_one(
+            {"_id": user.id, "password": user.password},
+            {"$set": {"password": new_hash}, "$inc": {"revision": 1}}
+        )
+        self.invalidate_reference(user.pid)
+        invalidate_current_user(user.pid)
+
+    async def delete_document(self, pid: str, additional_filters: dict = None):
+        """ Deletes the user and evicts them from the current-user cache.
+        """
+        try:
+            return await super(UserService, self).delete_document(pid=pid, additional_filters=additional_filters)
+        finally:
+            invalidate_current_user(pid)
+
     async def patch_users_profile(self, pid, patch_document_list):
         """
         Patches the user's own profile with information provided by them.
@@ -166,8 +204,7 @@ class UserService(Service):
             ):
                 raise FtmException('error.patch.InvalidPatch')
             if document.path == '/password':
-                hash_helper = CryptContext(schemes=["bcrypt"])
-                document.value = hash_helper.encrypt(document.value)
+                document.value = await password_hasher.hash(document.value)
 
         return await self.patch(pid=pid, patch_document_list=patch_document_list)
 
@@ -177,12 +214,14 @@ class UserService(Service):
         :param credentials: represents the user's credentials
         :return: a LoginResponse containing a signed access token
         """
-        user_exists = await self.collection.find_one(User.email == credentials.email)
-        hash_helper = CryptContext(schemes=["bcrypt"])
+        user_exists = await self.collection.find_one(live(User.email == credentials.email))
         if user_exists:
-            password = hash_helper.verify(
+            password, new_hash = await password_hasher.verify_and_update(
                 credentials.password, user_exists.password)
             if password:
+                if new_hash is not None:
+                    # The stored hash predates the current bcrypt cost; upgrade it while we hold the plaintext.
+                    await self.update_password_hash(user_exists, new_hash)
                 return await sign_jwt(user_exists)
 
             raise FtmException('error.user.InvalidCredentials')
@@ -199,7 +238,7 @@ class UserService(Service):
         if self.settings.AUTH_METHOD == 'Keycloak':
             user_query = {}
         else:
-            user_query = {"pid": token['sub'], "isDeleted": {"$ne": True}}
+            user_query = live({"pid": token['sub']})
         user = await self.collection.find(user_query).aggregate([{
             "$lookup":
                 {
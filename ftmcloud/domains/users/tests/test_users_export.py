@@ -0,0 +1,84 @@
+import asyncio
+import json
+import unittest
+from unittest import mock
+
+from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.domains.users.models.models import User
+from ftmcloud.domains.users.services.user_services import UserService
+
+_users = [
+    {"_id": f"64f0c0de0000000000000{_i:03d}", "pid": f"user-{_i}", "email": f"user{_i}@email.com",
+     "firstName": "First", "lastName": "Last", "password": "$2b$12$hash", "privilegePid": "privilege",
+     "organizationPid": "organization", "isDeleted": False, "revision": 1}
+    for _i in range(5)
+]
+
+
+class _Cursor:
+
+    def __init__(self, documents, projection):
+        self._documents = iter(documents)
+        self._projection = projection
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            document = next(self._documents)
+        except StopIteration:
+            raise StopAsyncIteration
+        return {_key: _value for _key, _value in document.items() if self._projection.get(_key)}
+
+
+class _Collection:
+
+    def __init__(self):
+        self.projections = []
+        self.sorts = []
+
+    def find(self, query, projection=None, sort=None, batch_size=None):
+        self.projections.append(projection)
+        self.sorts.append(sort)
+        return _Cursor(_users, projection or {_key: 1 for _key in _users[0]})
+
+
+class TestUsersExport(unittest.TestCase):
+    """
+    Test that the NDJSON export of users leaves out what a list response leaves out
+    """
+    def setUp(self):
+        self._service = UserService()
+        self._collection = _Collection()
+
+    def _export(self, **kwargs):
+        async def read():
+            return [_chunk async for _chunk in self._service.export(**kwargs)]
+        with mock.patch.object(User, "get_motor_collection", return_value=self._collection):
+            chunks = asyncio.run(read())
+        return [json.loads(_line) for _line in "".join(chunks).splitlines()]
+
+    def test_export_omits_password(self):
+        lines = self._export()
+        self.assertEqual(len(_users), len(lines))
+        self.assertEqual(["user-0", "user-1", "user-2", "user-3", "user-4"], [_line["pid"] for _line in lines])
+        self.assertTrue(all("password" not in _line for _line in lines))
+        self.assertNotIn("password", self._collection.projections[0])
+
+    def test_export_of_projection_omits_password(self):
+        lines = self._export(projection_model=self._service.get_projection_model_from_fields("-email"))
+        self.assertTrue(all("password" not in _line and "email" not in _line for _line in lines))
+
+    def test_export_sort_on_hidden_field(self):
+        with self.assertRaises(FtmException) as context:
+            self._export(sort="^password")
+        self.assertEqual("error.query.InvalidQuery", context.exception.error_code)
+
+    def test_export_sort_is_broken_by_id(self):
+        self._export(sort="-email")
+        self.assertEqual([("email", -1), ("_id", -1)], self._collection.sorts[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from ftmcloud.core.exception.exception import FtmException
+from ftmcloud.domains.users.services.user_services import UserService
+
+
+class _User:
+    id = "64f0c0de0000000000000001"
+    email = "user@email.com"
+    password = "$2b$12$hash"
+
+
+class TestUsersPages(unittest.TestCase):
+    """
+    Test that pages of users cannot be sorted by a hidden field
+    """
+    def setUp(self):
+        self._service = UserService()
+
+    def assertInvalid(self, function, **kwargs):
+        with self.assertRaises(FtmException) as context:
+            function(**kwargs)
+        self.assertEqual("error.query.InvalidQuery", context.exception.error_code)
+
+    def test_cursor_sort_on_hidden_field(self):
+        for sort in ("^password", "-password"):
+            self.assertInvalid(self._service._page_query, cursor="", sort=sort)
+            self.assertInvalid(self._service.next_cursor, documents=[_User()], sort=sort, limit=1)
+
+    def test_cursor_sort_on_unknown_field(self):
+        self.assertInvalid(self._service._page_query, cursor="", sort="^unknown")
+
+    def test_cursor_sort_on_visible_field(self):
+        _, _, sort_criteria, _, _ = self._service._page_query(cursor="", sort="-email")
+        self.assertEqual([("email", -1), ("_id", -1)], sort_criteria)
+        self.assertIsNotNone(self._service.next_cursor([_User()], sort="^email", limit=1))
+
+    def test_offset_sort_on_hidden_field(self):
+        self.assertInvalid(self._service._page_query, offset=10, sort="^password")
+
+    def test_offset_sort_is_broken_by_id(self):
+        _, _, sort_criteria, offset, _ = self._service._page_query(offset=10, sort="^email")
+        self.assertEqual(([("email", 1), ("_id", 1)], 10), (sort_criteria, offset))
+        self.assertEqual([("_id", 1)], self._service._page_query(offset=10)[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,9 @@
+import asyncio
 import unittest
+from unittest import mock
 
-from ftmcloud.domains.users.models.models import UserContact
+from ftmcloud.cross_cutting.session.session import current_user_cache
+from ftmcloud.domains.users.models.models import User, UserContact
 from ftmcloud.domains.users.services.user_services import UserService
 
 
@@ -20,3 +23,14 @@ class TestUsersServices(unittest.TestCase):
         self._service.submit_user_contact(
             contact_form=contact
         )
+
+    def test_update_password_hash(self):
+        user = User.construct(id="64f0c0de0000000000000001", pid="user-pid", password="$2b$10$old")
+        current_user_cache.set(user.pid, user)
+        collection = mock.Mock(update_one=mock.AsyncMock())
+        with mock.patch.object(User, "get_motor_collection", return_value=collection):
+            asyncio.run(self._service.update_password_hash(user, "$2b$12$new"))
+        collection.update_one.assert_awaited_once_with(
+            {"_id": user.id, "password": "$2b$10$old"}, {"$set": {"password": "$2b$12$new"}, "$inc": {"revision": 1}}
+        )
+        self.assertIsNone(current_user_cache.get(user.pid))
@@ -0,0 +1,79 @@
+"""Benchmark of the per-request overhead of the authentication dependencies.
+
+The legacy path decoded and verified the bearer token three times per request
+(verify_jwt, init_controller and get_user_token). The current path verifies it once,
+shares the claims through the request state and reuses recently verified tokens.
+
+    python -m scripts.benchmarks.bench_auth
+"""
+import asyncio
+import time
+
+import jwt
+from starlette.requests import Request
+
+from ftmcloud.cross_cutting.auth import jwt_handler
+from ftmcloud.cross_cutting.auth.jwt_bearer import token_listener, get_user_token
+from ftmcloud.cross_cutting.auth.jwt_handler import decode_jwt
+
+REQUESTS = 20000
+PERMISSIONS = [f"{method}:{resource}" for method in ("GET", "POST", "PATCH", "DELETE")
+               for resource in ("products", "users", "ftm_tasks", "attributes", "categories", "industries",
+                                "organizations", "privileges", "product_types", "reports", "search")]
+
+
+def _token():
+    now = int(time.time())
+    payload = {
+        'iss': 'com.analytics-software.api',
+        'sub': 'bench-user',
+        'exp': now + 7200,
+        'iat': now,
+        'permissions': PERMISSIONS,
+        'privilegeName': 'developer',
+        'orgPid': 'bench-org'
+    }
+    return jwt.encode(payload, jwt_handler.secret_key, algorithm="HS256")
+
+
+def _request(token):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "scheme": "http",
+        "server": ("localhost", 8080),
+        "path": "/api/v0/products/",
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+    })
+
+
+async def _legacy(token):
+    request = _request(token)
+    decode_jwt(token)
+    claims = decode_jwt(token)
+    route_path = request.method + ':' + str(request.url).replace(f'{str(request.base_url)}api/v0/', '').split('/')[0]
+    assert route_path in claims['permissions']
+    return decode_jwt(token)
+
+
+async def _current(token):
+    request = _request(token)
+    credentials = await token_listener(request)
+    return await get_user_token(request, credentials)
+
+
+async def main():
+    token = _token()
+    for label, fn in (("legacy (3 decodes)", _legacy), ("verified-claims context", _current)):
+        started = time.perf_counter()
+        for _ in range(REQUESTS):
+            await fn(token)
+        elapsed = time.perf_counter() - started
+        print(f"{label:<26} {elapsed * 1e6 / REQUESTS:8.1f} us/request")
+    print(f"token cache: {jwt_handler.verified_token_cache.stats()}")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""Benchmark of reference validation latency as reference lists grow.
+
+The legacy path awaited one find_one per pid, so latency grew with the number of
+references. validate_many_exist issues a single $in query. Each database operation is
+served by an in-process collection that waits ROUND_TRIP seconds, standing in for the
+network round trip to Mongo, so the numbers isolate the cost of round trips.
+
+    python -m scripts.benchmarks.bench_batched_validation
+"""
+import asyncio
+import time
+
+from ftmcloud.cross_cutting.service.service import Service
+
+ROUND_TRIP = 0.002
+SIZES = (1, 10, 50, 200)
+REPEAT = 5
+
+
+class _Collection:
+    """Serves the queries the validation paths issue from an in-memory set of pids."""
+
+    __name__ = "Industry"
+
+    def __init__(self, pids):
+        self._pids = set(pids)
+        self.round_trips = 0
+
+    async def _round_trip(self):
+        self.round_trips += 1
+        await asyncio.sleep(ROUND_TRIP)
+
+    async def find_one(self, query, projection_model=None):
+        await self._round_trip()
+        return {"pid": query["pid"]} if query["pid"] in self._pids else None
+
+    def get_motor_collection(self):
+        return self
+
+    async def distinct(self, key, query):
+        await self._round_trip()
+        return [_pid for _pid in query["pid"]["$in"] if _pid in self._pids]
+
+
+async def _legacy(service, pids):
+    for pid in pids:
+        await service.validate_exists(pid=pid)
+
+
+async def _batched(service, pids):
+    await service.validate_many_exist(pids=pids)
+
+
+async def main():
+    for size in SIZES:
+        pids = [f"industry-{i}" for i in range(size)]
+        results = []
+        for label, fn in (("per-pid find_one", _legacy), ("single $in", _batched)):
+            collection = _Collection(pids)
+            service = Service(collection=collection)
+            started = time.perf_counter()
+            for _ in range(REPEAT):
+                await fn(service, pids)
+            elapsed = (time.perf_counter() - started) / REPEAT
+            results.append(f"{label} {elapsed * 1e3:7.1f} ms ({collection.round_trips // REPEAT} round trips)")
+        print(f"{size:>4} pids | " + " | ".join(results))
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,47 @@
+"""Micro-benchmark of FtmException raise-and-handle throughput.
+
+Compares the legacy behaviour, which parsed errors.yaml on every raise, with the
+compiled error registry.
+
+    python -m scripts.benchmarks.bench_exceptions
+"""
+import os
+import timeit
+
+import yaml
+
+from ftmcloud.core.exception import exception as ftm_exception
+from ftmcloud.core.exception.exception import FtmException, handle_default_exceptions
+
+ERROR_CODES = ['error.product.NotFound', 'error.user.InvalidToken', 'error.user.InvalidCredentials']
+ITERATIONS = {"legacy": 50, "compiled": 5000}
+
+
+def _legacy_lookup(error_code):
+    path = os.path.join(os.path.dirname(os.path.abspath(ftm_exception.__file__)), 'errors.yaml')
+    with open(path, "r") as stream:
+        return yaml.safe_load(stream=stream)['errors'][error_code]
+
+
+def _raise_and_handle(error_code):
+    try:
+        raise FtmException(error_code)
+    except FtmException as E:
+        handle_default_exceptions(None, E)
+
+
+def _legacy_raise_and_handle(error_code):
+    _legacy_lookup(error_code)
+    _raise_and_handle(error_code)
+
+
+def main():
+    for label, fn, iterations in (("legacy (yaml per raise)", _legacy_raise_and_handle, ITERATIONS["legacy"]),
+                                  ("compiled registry", _raise_and_handle, ITERATIONS["compiled"])):
+        elapsed = timeit.timeit(lambda: [fn(code) for code in ERROR_CODES], number=iterations)
+        raises = iterations * len(ERROR_CODES)
+        print(f"{label:<26} {raises / elapsed:>12.0f} raises/s  ({elapsed * 1e6 / raises:.1f} us/raise)")
+
+
+if __name__ == '__main__':
+    main()
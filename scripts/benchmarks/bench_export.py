@@ -0,0 +1,125 @@
+"""Memory benchmark of exporting a collection as NDJSON versus materializing it.
+
+The list endpoints materialize every document with to_list() and encode the whole list
+before responding, so their peak memory grows with the result. Service.export encodes one
+cursor batch at a time. Synthetic products are served by an in-process cursor, and each
+run happens in a fresh process whose peak resident memory is compared with its resident
+memory before the run, while the output is drained and discarded. Linux reports peaks in KiB.
+
+Product documents cannot be constructed without an initialized database, so both paths
+parse into the projection model of every product field but the revision.
+
+    python -m scripts.benchmarks.bench_export
+"""
+import asyncio
+import datetime
+import time
+import multiprocessing
+import resource
+
+from beanie.odm.utils.projection import get_projection
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from ftmcloud.cross_cutting.service.service import Service
+from ftmcloud.domains.products.models.models import Product
+
+EXPORT_SIZES = (10_000, 100_000, 1_000_000)
+# Materializing a million products needs several gigabytes, so the baseline stops earlier.
+MATERIALIZED_SIZES = (10_000, 100_000)
+
+
+def _product(i):
+    return {
+        "_id": ObjectId(),
+        "pid": f"product-{i}",
+        "name": f"Product {i}",
+        "description": "A synthetic product exported by the benchmark.",
+        "imgUrl": f"https://example.com/products/{i}.png",
+        "productTypePid": f"product-type-{i % 50}",
+        "organizationPid": f"organization-{i % 20}",
+        "attributeValues": [
+            {"attributePid": f"attribute-{_a}", "value": {"value": f"value {i % 7}"}} for _a in range(3)
+        ],
+        "createdAt": datetime.datetime(2023, 1, 1) + datetime.timedelta(seconds=i),
+        "isDeleted": False,
+        "revision": 0,
+    }
+
+
+class _Cursor:
+    """Yields synthetic products lazily, like a Motor cursor fetching batch after batch."""
+
+    def __init__(self, size, projection=None):
+        self._size = size
+        self._projection = projection
+
+    async def __aiter__(self):
+        for i in range(self._size):
+            document = _product(i)
+            if self._projection is not None:
+                document = {_key: _value for _key, _value in document.items() if _key in self._projection}
+            yield document
+
+    async def to_list(self, length=None):
+        return [_document async for _document in self]
+
+
+class _Collection:
+    __name__ = Product.__name__
+    __fields__ = Product.__fields__
+    __config__ = Product.__config__
+
+    def __init__(self, size):
+        self._size = size
+
+    def get_motor_collection(self):
+        return self
+
+    def find(self, query, projection=None, sort=None, batch_size=None):
+        return _Cursor(self._size, projection)
+
+
+async def _materialized(service, projection_model, size):
+    raw = await service.collection.find({}, projection=get_projection(projection_model)).to_list()
+    documents = [projection_model.parse_obj(_document) for _document in raw]
+    return len(str(jsonable_encoder(documents)))
+
+
+async def _exported(service, projection_model, size):
+    written = 0
+    async for chunk in service.export(projection_model=projection_model):
+        written += len(chunk)
+    return written
+
+
+def _run(label, size, results):
+    fn = _materialized if label == "to_list" else _exported
+    service = Service(collection=_Collection(size))
+    projection_model = service.get_projection_model_from_fields("-revision")
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    asyncio.run(fn(service, projection_model, size))
+    elapsed = time.perf_counter() - started
+    results.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before, elapsed))
+
+
+def _measure(label, size):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run, args=(label, size, results))
+    process.start()
+    growth, elapsed = results.get()
+    process.join()
+    print(f"{size:>9} products | {label:<8} peak memory +{growth / 2 ** 10:8.1f} MiB in {elapsed:6.1f}s")
+
+
+def main():
+    for size in MATERIALIZED_SIZES:
+        _measure("to_list", size)
+    for size in EXPORT_SIZES:
+        _measure("export", size)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""Latency benchmark of POST /products/facets against a MongoDB deployment.
+
+Seeds a scratch database with synthetic products of one product type, holding a number, a
+dropdown, a range and a boolean attribute, creates the indexes declared on the models, then
+times ProductService.facets for representative queries: every product of the type, a dropdown
+predicate, a number range, and the three combined. Each query is run repeatedly and its
+median and 95th percentile latency are reported, with the index its predicates used
+according to explain. The scratch database is dropped at the end unless --keep is given, so
+seeding a million products is only paid once when iterating with --keep --skip-seed.
+
+The latency depends on the deployment more than on the application: run it against a
+deployment sized like production, for instance with --products 1000000.
+
+    python -m scripts.benchmarks.bench_facets --products 1000000
+    python -m scripts.benchmarks.bench_facets --products 1000000 --keep --skip-seed
+"""
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+import uuid
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.cross_cutting.db.indexes import reconcile_indexes
+from ftmcloud.domains.attributes.models.models import Attribute
+from ftmcloud.domains.organizations.models.models import Organization
+from ftmcloud.domains.product_types.models.models import ProductType
+from ftmcloud.domains.products.models.facets import AttributePredicate, ProductFacetQuery
+from ftmcloud.domains.products.models.models import Product
+from ftmcloud.domains.products.services.facets import attribute_filter
+from ftmcloud.domains.products.services.product_service import ProductService
+
+SEED_BATCH_SIZE = 10_000
+RUNS = 20
+COLORS = ("red", "green", "blue", "black", "white", "silver", "gold", "orange")
+ATTRIBUTES = {
+    "bench-weight": ("weight", "number"),
+    "bench-color": ("color", "dropdown"),
+    "bench-size": ("size", "range"),
+    "bench-eco": ("eco", "boolean"),
+}
+PRODUCT_TYPE_PID = "bench-product-type"
+
+
+def _product(i: int, now: datetime.datetime) -> dict:
+    return {
+        "pid": str(uuid.uuid4()),
+        "name": f"Product {i}",
+        "description": "A synthetic product seeded by the benchmark.",
+        "imgUrl": "",
+        "productTypePid": PRODUCT_TYPE_PID,
+        "organizationPid": "bench-organization",
+        "attributeValues": [
+            {"attributePid": "bench-weight", "value": {"numValue": i % 1000}, "isRequired": None},
+            {"attributePid": "bench-color", "value": {"options": list(COLORS), "value": COLORS[i % len(COLORS)]},
+             "isRequired": None},
+            {"attributePid": "bench-size", "value": {"minValue": i % 50, "maxValue": i % 50 + 10}, "isRequired": None},
+            {"attributePid": "bench-eco", "value": {"value": i % 3 == 0}, "isRequired": None},
+        ],
+        "createdAt": now,
+        "isDeleted": False,
+        "revision": 0,
+    }
+
+
+async def _seed(database, products: int):
+    now = datetime.datetime.now()
+    await database.attributes.insert_many([
+        {"pid": _pid, "name": _name, "description": "", "type": _type, "createdAt": now, "isDeleted": False,
+         "revision": 0} for _pid, (_name, _type) in ATTRIBUTES.items()
+    ])
+    await database.product_types.insert_one({
+        "pid": PRODUCT_TYPE_PID, "name": "Benchmark", "description": "", "createdAt": now, "isDeleted": False,
+        "revision": 0,
+        "attributeValues": [{"attributePid": _pid, "value": {"value": ""}, "isRequired": None} for _pid in ATTRIBUTES]
+    })
+    for start in range(0, products, SEED_BATCH_SIZE):
+        await database.products.insert_many([_product(_i, now) for _i in range(start, min(start + SEED_BATCH_SIZE,
+                                                                                           products))])
+        print(f"seeded {min(start + SEED_BATCH_SIZE, products)} products", end="\r")
+    print()
+
+
+QUERIES = {
+    "all products": [],
+    "dropdown": [AttributePredicate(attributePid="bench-color", anyOf=["red", "blue"])],
+    "number range": [AttributePredicate(attributePid="bench-weight", min=100, max=199)],
+    "combined": [AttributePredicate(attributePid="bench-color", equals="red"),
+                 AttributePredicate(attributePid="bench-weight", min=100, max=199),
+                 AttributePredicate(attributePid="bench-eco", equals=True)],
+}
+
+
+async def _plan(database, filters) -> str:
+    match = {"productTypePid": PRODUCT_TYPE_PID, "isDeleted": False}
+    if filters:
+        attributes = {_pid: Attribute.construct(pid=_pid, name=_name, type=_type)
+                      for _pid, (_name, _type) in ATTRIBUTES.items()}
+        match["$and"] = [attribute_filter(attributes[_filter.attributePid], _filter) for _filter in filters]
+    explain = await database.command("explain", {"find": "products", "filter": match}, verbosity="queryPlanner")
+
+    def indexes(plan):
+        if plan.get("indexName"):
+            yield plan["indexName"]
+        for key in ("inputStage", "queryPlan"):
+            if isinstance(plan.get(key), dict):
+                yield from indexes(plan[key])
+        for child in plan.get("inputStages", []):
+            yield from indexes(child)
+
+    return ", ".join(indexes(explain["queryPlanner"]["winningPlan"])) or "COLLSCAN"
+
+
+async def main(products: int, database_name: str, keep: bool, skip_seed: bool):
+    client = AsyncIOMotorClient(get_settings().DATABASE_URL)
+    database = client[database_name]
+    try:
+        models = [Product, ProductType, Attribute, Organization]
+        if not skip_seed:
+            await client.drop_database(database_name)
+            await _seed(database, products)
+        await reconcile_indexes(database, models)
+        await init_beanie(database=database, document_models=models)
+        service = ProductService()
+        for label, filters in QUERIES.items():
+            query = ProductFacetQuery(productTypePid=PRODUCT_TYPE_PID, filters=filters, limit=10)
+            latencies = []
+            for _ in range(RUNS):
+                started = time.perf_counter()
+                result = await service.facets(query)
+                latencies.append(time.perf_counter() - started)
+            latencies.sort()
+            print(f"{label:<14} {result.total:>9} matched | median {statistics.median(latencies) * 1e3:8.1f} ms, "
+                  f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1e3:8.1f} ms | "
+                  f"{await _plan(database, filters)}")
+    finally:
+        if not keep:
+            await client.drop_database(database_name)
+        client.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=100_000, help="number of products seeded")
+    parser.add_argument("--database", default="ftm_bench_facets", help="scratch database, dropped unless --keep")
+    parser.add_argument("--keep", action="store_true", help="keep the scratch database")
+    parser.add_argument("--skip-seed", action="store_true", help="reuse the products kept by a previous run")
+    args = parser.parse_args()
+    asyncio.run(main(args.products, args.database, args.keep, args.skip_seed))
@@ -0,0 +1,160 @@
+"""Throughput and memory benchmark of importing products from CSV and NDJSON files.
+
+Registering a catalog through POST /products/ queries the database for every product: the
+uniqueness of its name, its organization, and its attributes. The import reads the file as
+it arrives and validates it in chunks of IMPORT_CHUNK_SIZE rows against the compiled
+validator of the product type, so that a chunk costs one query for the existing products
+and one bulk write, whatever the number of attributes.
+
+Synthetic files are generated lazily and served in 64 KiB chunks, like a request body. The
+database is replaced by an in-process collection that answers the query of existing
+products, a tenth of which exist already, and acknowledges the bulk writes, so the figures
+cover reading, mapping, validating and building the writes, but not the round trips, which
+are counted instead. Each run happens in a fresh process whose peak resident memory is
+compared with its resident memory before the run. Linux reports peaks in KiB.
+
+    python -m scripts.benchmarks.bench_import
+"""
+import asyncio
+import json
+import multiprocessing
+import resource
+import time
+
+from pymongo.results import BulkWriteResult
+
+from ftmcloud.domains.attributes.models.models import Attribute, AttributeValue
+from ftmcloud.domains.organizations.models.models import Organization
+from ftmcloud.domains.product_types.models.models import ProductType
+from ftmcloud.domains.products.services.product_service import ProductService
+
+SIZES = (10_000, 100_000)
+READ_SIZE = 2 ** 16
+
+_attributes = {
+    "attribute-weight": Attribute.construct(pid="attribute-weight", name="weight", description="", type="number"),
+    "attribute-color": Attribute.construct(pid="attribute-color", name="color", description="", type="dropdown"),
+    "attribute-size": Attribute.construct(pid="attribute-size", name="size", description="", type="range"),
+    "attribute-notes": Attribute.construct(pid="attribute-notes", name="notes", description="", type="text"),
+}
+_product_type = ProductType.construct(pid="product-type", name="Synthetic", revision=0, attributeValues=[
+    AttributeValue(attributePid="attribute-weight", value={"numValue": 1}, isRequired=True),
+    AttributeValue(attributePid="attribute-color", value={"options": ["red", "green", "blue"], "value": None},
+                   isRequired=True),
+    AttributeValue(attributePid="attribute-size", value={"minValue": 1, "maxValue": 2}),
+    AttributeValue(attributePid="attribute-notes", value={"value": ""}),
+])
+_documents = {Attribute: _attributes, ProductType: {"product-type": _product_type},
+              Organization: {"organization": object()}}
+_colors = ("red", "green", "blue")
+
+
+def _csv(size):
+    yield "name,description,imgUrl,weight,color,size,notes\n"
+    for i in range(size):
+        yield f"Product {i},A synthetic product,https://example.com/{i}.png,{i % 90},{_colors[i % 3]}," \
+              f"{i % 10}-{i % 10 + 5},\"notes, for {i}\"\n"
+
+
+def _ndjson(size):
+    for i in range(size):
+        yield json.dumps({"name": f"Product {i}", "description": "A synthetic product",
+                          "imgUrl": f"https://example.com/{i}.png", "weight": i % 90, "color": _colors[i % 3],
+                          "size": [i % 10, i % 10 + 5], "notes": f"notes, for {i}"}) + "\n"
+
+
+async def _chunks(lines):
+    buffer = []
+    buffered = 0
+    for line in lines:
+        buffer.append(line.encode())
+        buffered += len(buffer[-1])
+        if buffered >= READ_SIZE:
+            yield b"".join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+class _Loader:
+    def load(self, model, pid):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(_documents[model].get(pid))
+        return future
+
+    async def load_many(self, model, pids):
+        return [_documents[model].get(_pid) for _pid in pids]
+
+    def clear(self, model, pid):
+        pass
+
+
+class _Cursor:
+    def __init__(self, documents):
+        self._documents = documents
+
+    async def to_list(self, length=None):
+        return self._documents
+
+
+class _Collection:
+    """Answers the query of existing products and acknowledges bulk writes, counting both."""
+
+    def __init__(self):
+        self.queries = 0
+        self.writes = 0
+
+    def get_motor_collection(self):
+        return self
+
+    def find(self, query, projection=None):
+        self.queries += 1
+        return _Cursor([{"_id": _name, "name": _name, "pid": _name, "organizationPid": "organization", "revision": 1}
+                        for _name in query["name"]["$in"] if _name.endswith("0")])
+
+    async def bulk_write(self, requests, ordered=True):
+        self.writes += 1
+        # Creations upsert by name; updates of existing products are conditioned on their revision.
+        upserted = [{"index": _i, "_id": _i} for _i, _request in enumerate(requests) if _request._upsert]
+        return BulkWriteResult({"upserted": upserted, "nMatched": len(requests) - len(upserted)}, True)
+
+
+class _ImportService(ProductService):
+    loader = _Loader()
+
+    def __init__(self):
+        super(_ImportService, self).__init__()
+        self.collection = _Collection()
+
+
+def _run(format, size, results):
+    service = _ImportService()
+    lines = _csv(size) if format == "csv" else _ndjson(size)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    result = asyncio.run(service.import_file(_chunks(lines), format=format, organization_pid="organization",
+                                             product_type_pid="product-type"))
+    elapsed = time.perf_counter() - started
+    results.put((resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before, elapsed, result.rows,
+                 result.failed, service.collection.queries, service.collection.writes))
+
+
+def _measure(format, size):
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_run, args=(format, size, results))
+    process.start()
+    growth, elapsed, rows, failed, queries, writes = results.get()
+    process.join()
+    print(f"{size:>8} rows | {format:<6} {rows / elapsed:9.0f} rows/s, {elapsed:6.2f}s, peak memory "
+          f"+{growth / 2 ** 10:6.1f} MiB, {failed} failed, {queries} queries, {writes} bulk writes")
+
+
+def main():
+    for format in ("csv", "ndjson"):
+        for size in SIZES:
+            _measure(format, size)
+
+
+if __name__ == '__main__':
+    main()
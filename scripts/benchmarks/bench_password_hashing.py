@@ -0,0 +1,59 @@
+"""Load benchmark showing that a login storm no longer stalls the event loop.
+
+A ticker coroutine stands in for unrelated endpoints and records how late each of its
+wake-ups is while a burst of password verifications runs, first inline on the loop as
+the login path used to, then through the shared PasswordHasher pool.
+
+    python -m scripts.benchmarks.bench_password_hashing
+"""
+import asyncio
+import statistics
+import time
+
+from passlib.context import CryptContext
+
+from ftmcloud.cross_cutting.auth.password_hasher import PasswordHasher
+
+LOGINS = 32
+ROUNDS = 10
+TICK = 0.005
+
+
+async def _ticker(stop: asyncio.Event, lags: list):
+    while not stop.is_set():
+        expected = time.perf_counter() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(time.perf_counter() - expected)
+
+
+async def _measure(label, login):
+    stop = asyncio.Event()
+    lags = []
+    ticker = asyncio.create_task(_ticker(stop, lags))
+    await asyncio.sleep(TICK)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    print(f"{label:<16} {LOGINS} logins in {elapsed:6.2f}s | loop lag p50 {statistics.median(lags) * 1e3:7.1f} ms, "
+          f"max {max(lags) * 1e3:7.1f} ms")
+
+
+async def main():
+    context = CryptContext(schemes=["bcrypt"], bcrypt__default_rounds=ROUNDS)
+    hashed = context.hash("F3e587!#xsz$$%")
+    hasher = PasswordHasher(rounds=ROUNDS, max_workers=4, max_concurrency=16)
+
+    async def inline_login():
+        context.verify("F3e587!#xsz$$%", hashed)
+
+    async def pooled_login():
+        await hasher.verify("F3e587!#xsz$$%", hashed)
+
+    await _measure("inline bcrypt", inline_login)
+    await _measure("hasher pool", pooled_login)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
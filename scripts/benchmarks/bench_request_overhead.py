@@ -0,0 +1,93 @@
+"""Per-request overhead of building services and settings versus resolving them from the container.
+
+Before the container, every handler built its services, and every service built a Settings,
+which parses the environment and reads the env file again. The legacy path reproduces
+that construction: each service is built and given a freshly parsed Settings. The container
+path resolves the same services, which are built once per process. Both paths are measured
+over the services of two handlers: reading a product, and registering a user, which builds
+four services.
+
+For each path, the benchmark reports the time per request, the memory a request allocates at
+its peak according to tracemalloc, and how many times Settings were parsed per request.
+
+    python -m scripts.benchmarks.bench_request_overhead
+"""
+import time
+import tracemalloc
+
+from pydantic import BaseSettings
+
+from ftmcloud.core.config.config import Settings
+from ftmcloud.cross_cutting.container.container import container
+from ftmcloud.domains.organizations.services.organization_services import OrganizationsService
+from ftmcloud.domains.privileges.services.privilege_services import PrivilegesService
+from ftmcloud.domains.products.services.product_service import ProductService
+from ftmcloud.domains.users.services.user_services import UserService
+
+REQUESTS = 2_000
+TRACED_REQUESTS = 200
+HANDLERS = {
+    "get product": (ProductService,),
+    "register user": (UserService, PrivilegesService, OrganizationsService),
+}
+
+_parses = 0
+_build_values = BaseSettings._build_values
+
+
+def _counting_build_values(self, *args, **kwargs):
+    global _parses
+    _parses += 1
+    return _build_values(self, *args, **kwargs)
+
+
+BaseSettings._build_values = _counting_build_values
+
+
+def _legacy(services):
+    for service_cls in services:
+        service = service_cls()
+        service.settings = Settings()
+        # OrganizationsService built its IndustriesService, which built its own Settings.
+        if hasattr(service, "_industries_service"):
+            service._industries_service.settings = Settings()
+
+
+def _container(services):
+    for service_cls in services:
+        container.resolve(service_cls)
+
+
+def _measure(label, handler, services):
+    global _parses
+    handler(services)
+    _parses = 0
+    started = time.perf_counter()
+    for _ in range(REQUESTS):
+        handler(services)
+    elapsed = time.perf_counter() - started
+    parses = _parses
+
+    # The memory a request allocates is the growth of traced memory at its peak.
+    allocated = 0
+    tracemalloc.start()
+    for _ in range(TRACED_REQUESTS):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        handler(services)
+        allocated += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    print(f"{label:<10} {elapsed / REQUESTS * 1e6:9.1f} us/request "
+          f"{allocated / TRACED_REQUESTS / 1024:8.2f} KiB allocated/request "
+          f"{parses / REQUESTS:4.1f} settings parses/request")
+
+
+def main():
+    for name, services in HANDLERS.items():
+        print(f"{name} ({', '.join(_service.__name__ for _service in services)}), {REQUESTS} requests")
+        _measure("legacy", _legacy, services)
+        _measure("container", _container, services)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""Latency benchmark of ranking the candidates of POST /search/products.
+
+The candidates of a search used to be scored one at a time by
+ReportService._product_match_score, after a first pass computing the mean of the number
+attributes. The ProductScorer packs the attribute values of every candidate in one pass and
+scores them with array operations. Both are timed on the same synthetic candidates, holding
+a number, a range, a dropdown, a boolean and a text attribute, against requirements on all
+five, and their scores are compared.
+
+Ranking then used to build a Hit for every candidate and sort them all, to return the first
+page. top_window selects the page from the scores and only its hits are built. Both are timed
+for the first page of 10 hits and a page deeper in the ranking, and the pages are compared.
+
+    python -m scripts.benchmarks.bench_scoring
+"""
+import random
+import statistics
+import time
+
+import numpy as np
+
+from ftmcloud.domains.attributes.models.models import Attribute, AttributeValue
+from ftmcloud.domains.products.models.models import Product
+from ftmcloud.domains.reports.services.report_service import ReportService
+from ftmcloud.domains.reports.models.models import Hit
+from ftmcloud.domains.reports.services.scoring import ProductScorer, top_window
+
+SIZES = (1_000, 10_000, 50_000)
+RUNS = 5
+PAGES = ((0, 10), (500, 10))
+COLORS = ["red", "green", "blue", "black", "white"]
+
+_attributes = {
+    "bench-eco": Attribute.construct(pid="bench-eco", name="eco", type="boolean"),
+    "bench-weight": Attribute.construct(pid="bench-weight", name="weight", type="number"),
+    "bench-size": Attribute.construct(pid="bench-size", name="size", type="range"),
+    "bench-color": Attribute.construct(pid="bench-color", name="color", type="dropdown"),
+    "bench-notes": Attribute.construct(pid="bench-notes", name="notes", type="text"),
+}
+_requirements = {
+    "bench-eco": AttributeValue(attributePid="bench-eco", value={"value": True}).value,
+    "bench-weight": AttributeValue(attributePid="bench-weight", value={"numValue": 500}).value,
+    "bench-size": AttributeValue(attributePid="bench-size", value={"minValue": 10, "maxValue": 20}).value,
+    "bench-color": AttributeValue(attributePid="bench-color", value={"options": COLORS, "value": "red"}).value,
+    "bench-notes": AttributeValue(attributePid="bench-notes", value={"value": "note 3"}).value,
+}
+
+
+def _products(size: int) -> list[Product]:
+    rng = random.Random(size)
+    products = []
+    for i in range(size):
+        size_min = rng.randint(0, 30)
+        values = [
+            {"attributePid": "bench-eco", "value": {"value": rng.random() < 0.5}},
+            {"attributePid": "bench-weight", "value": {"numValue": rng.randint(0, 1000) * 2 + 1}},
+            {"attributePid": "bench-size", "value": {"minValue": size_min, "maxValue": size_min + rng.randint(1, 20)}},
+            {"attributePid": "bench-color", "value": {"options": COLORS, "value": rng.choice(COLORS)}},
+            {"attributePid": "bench-notes", "value": {"value": f"note {rng.randint(0, 9)}"}},
+        ]
+        rng.shuffle(values)
+        products.append(Product.construct(name=f"Product {i}",
+                                          attributeValues=[AttributeValue(**_value) for _value in values]))
+    return products
+
+
+def _time(function) -> tuple[float, list]:
+    latencies = []
+    for _ in range(RUNS):
+        started = time.perf_counter()
+        result = function()
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies), result
+
+
+def main():
+    service = ReportService()
+
+    def legacy(products):
+        means = service._generate_attr_pid_to_mean(products, _attributes)
+        return [service._product_match_score(_product, _requirements, _attributes, means) for _product in products]
+
+    def vectorized(products):
+        scorer = ProductScorer(_requirements, _attributes, lambda _product, _means: service._product_match_score(
+            _product, _requirements, _attributes, _means))
+        return scorer.score(products).tolist()
+
+    def sorted_page(products, scores, offset, limit):
+        hits = [Hit(hit=products[i], score=scores[i]) for i in range(len(products))]
+        hits.sort(key=lambda _hit: _hit.score, reverse=True)
+        return hits[offset:offset + limit]
+
+    def window_page(products, scores, offset, limit):
+        array = np.array(scores)
+        window = top_window(array, offset, limit)
+        return [Hit(hit=products[i], score=score) for i, score in zip(window.tolist(), array[window].tolist())]
+
+    for size in SIZES:
+        products = _products(size)
+        legacy_time, expected = _time(lambda: legacy(products))
+        vectorized_time, scores = _time(lambda: vectorized(products))
+        print(f"{size:>7} candidates | scoring   per product {legacy_time * 1e3:8.1f} ms | vectorized "
+              f"{vectorized_time * 1e3:8.1f} ms | x{legacy_time / vectorized_time:5.1f} | "
+              f"scores {'identical' if scores == expected else 'DIFFER'}")
+        for offset, limit in PAGES:
+            sort_time, expected_page = _time(lambda: sorted_page(products, scores, offset, limit))
+            window_time, page = _time(lambda: window_page(products, scores, offset, limit))
+            identical = [(_hit.hit, _hit.score) for _hit in page] == [(_hit.hit, _hit.score) for _hit in expected_page]
+            print(f"{size:>7} candidates | hits {offset:>4}+{limit:<3} sort all {sort_time * 1e3:8.1f} ms | window     "
+                  f"{window_time * 1e3:8.1f} ms | x{sort_time / window_time:5.1f} | "
+                  f"page {'identical' if identical else 'DIFFER'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Imports the products of a CSV or NDJSON file into an organization, creating or updating them
+by name, and prints the result of every failed row as NDJSON followed by a summary.
+
+    python -m scripts.import_products catalog.csv --organization <pid> --product-type <pid>
+    python -m scripts.import_products catalog.ndjson --organization <pid> > errors.ndjson
+
+The format is taken from the extension of the file unless --format is given.
+"""
+import argparse
+import asyncio
+import sys
+
+from ftmcloud.cross_cutting.db.db import initiate_database
+from ftmcloud.domains.products.services.product_import import readers
+from ftmcloud.domains.products.services.product_service import ProductService
+
+READ_SIZE = 2 ** 16
+
+
+async def _chunks(path: str):
+    with open(path, "rb") as file:
+        while chunk := file.read(READ_SIZE):
+            yield chunk
+
+
+async def import_products(path: str, format: str, organization_pid: str, product_type_pid: str | None) -> int:
+    await initiate_database()
+    service = ProductService()
+    rows = created = updated = failed = 0
+    async for results in service.import_products(readers[format](_chunks(path)), organization_pid,
+                                                 product_type_pid):
+        rows += len(results)
+        for result in results:
+            if result.statusCode == 201:
+                created += 1
+            elif result.statusCode == 200:
+                updated += 1
+            else:
+                failed += 1
+                print(result.json())
+        print(f"{rows} rows read", file=sys.stderr)
+    print(f"{rows} rows: {created} created, {updated} updated, {failed} failed", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="the CSV or NDJSON file")
+    parser.add_argument("--format", choices=sorted(readers), help="the format of the file")
+    parser.add_argument("--organization", required=True, help="pid of the organization imported into")
+    parser.add_argument("--product-type", help="pid of the product type of the rows that do not specify one")
+    args = parser.parse_args()
+    format = args.format or ("ndjson" if args.path.endswith((".ndjson", ".jsonl")) else "csv")
+    raise SystemExit(asyncio.run(import_products(args.path, format, args.organization, args.product_type)))
+
+
+if __name__ == '__main__':
+    main()
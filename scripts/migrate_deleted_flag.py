@@ -0,0 +1,44 @@
+"""Stores the soft-delete flag as a boolean and rebuilds the indexes as partial indexes over
+the documents that are not soft-deleted.
+
+    python -m scripts.migrate_deleted_flag --dry-run
+    python -m scripts.migrate_deleted_flag
+
+The application normalizes the flag on startup until it is recorded as done, which this script
+also records, but leaves rebuilding the indexes, which interrupts the queries they serve, to
+this script.
+"""
+import argparse
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.cross_cutting.db.db import DOCUMENT_MODELS
+from ftmcloud.cross_cutting.db.indexes import reconcile_indexes
+from ftmcloud.cross_cutting.db.migrations import normalize_deleted_flag
+
+
+async def migrate(dry_run: bool) -> int:
+    client = AsyncIOMotorClient(get_settings().DATABASE_URL)
+    try:
+        counts = await normalize_deleted_flag(client.analytix, DOCUMENT_MODELS, dry_run=dry_run)
+        for collection, (deleted, live) in counts.items():
+            print(f"{collection}: {deleted} deleted, {live} live")
+        changes = await reconcile_indexes(client.analytix, DOCUMENT_MODELS, dry_run=dry_run, rebuild=True)
+        for change in changes:
+            print(change if change.error is None else f"{change} FAILED: {change.error}")
+        return 1 if any(_change.error is not None for _change in changes) else 0
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="only print the changes")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(migrate(args.dry_run)))
+
+
+if __name__ == '__main__':
+    main()
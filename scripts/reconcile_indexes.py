@@ -0,0 +1,48 @@
+"""Reconciles the indexes of the collections with those declared on the document models.
+
+    python -m scripts.reconcile_indexes --dry-run
+    python -m scripts.reconcile_indexes --rebuild --drop-extra --explain
+
+Without flags, creates the missing indexes, like the application does on startup.
+"""
+import argparse
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from ftmcloud.core.config.config import get_settings
+from ftmcloud.cross_cutting.db.db import DOCUMENT_MODELS, QUERY_SHAPES
+from ftmcloud.cross_cutting.db.indexes import check_query_coverage, collection_name, reconcile_indexes
+
+
+async def reconcile(dry_run: bool, rebuild: bool, drop_extra: bool, explain: bool) -> int:
+    client = AsyncIOMotorClient(get_settings().DATABASE_URL)
+    try:
+        changes = await reconcile_indexes(client.analytix, DOCUMENT_MODELS, dry_run=dry_run, rebuild=rebuild,
+                                          drop_extra=drop_extra)
+        for change in changes:
+            print(change if change.error is None else f"{change} FAILED: {change.error}")
+        if not changes:
+            print("Indexes are reconciled.")
+        failed = any(_change.error is not None for _change in changes)
+        if explain:
+            for shape, covered, stages in await check_query_coverage(client.analytix, QUERY_SHAPES):
+                status = "ok" if covered else "COLLSCAN"
+                print(f"{status:<8} {collection_name(shape.model)}: {shape.description} [{' > '.join(stages)}]")
+        return 1 if failed else 0
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dry-run", action="store_true", help="only print the changes")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild the indexes whose keys or options changed")
+    parser.add_argument("--drop-extra", action="store_true", help="drop the indexes that are not declared")
+    parser.add_argument("--explain", action="store_true", help="check that the main queries use an index")
+    args = parser.parse_args()
+    raise SystemExit(asyncio.run(reconcile(args.dry_run, args.rebuild, args.drop_extra, args.explain)))
+
+
+if __name__ == '__main__':
+    main()
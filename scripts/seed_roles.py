@@ -1,7 +1,7 @@
 import pymongo
 import requests
 
-from ftmcloud.core.config.config import Settings
+from ftmcloud.core.config.config import get_settings
 
 openapi_url2 = "http://localhost:8080/openapi.json"
 openapi_url = "https://ftmcloud-dev.azurewebsites.net/openapi.json"
@@ -35,7 +35,7 @@ def parse_openapi_endpoints(openapi_data):
 
 
 def seed_user_roles_on_admin():
-    config = Settings()
+    config = get_settings()
     db = pymongo.MongoClient(
         host=config.MONGO_URI
     )